@@ -5,6 +5,7 @@
 # Output: Structured JSON with bearish thesis and conviction scoring
 
 from langchain_core.messages import HumanMessage, AIMessage
+from langchain_core.runnables import RunnableLambda
 from langchain_google_genai import ChatGoogleGenerativeAI
 from pydantic import BaseModel, Field
 from typing import List, Literal
@@ -62,17 +63,18 @@ def create_bear_debater(llm):
         llm: Language model instance
 
     Returns:
-        A function that takes state and returns updated state
+        A runnable node (sync and async) that takes state and returns updated state
     """
 
-    def bear_debater_node(state):
+    def build_prompt(state) -> str:
+        """Build the bearish debate prompt from the analyses in state."""
         ticker = state.get("ticker", "")
         date = state.get("date", "")
         market_analysis = state.get("market_analysis", "No market analysis available")
         fundamental_analysis = state.get("fundamental_analysis", "No fundamental analysis available")
 
         # Step 1: Create bearish debate prompt
-        debate_prompt = f"""You are an expert BEAR analyst making the strongest possible case for SELLING or AVOIDING {ticker}.
+        return f"""You are an expert BEAR analyst making the strongest possible case for SELLING or AVOIDING {ticker}.
 
 Your role is to advocate for the BEARISH position by:
 1. Extracting ALL negative signals from the analysis
@@ -179,54 +181,47 @@ Respond ONLY with valid JSON matching this exact structure (no markdown, no extr
   "recommended_action": "strong_sell|sell|avoid"
 }}"""
 
-        # Step 2: Get structured response from LLM
-        try:
-            if hasattr(llm, 'with_structured_output'):
-                structured_llm = llm.with_structured_output(BearCaseOutput)
-                bear_case = structured_llm.invoke(debate_prompt)
-                bear_case_json = bear_case.model_dump()
-            else:
-                # Fallback: request JSON and parse
-                response = llm.invoke(debate_prompt)
-                response_text = response.content if hasattr(response, 'content') else str(response)
-
-                # Clean markdown formatting
-                response_text = response_text.strip()
-                if response_text.startswith("```json"):
-                    response_text = response_text[7:]
-                if response_text.startswith("```"):
-                    response_text = response_text[3:]
-                if response_text.endswith("```"):
-                    response_text = response_text[:-3]
-                response_text = response_text.strip()
-
-                # Parse and validate
-                bear_dict = json.loads(response_text)
-                bear_case = BearCaseOutput(**bear_dict)
-                bear_case_json = bear_case.model_dump()
-
-        except Exception as e:
-            # Fallback bear case
-            bear_case_json = {
-                "thesis_summary": f"Bear case for {ticker} could not be fully formulated due to parsing error, but data suggests potential downside risks exist.",
-                "bearish_signals": {
-                    "technical_signals": ["Analysis data collected - see market_analysis"],
-                    "fundamental_signals": ["Analysis data collected - see fundamental_analysis"]
-                },
-                "downside_risks": {
-                    "near_term": ["Technical weakness or fundamental concerns may create downside"],
-                    "long_term": ["Company fundamentals may present risks"]
-                },
-                "target_price_direction": "moderately_lower",
-                "time_horizon": "medium_term",
-                "counter_arguments": {
-                    "bull_case_weaknesses": [f"Bear case formatting error: {str(e)}", "Incomplete analysis due to parsing issue"],
-                    "why_bulls_are_wrong": "Cannot fully assess bull case weaknesses due to formatting error. Review raw analysis data."
-                },
-                "conviction_score": 0.3,
-                "recommended_action": "avoid"
-            }
+    def parse_text_response(response) -> dict:
+        """Clean a raw JSON text response and validate it against BearCaseOutput."""
+        response_text = response.content if hasattr(response, 'content') else str(response)
+
+        # Clean markdown formatting
+        response_text = response_text.strip()
+        if response_text.startswith("```json"):
+            response_text = response_text[7:]
+        if response_text.startswith("```"):
+            response_text = response_text[3:]
+        if response_text.endswith("```"):
+            response_text = response_text[:-3]
+        response_text = response_text.strip()
+
+        # Parse and validate
+        bear_dict = json.loads(response_text)
+        return BearCaseOutput(**bear_dict).model_dump()
+
+    def fallback_case(ticker: str, e: Exception) -> dict:
+        # Fallback bear case
+        return {
+            "thesis_summary": f"Bear case for {ticker} could not be fully formulated due to parsing error, but data suggests potential downside risks exist.",
+            "bearish_signals": {
+                "technical_signals": ["Analysis data collected - see market_analysis"],
+                "fundamental_signals": ["Analysis data collected - see fundamental_analysis"]
+            },
+            "downside_risks": {
+                "near_term": ["Technical weakness or fundamental concerns may create downside"],
+                "long_term": ["Company fundamentals may present risks"]
+            },
+            "target_price_direction": "moderately_lower",
+            "time_horizon": "medium_term",
+            "counter_arguments": {
+                "bull_case_weaknesses": [f"Bear case formatting error: {str(e)}", "Incomplete analysis due to parsing issue"],
+                "why_bulls_are_wrong": "Cannot fully assess bull case weaknesses due to formatting error. Review raw analysis data."
+            },
+            "conviction_score": 0.3,
+            "recommended_action": "avoid"
+        }
 
+    def build_state_update(ticker: str, bear_case_json: dict) -> dict:
         # Step 3: Create condensed message history
         user_summary = HumanMessage(
             content=f"Build the strongest bearish case for {ticker} based on market and fundamental analysis"
@@ -243,4 +238,39 @@ Respond ONLY with valid JSON matching this exact structure (no markdown, no extr
             "bear_argument": formatted_bear_case
         }
 
-    return bear_debater_node
+    def bear_debater_node(state):
+        ticker = state.get("ticker", "")
+        debate_prompt = build_prompt(state)
+
+        # Step 2: Get structured response from LLM
+        try:
+            if hasattr(llm, 'with_structured_output'):
+                structured_llm = llm.with_structured_output(BearCaseOutput)
+                bear_case_json = structured_llm.invoke(debate_prompt).model_dump()
+            else:
+                # Fallback: request JSON and parse
+                bear_case_json = parse_text_response(llm.invoke(debate_prompt))
+        except Exception as e:
+            bear_case_json = fallback_case(ticker, e)
+
+        return build_state_update(ticker, bear_case_json)
+
+    async def abear_debater_node(state):
+        ticker = state.get("ticker", "")
+        debate_prompt = build_prompt(state)
+
+        # Step 2: Get structured response from LLM without blocking the event loop
+        try:
+            if hasattr(llm, 'with_structured_output'):
+                structured_llm = llm.with_structured_output(BearCaseOutput)
+                bear_case_json = (await structured_llm.ainvoke(debate_prompt)).model_dump()
+            else:
+                # Fallback: request JSON and parse
+                bear_case_json = parse_text_response(await llm.ainvoke(debate_prompt))
+        except Exception as e:
+            bear_case_json = fallback_case(ticker, e)
+
+        return build_state_update(ticker, bear_case_json)
+
+    # Expose both entry points so the graph runs under invoke()/stream() and ainvoke()/astream()
+    return RunnableLambda(bear_debater_node, afunc=abear_debater_node)
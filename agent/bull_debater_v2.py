@@ -5,6 +5,7 @@
 # Output: Structured JSON with bullish thesis and conviction scoring
 
 from langchain_core.messages import HumanMessage, AIMessage
+from langchain_core.runnables import RunnableLambda
 from langchain_google_genai import ChatGoogleGenerativeAI
 from pydantic import BaseModel, Field
 from typing import List, Literal
@@ -61,17 +62,18 @@ def create_bull_debater(llm):
         llm: Language model instance
 
     Returns:
-        A function that takes state and returns updated state
+        A runnable node (sync and async) that takes state and returns updated state
     """
 
-    def bull_debater_node(state):
+    def build_prompt(state) -> str:
+        """Build the bullish debate prompt from the analyses in state."""
         ticker = state.get("ticker", "")
         date = state.get("date", "")
         market_analysis = state.get("market_analysis", "No market analysis available")
         fundamental_analysis = state.get("fundamental_analysis", "No fundamental analysis available")
 
         # Step 1: Create bullish debate prompt
-        debate_prompt = f"""You are an expert BULL analyst making the strongest possible case for BUYING {ticker}.
+        return f"""You are an expert BULL analyst making the strongest possible case for BUYING {ticker}.
 
 Your role is to advocate for the BULLISH position by:
 1. Extracting ALL positive signals from the analysis
@@ -172,54 +174,47 @@ Respond ONLY with valid JSON matching this exact structure (no markdown, no extr
   "recommended_action": "strong_buy|buy|accumulate"
 }}"""
 
-        # Step 2: Get structured response from LLM
-        try:
-            if hasattr(llm, 'with_structured_output'):
-                structured_llm = llm.with_structured_output(BullCaseOutput)
-                bull_case = structured_llm.invoke(debate_prompt)
-                bull_case_json = bull_case.model_dump()
-            else:
-                # Fallback: request JSON and parse
-                response = llm.invoke(debate_prompt)
-                response_text = response.content if hasattr(response, 'content') else str(response)
-
-                # Clean markdown formatting
-                response_text = response_text.strip()
-                if response_text.startswith("```json"):
-                    response_text = response_text[7:]
-                if response_text.startswith("```"):
-                    response_text = response_text[3:]
-                if response_text.endswith("```"):
-                    response_text = response_text[:-3]
-                response_text = response_text.strip()
-
-                # Parse and validate
-                bull_dict = json.loads(response_text)
-                bull_case = BullCaseOutput(**bull_dict)
-                bull_case_json = bull_case.model_dump()
-
-        except Exception as e:
-            # Fallback bull case
-            bull_case_json = {
-                "thesis_summary": f"Bull case for {ticker} could not be fully formulated due to parsing error, but data suggests potential upside opportunities exist.",
-                "bullish_signals": {
-                    "technical_signals": ["Analysis data collected - see market_analysis"],
-                    "fundamental_signals": ["Analysis data collected - see fundamental_analysis"]
-                },
-                "catalysts": {
-                    "near_term": ["Technical setup or fundamental strength may provide upside"],
-                    "long_term": ["Company fundamentals may support growth"]
-                },
-                "target_price_direction": "moderately_higher",
-                "time_horizon": "medium_term",
-                "risk_acknowledgment": {
-                    "key_risks": [f"Bull case formatting error: {str(e)}", "Incomplete analysis due to parsing issue"],
-                    "risk_mitigation": "Review raw analysis data before taking action."
-                },
-                "conviction_score": 0.3,
-                "recommended_action": "accumulate"
-            }
+    def parse_text_response(response) -> dict:
+        """Clean a raw JSON text response and validate it against BullCaseOutput."""
+        response_text = response.content if hasattr(response, 'content') else str(response)
+
+        # Clean markdown formatting
+        response_text = response_text.strip()
+        if response_text.startswith("```json"):
+            response_text = response_text[7:]
+        if response_text.startswith("```"):
+            response_text = response_text[3:]
+        if response_text.endswith("```"):
+            response_text = response_text[:-3]
+        response_text = response_text.strip()
+
+        # Parse and validate
+        bull_dict = json.loads(response_text)
+        return BullCaseOutput(**bull_dict).model_dump()
+
+    def fallback_case(ticker: str, e: Exception) -> dict:
+        # Fallback bull case
+        return {
+            "thesis_summary": f"Bull case for {ticker} could not be fully formulated due to parsing error, but data suggests potential upside opportunities exist.",
+            "bullish_signals": {
+                "technical_signals": ["Analysis data collected - see market_analysis"],
+                "fundamental_signals": ["Analysis data collected - see fundamental_analysis"]
+            },
+            "catalysts": {
+                "near_term": ["Technical setup or fundamental strength may provide upside"],
+                "long_term": ["Company fundamentals may support growth"]
+            },
+            "target_price_direction": "moderately_higher",
+            "time_horizon": "medium_term",
+            "risk_acknowledgment": {
+                "key_risks": [f"Bull case formatting error: {str(e)}", "Incomplete analysis due to parsing issue"],
+                "risk_mitigation": "Review raw analysis data before taking action."
+            },
+            "conviction_score": 0.3,
+            "recommended_action": "accumulate"
+        }
 
+    def build_state_update(ticker: str, bull_case_json: dict) -> dict:
         # Step 3: Create condensed message history
         user_summary = HumanMessage(
             content=f"Build the strongest bullish case for {ticker} based on market and fundamental analysis"
@@ -236,4 +231,39 @@ Respond ONLY with valid JSON matching this exact structure (no markdown, no extr
             "bull_argument": formatted_bull_case
         }
 
-    return bull_debater_node
+    def bull_debater_node(state):
+        ticker = state.get("ticker", "")
+        debate_prompt = build_prompt(state)
+
+        # Step 2: Get structured response from LLM
+        try:
+            if hasattr(llm, 'with_structured_output'):
+                structured_llm = llm.with_structured_output(BullCaseOutput)
+                bull_case_json = structured_llm.invoke(debate_prompt).model_dump()
+            else:
+                # Fallback: request JSON and parse
+                bull_case_json = parse_text_response(llm.invoke(debate_prompt))
+        except Exception as e:
+            bull_case_json = fallback_case(ticker, e)
+
+        return build_state_update(ticker, bull_case_json)
+
+    async def abull_debater_node(state):
+        ticker = state.get("ticker", "")
+        debate_prompt = build_prompt(state)
+
+        # Step 2: Get structured response from LLM without blocking the event loop
+        try:
+            if hasattr(llm, 'with_structured_output'):
+                structured_llm = llm.with_structured_output(BullCaseOutput)
+                bull_case_json = (await structured_llm.ainvoke(debate_prompt)).model_dump()
+            else:
+                # Fallback: request JSON and parse
+                bull_case_json = parse_text_response(await llm.ainvoke(debate_prompt))
+        except Exception as e:
+            bull_case_json = fallback_case(ticker, e)
+
+        return build_state_update(ticker, bull_case_json)
+
+    # Expose both entry points so the graph runs under invoke()/stream() and ainvoke()/astream()
+    return RunnableLambda(bull_debater_node, afunc=abull_debater_node)
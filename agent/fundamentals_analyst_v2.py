@@ -96,13 +96,20 @@ def create_fundamentals_analyst(llm):
             get_balance_sheet,
             get_income_statement,
             get_cash_flow,
-            get_earnings
+            get_earnings,
+            prefetch_fundamentals
         )
 
         # Step 1: Fetch all fundamental data directly (no LLM tool calling)
         data_collected = {}
         errors = []
 
+        # Load every dataset concurrently up front; the calls below then hit the cache
+        try:
+            prefetch_fundamentals.invoke({"ticker": ticker})
+        except Exception:
+            pass  # Each tool below reports its own fetch error
+
         try:
             data_collected['company_overview'] = get_company_overview.invoke({"ticker": ticker})
         except Exception as e:
@@ -5,6 +5,7 @@
 # Output: Structured JSON with low/medium/high risk recommendations
 
 from langchain_core.messages import HumanMessage, AIMessage
+from langchain_core.runnables import RunnableLambda
 from langchain_google_genai import ChatGoogleGenerativeAI
 from pydantic import BaseModel, Field
 from typing import List, Literal, Optional
@@ -83,10 +84,11 @@ def create_supervisor(llm):
         llm: Language model instance
 
     Returns:
-        A function that takes state and returns updated state
+        A runnable node (sync and async) that takes state and returns updated state
     """
 
-    def supervisor_node(state):
+    def build_prompt(state) -> str:
+        """Build the supervisor synthesis prompt from the analyses in state."""
         ticker = state.get("ticker", "")
         date = state.get("date", "")
         market_analysis = state.get("market_analysis", "No market analysis available")
@@ -95,7 +97,7 @@ def create_supervisor(llm):
         bear_argument = state.get("bear_argument", "No bear case available")
 
         # Step 1: Create supervisor synthesis prompt
-        supervisor_prompt = f"""You are the CHIEF INVESTMENT OFFICER making final trading recommendations for {ticker}.
+        return f"""You are the CHIEF INVESTMENT OFFICER making final trading recommendations for {ticker}.
 
 You have received comprehensive analysis from your team:
 1. Market Analyst (technical analysis)
@@ -252,79 +254,72 @@ Respond ONLY with valid JSON matching this exact structure (no markdown, no extr
   "final_confidence": number (0.0-1.0)
 }}"""
 
-        # Step 2: Get structured response from LLM
-        try:
-            if hasattr(llm, 'with_structured_output'):
-                structured_llm = llm.with_structured_output(SupervisorDecision)
-                decision = structured_llm.invoke(supervisor_prompt)
-                decision_json = decision.model_dump()
-            else:
-                # Fallback: request JSON and parse
-                response = llm.invoke(supervisor_prompt)
-                response_text = response.content if hasattr(response, 'content') else str(response)
-
-                # Clean markdown formatting
-                response_text = response_text.strip()
-                if response_text.startswith("```json"):
-                    response_text = response_text[7:]
-                if response_text.startswith("```"):
-                    response_text = response_text[3:]
-                if response_text.endswith("```"):
-                    response_text = response_text[:-3]
-                response_text = response_text.strip()
-
-                # Parse and validate
-                decision_dict = json.loads(response_text)
-                decision = SupervisorDecision(**decision_dict)
-                decision_json = decision.model_dump()
-
-        except Exception as e:
-            # Fallback decision
-            decision_json = {
-                "executive_summary": f"Investment decision for {ticker} could not be fully formulated due to parsing error. Review individual analysis components before making decisions.",
-                "market_thesis": "Technical analysis completed - see market_analysis for details.",
-                "fundamental_thesis": "Fundamental analysis completed - see fundamental_analysis for details.",
-                "bull_case_strength": 5.0,
-                "bear_case_strength": 5.0,
-                "consensus_direction": "neutral",
-                "low_risk_recommendation": {
-                    "action": "hold",
-                    "position_size": "minimal",
-                    "entry_strategy": "Wait for clearer signals before acting",
-                    "stop_loss": None,
-                    "rationale": "Conservative approach warranted due to analysis formatting issues."
-                },
-                "medium_risk_recommendation": {
-                    "action": "hold",
-                    "position_size": "quarter",
-                    "entry_strategy": "Review raw analysis before making moves",
-                    "stop_loss": None,
-                    "rationale": "Moderate caution advised given incomplete synthesis."
-                },
-                "high_risk_recommendation": {
-                    "action": "hold",
-                    "position_size": "half",
-                    "entry_strategy": "Consider raw analysis data for trading decisions",
-                    "stop_loss": None,
-                    "rationale": "Even aggressive traders should review individual analyses given formatting error."
-                },
-                "time_horizon_outlook": {
-                    "short_term": "neutral",
-                    "medium_term": "neutral",
-                    "long_term": "neutral"
-                },
-                "key_decision_factors": [
-                    f"Decision formatting error: {str(e)}",
-                    "Review individual analysis components",
-                    "Wait for successful analysis run"
-                ],
-                "monitoring_points": [
-                    "Re-run analysis to get proper synthesis",
-                    "Check data quality and API connectivity"
-                ],
-                "final_confidence": 0.2
-            }
+    def parse_text_response(response) -> dict:
+        """Clean a raw JSON text response and validate it against SupervisorDecision."""
+        response_text = response.content if hasattr(response, 'content') else str(response)
+
+        # Clean markdown formatting
+        response_text = response_text.strip()
+        if response_text.startswith("```json"):
+            response_text = response_text[7:]
+        if response_text.startswith("```"):
+            response_text = response_text[3:]
+        if response_text.endswith("```"):
+            response_text = response_text[:-3]
+        response_text = response_text.strip()
+
+        # Parse and validate
+        decision_dict = json.loads(response_text)
+        return SupervisorDecision(**decision_dict).model_dump()
+
+    def fallback_decision(ticker: str, e: Exception) -> dict:
+        # Fallback decision
+        return {
+            "executive_summary": f"Investment decision for {ticker} could not be fully formulated due to parsing error. Review individual analysis components before making decisions.",
+            "market_thesis": "Technical analysis completed - see market_analysis for details.",
+            "fundamental_thesis": "Fundamental analysis completed - see fundamental_analysis for details.",
+            "bull_case_strength": 5.0,
+            "bear_case_strength": 5.0,
+            "consensus_direction": "neutral",
+            "low_risk_recommendation": {
+                "action": "hold",
+                "position_size": "minimal",
+                "entry_strategy": "Wait for clearer signals before acting",
+                "stop_loss": None,
+                "rationale": "Conservative approach warranted due to analysis formatting issues."
+            },
+            "medium_risk_recommendation": {
+                "action": "hold",
+                "position_size": "quarter",
+                "entry_strategy": "Review raw analysis before making moves",
+                "stop_loss": None,
+                "rationale": "Moderate caution advised given incomplete synthesis."
+            },
+            "high_risk_recommendation": {
+                "action": "hold",
+                "position_size": "half",
+                "entry_strategy": "Consider raw analysis data for trading decisions",
+                "stop_loss": None,
+                "rationale": "Even aggressive traders should review individual analyses given formatting error."
+            },
+            "time_horizon_outlook": {
+                "short_term": "neutral",
+                "medium_term": "neutral",
+                "long_term": "neutral"
+            },
+            "key_decision_factors": [
+                f"Decision formatting error: {str(e)}",
+                "Review individual analysis components",
+                "Wait for successful analysis run"
+            ],
+            "monitoring_points": [
+                "Re-run analysis to get proper synthesis",
+                "Check data quality and API connectivity"
+            ],
+            "final_confidence": 0.2
+        }
 
+    def build_state_update(ticker: str, decision_json: dict) -> dict:
         # Step 3: Create condensed message history
         user_summary = HumanMessage(
             content=f"Provide final investment decision for {ticker} based on all analysis and debate"
@@ -344,4 +339,39 @@ Respond ONLY with valid JSON matching this exact structure (no markdown, no extr
             "supervisor_decision": formatted_decision  # Full JSON with risk-tiered recommendations
         }
 
-    return supervisor_node
+    def supervisor_node(state):
+        ticker = state.get("ticker", "")
+        supervisor_prompt = build_prompt(state)
+
+        # Step 2: Get structured response from LLM
+        try:
+            if hasattr(llm, 'with_structured_output'):
+                structured_llm = llm.with_structured_output(SupervisorDecision)
+                decision_json = structured_llm.invoke(supervisor_prompt).model_dump()
+            else:
+                # Fallback: request JSON and parse
+                decision_json = parse_text_response(llm.invoke(supervisor_prompt))
+        except Exception as e:
+            decision_json = fallback_decision(ticker, e)
+
+        return build_state_update(ticker, decision_json)
+
+    async def asupervisor_node(state):
+        ticker = state.get("ticker", "")
+        supervisor_prompt = build_prompt(state)
+
+        # Step 2: Get structured response from LLM without blocking the event loop
+        try:
+            if hasattr(llm, 'with_structured_output'):
+                structured_llm = llm.with_structured_output(SupervisorDecision)
+                decision_json = (await structured_llm.ainvoke(supervisor_prompt)).model_dump()
+            else:
+                # Fallback: request JSON and parse
+                decision_json = parse_text_response(await llm.ainvoke(supervisor_prompt))
+        except Exception as e:
+            decision_json = fallback_decision(ticker, e)
+
+        return build_state_update(ticker, decision_json)
+
+    # Expose both entry points so the graph runs under invoke()/stream() and ainvoke()/astream()
+    return RunnableLambda(supervisor_node, afunc=asupervisor_node)
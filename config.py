@@ -22,9 +22,17 @@ SUPERVISOR_TEMPERATURE = 0.7  # More creative for supervisor synthesis
 FMP_BASE_URL = "https://financialmodelingprep.com/api/v3"
 FMP_TIMEOUT = 30  # seconds
 
+# Shared on-disk HTTP cache (used when requests-cache is installed)
+HTTP_CACHE_DIR = Path(__file__).parent / ".http_cache"
+
+# Set YF_CACHE_DISABLE=1 to always fetch fresh data from Yahoo Finance
+YF_CACHE_DISABLE = os.getenv("YF_CACHE_DISABLE", "").lower() in ("1", "true", "yes")
+
 # Legacy Alpha Vantage Settings (deprecated)
 AV_BASE_URL = "https://www.alphavantage.co/query"
 AV_TIMEOUT = 30  # seconds
+AV_CACHE_DIR = HTTP_CACHE_DIR / "alphavantage"
+AV_CACHE_TTL = 7 * 24 * 3600  # Fundamentals change at most quarterly
 
 # Output Settings
 VERBOSE = True
\ No newline at end of file
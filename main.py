@@ -12,11 +12,19 @@ Usage:
 
 import json
 import argparse
+import asyncio
+import functools
 import sys
 from pathlib import Path
 from datetime import datetime
 from dotenv import load_dotenv
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 # Add the parent directory to Python path so we can import simplified_tradingagents
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
@@ -30,15 +38,37 @@ load_dotenv()
 setup_langsmith()
 
 
+@functools.lru_cache(maxsize=128)
+def _banner(title: str, width: int) -> str:
+    """Build (and memoize) a section banner for the given title and width."""
+    rule = "=" * width
+    return f"\n{rule}\n {title.center(width - 2)} \n{rule}"
+
+
 def print_section(title: str, content: str = None, width: int = 80):
     """Print a formatted section header."""
-    print("\n" + "=" * width)
-    print(f" {title.center(width - 2)} ")
-    print("=" * width)
+    print(_banner(title, width))
     if content:
         print(content)
 
 
+def save_result(result: dict, output_file: str):
+    """Write the analysis result to disk as indented JSON bytes."""
+    # Exclude messages field which contains non-serializable objects
+    result_to_save = {k: v for k, v in result.items() if k != 'messages'}
+
+    if ORJSON_AVAILABLE:
+        payload = orjson.dumps(
+            result_to_save,
+            option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS,
+            default=str
+        )
+    else:
+        payload = json.dumps(result_to_save, indent=2, default=str).encode("utf-8")
+
+    Path(output_file).write_bytes(payload)
+
+
 def print_analysis_summary(result: dict):
     """Print a formatted summary of the analysis results."""
 
@@ -235,7 +265,7 @@ def main():
     print("\nPlease wait...\n")
 
     try:
-        result = graph.analyze(ticker=args.ticker, date=analysis_date)
+        result = asyncio.run(graph.analyze_async(ticker=args.ticker, date=analysis_date))
 
         # Print results
         print_analysis_summary(result)
@@ -247,11 +277,9 @@ def main():
         print(f"\nFinal Decision: {result['decision'].upper()}")
         print(f"Confidence: {result['confidence']:.2%}")
 
-        # Save results to file (exclude messages field which contains non-serializable objects)
+        # Save results to file
         output_file = f"analysis_{args.ticker}_{analysis_date}.json"
-        result_to_save = {k: v for k, v in result.items() if k != 'messages'}
-        with open(output_file, 'w') as f:
-            json.dump(result_to_save, f, indent=2)
+        save_result(result, output_file)
         print(f"\nDetailed results saved to: {output_file}")
 
     except Exception as e:
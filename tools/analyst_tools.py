@@ -109,7 +109,7 @@ def get_technical_indicators(ticker:str) -> str:
 
         if 'Technical Analysis: RSI' in data:
             rsi_data=data['Techncial Analysis: RSI']
-            latest_date=list(rsi_data.keys())[0]
+            latest_date=next(iter(rsi_data))
             rsi_value=float(rsi_data[latest_data]['RSI'])
             indicators['RSI'] = rsi_value
 
@@ -127,7 +127,7 @@ def get_technical_indicators(ticker:str) -> str:
         
         if 'Technical Analysis: SMA' in data:
             sma_data = data['Technical Analysis: SMA']
-            latest_date = list(sma_data.keys())[0]
+            latest_date = next(iter(sma_data))
             sma_value = float(sma_data[latest_date]['SMA'])
             indicators['SMA_50'] = sma_value
         
@@ -0,0 +1,61 @@
+"""
+On-disk JSON cache with a per-entry TTL
+
+Used by the API tools to persist decoded responses between runs so repeat
+lookups for the same ticker skip the network (and the provider's rate limit).
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+
+class FileCache:
+    """JSON file cache keyed on a params dict.
+
+    Each entry is stored as {"ts": <epoch seconds>, "data": <payload>} under
+    <root>/<namespace>/<md5 of params>.json and written atomically, so
+    concurrent readers never see a partially written file.
+    """
+
+    def __init__(self, root: Path, ttl: int):
+        self.root = Path(root)
+        self.ttl = ttl
+
+    def _path(self, params: Dict[str, Any], namespace: str) -> Path:
+        digest = hashlib.md5(json.dumps(params, sort_keys=True).encode()).hexdigest()
+        # Namespaces are ticker symbols; drop anything that could escape the cache root
+        safe_ns = "".join(c for c in namespace if c.isalnum() or c in "-_.").strip(".") or "_"
+        return self.root / safe_ns / f"{digest}.json"
+
+    def get(self, params: Dict[str, Any], namespace: str = "_", ttl: Optional[int] = None) -> Optional[Any]:
+        """Return the cached payload for params, or None if missing or expired."""
+        path = self._path(params, namespace)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        max_age = self.ttl if ttl is None else ttl
+        if time.time() - entry.get("ts", 0) >= max_age:
+            return None
+        return entry.get("data")
+
+    def set(self, params: Dict[str, Any], data: Any, namespace: str = "_") -> None:
+        """Persist data for params; failures are ignored since the cache is best-effort."""
+        path = self._path(params, namespace)
+        tmp_path = None
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({"ts": time.time(), "data": data}, f)
+            os.replace(tmp_path, path)
+        except (OSError, TypeError, ValueError):
+            if tmp_path and os.path.exists(tmp_path):
+                os.unlink(tmp_path)
@@ -1,26 +1,136 @@
+import json
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict
+from langchain_core.tools import tool
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util import make_headers
+from urllib3.util.retry import Retry
+from config import ALPHA_VANTAGE_API_KEY, AV_BASE_URL, AV_TIMEOUT
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+# Shared HTTP session so repeated tool calls reuse the pooled TLS connection to Alpha Vantage
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=16,
+    max_retries=Retry(total=2, backoff_factor=0.2, status_forcelist=[429, 500, 502, 503, 504])
+))
+
+# Negotiate compressed JSON; make_headers only advertises br when brotli is installed
+_SESSION.headers.update(make_headers(accept_encoding=True, keep_alive=True))
+_SESSION.headers["Accept"] = "application/json"
+
+# Small pool: Alpha Vantage rate-limits per key, so cap concurrent requests
+_EXECUTOR = ThreadPoolExecutor(max_workers=2, thread_name_prefix="alphavantage")
+
+
+# Values Alpha Vantage uses (or we default to) when a field is absent
+_MISSING = ('N/A', 'None', None, '')
+
+
+def _fetch_av(function: str, ticker: str) -> Dict[str, Any]:
+    """GET one Alpha Vantage function for a symbol and return the decoded JSON."""
+    params = {
+        'function': function,
+        'symbol': ticker,
+        'apikey': ALPHA_VANTAGE_API_KEY
+    }
+    response = _SESSION.get(AV_BASE_URL, params=params, timeout=AV_TIMEOUT)
+    return orjson.loads(response.content) if ORJSON_AVAILABLE else response.json()
+
+
+def _format_earnings(data: Dict[str, Any]) -> str:
+    """Render the last four reported quarters from an EARNINGS payload."""
+    quarters = (data or {}).get('quarterlyEarnings') or []
+    if not quarters:
+        return ""
+
+    lines = ["\n\nRecent Earnings (Last 4 Quarters):"]
+    for q in quarters[:4]:
+        surprise = q.get('surprisePercentage', 'N/A')
+        surprise = f"{surprise}%" if surprise not in _MISSING else 'N/A'
+        lines.append(
+            f"{q.get('fiscalDateEnding', 'N/A')}: Reported EPS {q.get('reportedEPS', 'N/A')}, "
+            f"Estimated EPS {q.get('estimatedEPS', 'N/A')}, Surprise {surprise}"
+        )
+    return "\n".join(lines)
+
+
+def _num(val):
+    """Convert a raw Alpha Vantage value to a number for JSON output (None if absent)."""
+    if val in _MISSING:
+        return None
+    try:
+        return float(val)
+    except (TypeError, ValueError):
+        return val
+
+
+def _dumps_compact(payload: Dict[str, Any]) -> str:
+    """Serialize a tool payload as minified JSON."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(payload).decode()
+    return json.dumps(payload, separators=(",", ":"))
+
+
+def _fmt_dollars(val) -> str:
+    """Format a whole-dollar amount with thousands separators."""
+    return "$" + format(int(val), ",")
+
+
+def _fmt_percent(val) -> str:
+    """Format a fractional ratio (0.25) as a percentage string (25.00%)."""
+    return format(float(val) * 100, ".2f") + "%"
+
+
+# Output skeleton for get_fundamentals, built once at import
+_FUNDAMENTALS_TEMPLATE = """Fundamental Data for {ticker}:
+Company: {name}
+Sector: {sector}
+Market Cap: {market_cap}
+
+Valuation Metrics:
+P/E Ratio: {pe_ratio}
+PEG Ratio: {peg_ratio}
+Price/Book: {price_to_book}
+
+Financial Health:
+Debt/Equity: {debt_to_equity}
+Profit Margin: {profit_margin}
+ROE: {roe}
+
+Growth:
+Revenue Growth (QoQ): {revenue_growth}{earnings_block}"""
+
+
 @tool
-def get_fundamentals(ticker:str) ->str:
+def get_fundamentals(ticker:str, as_json: bool = False) ->str:
     """Get fundamental financial data from Alpha Vantage.
     
-    This tool provides company overview and key financial metrics.
+    This tool provides company overview, key financial metrics and recent
+    quarterly earnings (OVERVIEW and EARNINGS are fetched concurrently).
 
     Arg:
         ticker:Stock symbol
+        as_json: Return a minified fixed-schema JSON object instead of formatted text
 
     Returns:
         Formatted string with fundamental data
     """
 
     try:
-        # Get company overview
-        params = {
-            'function': 'OVERVIEW',
-            'symbol': ticker,
-            'apikey': ALPHA_VANTAGE_API_KEY
-        }
-        
-        response = requests.get(AV_BASE_URL, params=params, timeout=AV_TIMEOUT)
-        data = response.json()
+        # Fetch company overview and earnings concurrently
+        future_overview = _EXECUTOR.submit(_fetch_av, 'OVERVIEW', ticker)
+        future_earnings = _EXECUTOR.submit(_fetch_av, 'EARNINGS', ticker)
+
+        data = future_overview.result()
         
         if not data or 'Symbol' not in data:
             return f"No fundamental data available for {ticker}"
@@ -37,38 +147,66 @@ def get_fundamentals(ticker:str) ->str:
         revenue_growth = data.get('QuarterlyRevenueGrowthYOY', 'N/A')
         market_cap = data.get('MarketCapitalization', 'N/A')
         
+        if as_json:
+            try:
+                quarters = (future_earnings.result() or {}).get('quarterlyEarnings') or []
+            except Exception:
+                quarters = []
+            return _dumps_compact({
+                "ticker": ticker,
+                "name": name,
+                "sector": sector,
+                "market_cap": _num(market_cap),
+                "pe_ratio": _num(pe_ratio),
+                "peg_ratio": _num(peg_ratio),
+                "price_to_book": _num(price_to_book),
+                "debt_to_equity": _num(debt_to_equity),
+                "profit_margin": _num(profit_margin),
+                "roe": _num(roe),
+                "revenue_growth_yoy": _num(revenue_growth),
+                "quarterly_earnings": [
+                    {
+                        "fiscal_date": q.get('fiscalDateEnding'),
+                        "reported_eps": _num(q.get('reportedEPS')),
+                        "estimated_eps": _num(q.get('estimatedEPS')),
+                        "surprise_pct": _num(q.get('surprisePercentage')),
+                    }
+                    for q in quarters[:4]
+                ],
+            })
+
         # Format market cap
-        if market_cap != 'N/A':
-            market_cap = f"${int(market_cap):,}"
+        if market_cap not in _MISSING:
+            market_cap = _fmt_dollars(market_cap)
         
         # Convert percentages
-        if profit_margin != 'N/A':
-            profit_margin = f"{float(profit_margin)*100:.2f}%"
-        if roe != 'N/A':
-            roe = f"{float(roe)*100:.2f}%"
-        if revenue_growth != 'N/A':
-            revenue_growth = f"{float(revenue_growth)*100:.2f}%"
+        if profit_margin not in _MISSING:
+            profit_margin = _fmt_percent(profit_margin)
+        if roe not in _MISSING:
+            roe = _fmt_percent(roe)
+        if revenue_growth not in _MISSING:
+            revenue_growth = _fmt_percent(revenue_growth)
         
-        output = f"""
-Fundamental Data for {ticker}:
-Company: {name}
-Sector: {sector}
-Market Cap: {market_cap}
-
-Valuation Metrics:
-P/E Ratio: {pe_ratio}
-PEG Ratio: {peg_ratio}
-Price/Book: {price_to_book}
+        # Earnings are supplementary; a failed fetch leaves the overview intact
+        try:
+            earnings_block = _format_earnings(future_earnings.result())
+        except Exception:
+            earnings_block = ""
 
-Financial Health:
-Debt/Equity: {debt_to_equity}
-Profit Margin: {profit_margin}
-ROE: {roe}
-
-Growth:
-Revenue Growth (QoQ): {revenue_growth}
-"""
-        return output.strip()
+        return _FUNDAMENTALS_TEMPLATE.format_map({
+            "ticker": ticker,
+            "name": name,
+            "sector": sector,
+            "market_cap": market_cap,
+            "pe_ratio": pe_ratio,
+            "peg_ratio": peg_ratio,
+            "price_to_book": price_to_book,
+            "debt_to_equity": debt_to_equity,
+            "profit_margin": profit_margin,
+            "roe": roe,
+            "revenue_growth": revenue_growth,
+            "earnings_block": earnings_block,
+        })
         
     except Exception as e:
         return f"Error fetching fundamentals: {str(e)}"
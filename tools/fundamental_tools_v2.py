@@ -1,6 +1,501 @@
+import asyncio
+import functools
+import math
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import quote, urlencode
 from langchain_core.tools import tool
+import numpy as np
 import requests
-from config import ALPHA_VANTAGE_API_KEY, AV_BASE_URL, AV_TIMEOUT
+from requests.adapters import HTTPAdapter
+from urllib3.util import make_headers
+from urllib3.util.retry import Retry
+from config import ALPHA_VANTAGE_API_KEY, AV_BASE_URL, AV_TIMEOUT, AV_CACHE_DIR, AV_CACHE_TTL
+from tools.cache import FileCache
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import aiohttp
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    AIOHTTP_AVAILABLE = False
+
+
+# Shared HTTP session so repeated tool calls reuse the pooled TLS connection to Alpha Vantage
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=16,
+    max_retries=Retry(total=2, backoff_factor=0.2, status_forcelist=[429, 500, 502, 503, 504])
+))
+
+# Negotiate compressed JSON; make_headers only advertises br when brotli is installed
+_SESSION.headers.update(make_headers(accept_encoding=True, keep_alive=True))
+_SESSION.headers["Accept"] = "application/json"
+
+# One worker per Alpha Vantage function used by get_all_fundamentals
+_EXECUTOR = ThreadPoolExecutor(max_workers=5, thread_name_prefix="alphavantage")
+
+# Persistent response cache; fundamentals change at most quarterly
+_FILE_CACHE = FileCache(AV_CACHE_DIR, ttl=AV_CACHE_TTL)
+
+# In-process layer over the disk cache, so repeat calls within a session skip file I/O
+MEMORY_TTL = 3600  # seconds
+_MEMORY_CACHE: Dict[Tuple, Tuple[float, Any]] = {}
+_MEMORY_LOCK = threading.Lock()
+
+# Keys Alpha Vantage returns (with HTTP 200) for rate-limit notices and bad requests
+_AV_ERROR_KEYS = ('Note', 'Information', 'Error Message')
+
+
+def _cache_lookup(key: Dict[str, Any], namespace: str, ttl: int) -> Optional[Any]:
+    """Return a fresh cached payload from memory, then disk, or None."""
+    memory_key = tuple(sorted(key.items()))
+    now = time.monotonic()
+
+    with _MEMORY_LOCK:
+        entry = _MEMORY_CACHE.get(memory_key)
+        if entry is not None and entry[0] > now:
+            return entry[1]
+
+    data = _FILE_CACHE.get(key, namespace, ttl)
+    if data is not None:
+        with _MEMORY_LOCK:
+            _MEMORY_CACHE[memory_key] = (now + min(ttl, MEMORY_TTL), data)
+    return data
+
+
+def _cache_store(key: Dict[str, Any], namespace: str, data: Any, ttl: int) -> None:
+    """Record a fetched payload in both cache layers."""
+    with _MEMORY_LOCK:
+        _MEMORY_CACHE[tuple(sorted(key.items()))] = (time.monotonic() + min(ttl, MEMORY_TTL), data)
+    _FILE_CACHE.set(key, data, namespace)
+
+
+def _av_get(params: Dict[str, Any], ttl: int = AV_CACHE_TTL) -> Dict[str, Any]:
+    """GET an Alpha Vantage function, served from the memory or on-disk cache when fresh."""
+    # Keep the API key out of the cache key and off disk
+    key = {k: v for k, v in params.items() if k != 'apikey'}
+    namespace = str(params.get('symbol', '_')).upper()
+
+    data = _cache_lookup(key, namespace, ttl)
+    if data is not None:
+        return data
+
+    url, query = _request_url(params)
+    response = _SESSION.get(url, params=query, timeout=AV_TIMEOUT)
+    data = orjson.loads(response.content) if ORJSON_AVAILABLE else response.json()
+    data = _trim_payload(params.get('function'), data)
+
+    # Only persist real payloads so rate-limit notices are retried next call
+    if response.ok and _is_cacheable(data):
+        _cache_store(key, namespace, data, ttl)
+
+    return data
+
+
+_REPORT_KEYS = ('quarterlyReports', 'annualReports')
+_REPORT_LIMIT = 4  # Periods shown per statement
+
+# Overview keys get_company_overview reads (error keys kept so notices still surface)
+_OVERVIEW_KEYS = frozenset({
+    'Symbol', 'Name', 'Sector', 'Industry', 'Description', 'MarketCapitalization',
+    'PERatio', 'PEGRatio', 'PriceToBookRatio', 'PriceToSalesRatioTTM', 'EVToRevenue',
+    'EVToEBITDA', 'Beta', 'DividendYield', '52WeekHigh', '52WeekLow', 'AnalystTargetPrice',
+}).union(_AV_ERROR_KEYS)
+_DESCRIPTION_LIMIT = 200
+
+
+def _trim_payload(function: Optional[str], data: Any) -> Any:
+    """Reduce a payload to the keys, periods and line items the tools format.
+
+    Alpha Vantage returns every historical period with 30-50 line items each, and
+    ~50 overview keys of which ~15 are shown; trimming before caching keeps the disk
+    cache small and cheap to decode on later hits.
+    """
+    if not isinstance(data, dict):
+        return data
+
+    if function == 'OVERVIEW':
+        trimmed = {k: data[k] for k in _OVERVIEW_KEYS if k in data}
+        # Only the first 200 characters of the (often multi-KB) description are shown
+        if isinstance(trimmed.get('Description'), str):
+            trimmed['Description'] = trimmed['Description'][:_DESCRIPTION_LIMIT]
+        return trimmed
+
+    fields = _STATEMENT_FIELDS.get(function)
+    if fields is None:
+        return data
+
+    trimmed = dict(data)
+    for key in _REPORT_KEYS:
+        reports = data.get(key)
+        if isinstance(reports, list):
+            trimmed[key] = [
+                {f: report[f] for f in fields if f in report} if isinstance(report, dict) else report
+                for report in reports[:_REPORT_LIMIT]
+            ]
+    return trimmed
+
+
+def _is_cacheable(data: Any) -> bool:
+    """Return True if a decoded response is a real payload rather than an error notice."""
+    return isinstance(data, dict) and bool(data) and not any(k in data for k in _AV_ERROR_KEYS)
+
+
+# Functions backing the five tools, in the order get_all_fundamentals renders them
+_AV_FUNCTIONS = ('OVERVIEW', 'BALANCE_SHEET', 'INCOME_STATEMENT', 'CASH_FLOW', 'EARNINGS')
+
+# Query strings for the standard (function, apikey) pairs, encoded once at import;
+# per call only the symbol is appended, bypassing requests' param merging
+_FUNCTION_URLS = {
+    function: f"{AV_BASE_URL}?"
+              + urlencode({k: v for k, v in (('function', function), ('apikey', ALPHA_VANTAGE_API_KEY)) if v is not None})
+              + "&symbol="
+    for function in _AV_FUNCTIONS
+}
+
+
+def _request_url(params: Dict[str, Any]) -> Tuple[str, Optional[Dict[str, Any]]]:
+    """Return (url, params) for a request, using a preencoded URL for the standard calls."""
+    base = _FUNCTION_URLS.get(params.get('function'))
+    if (base is not None and len(params) == 3 and 'symbol' in params
+            and params.get('apikey') == ALPHA_VANTAGE_API_KEY):
+        return base + quote(str(params['symbol']), safe=''), None
+    return AV_BASE_URL, params
+
+
+async def _av_get_async(session: "aiohttp.ClientSession", params: Dict[str, Any],
+                        ttl: int = AV_CACHE_TTL) -> Dict[str, Any]:
+    """Async counterpart of _av_get sharing the same caches."""
+    key = {k: v for k, v in params.items() if k != 'apikey'}
+    namespace = str(params.get('symbol', '_')).upper()
+
+    data = _cache_lookup(key, namespace, ttl)
+    if data is not None:
+        return data
+
+    url, query = _request_url(params)
+    async with session.get(url, params=query) as response:
+        if ORJSON_AVAILABLE:
+            data = orjson.loads(await response.read())
+        else:
+            # Alpha Vantage sometimes labels JSON as text/html, so skip the content-type check
+            data = await response.json(content_type=None)
+        ok = response.status < 400
+
+    data = _trim_payload(params.get('function'), data)
+    if ok and _is_cacheable(data):
+        _cache_store(key, namespace, data, ttl)
+
+    return data
+
+
+async def aprefetch_fundamentals_batch(tickers: Iterable[str], functions: Iterable[str] = _AV_FUNCTIONS,
+                                      concurrency: int = 5) -> Dict[str, Dict[str, Optional[Dict[str, Any]]]]:
+    """Fetch Alpha Vantage fundamentals for many tickers at once and warm the disk cache.
+
+    All requests are submitted together on one event loop (bounded by concurrency),
+    so scanning a portfolio costs about N / concurrency round trips. The tools above
+    then answer from cache. Falls back to the thread pool when aiohttp is missing.
+
+    Args:
+        tickers: Stock symbols
+        functions: Alpha Vantage function names to fetch per ticker
+        concurrency: Maximum requests in flight
+
+    Returns:
+        {ticker: {function: decoded JSON, or None if the request failed}}
+    """
+    tickers = list(tickers)
+    functions = list(functions)
+    requests_list = [
+        {'function': function, 'symbol': ticker, 'apikey': ALPHA_VANTAGE_API_KEY}
+        for ticker in tickers
+        for function in functions
+    ]
+
+    if AIOHTTP_AVAILABLE:
+        semaphore = asyncio.Semaphore(concurrency)
+        # aiohttp sessions are bound to the running loop, so one is opened per batch
+        async with aiohttp.ClientSession(
+            headers={"Accept": "application/json"},
+            timeout=aiohttp.ClientTimeout(total=AV_TIMEOUT)
+        ) as session:
+            async def fetch(params):
+                async with semaphore:
+                    return await _av_get_async(session, params)
+
+            results = await asyncio.gather(*(fetch(p) for p in requests_list), return_exceptions=True)
+    else:
+        loop = asyncio.get_running_loop()
+        results = await asyncio.gather(
+            *(loop.run_in_executor(_EXECUTOR, _av_get, p) for p in requests_list),
+            return_exceptions=True
+        )
+
+    batch: Dict[str, Dict[str, Optional[Dict[str, Any]]]] = {ticker: {} for ticker in tickers}
+    for params, result in zip(requests_list, results):
+        batch[params['symbol']][params['function']] = None if isinstance(result, BaseException) else result
+    return batch
+
+
+# Placeholders Alpha Vantage uses for absent values; checked before any numeric conversion
+_MISSING = frozenset({'N/A', 'None', '-', '', None})
+
+
+# Statement line items repeat across quarters and tools, so memoize the formatting
+@functools.lru_cache(maxsize=4096)
+def _format_number(val):
+    """Format a raw integer string as dollars, passing through values that aren't integers."""
+    if val in _MISSING:
+        return 'N/A'
+    try:
+        # The f-string compiles to a direct format call; "$" + format(x, ",d") benchmarked
+        # no faster, and with lru_cache above repeated values never reach this line
+        return f"${int(val):,}"
+    except:
+        return val
+
+
+# Per-period output skeletons for the statement and earnings tools, built once at import
+_BALANCE_SHEET_TEMPLATE = """
+Period Ending: {fiscal_date}
+---
+Assets:
+  Total Assets: {total_assets}
+  Current Assets: {current_assets}
+  Cash & Equivalents: {cash}
+
+Liabilities:
+  Total Liabilities: {total_liabilities}
+  Current Liabilities: {current_liabilities}
+  Long-term Debt: {long_term_debt}
+
+Equity:
+  Shareholder Equity: {shareholder_equity}
+"""
+
+_INCOME_STATEMENT_TEMPLATE = """
+Period Ending: {fiscal_date}
+---
+Revenue:
+  Total Revenue: {total_revenue}
+  Cost of Revenue: {cost_of_revenue}
+  Gross Profit: {gross_profit}
+
+Operating Performance:
+  Operating Expenses: {operating_expenses}
+  R&D Expenses: {rd_expenses}
+  Operating Income: {operating_income}
+  EBIT: {ebit}
+  EBITDA: {ebitda}
+
+Bottom Line:
+  Net Income: {net_income}
+  EPS: {eps}
+"""
+
+_CASH_FLOW_TEMPLATE = """
+Period Ending: {fiscal_date}
+---
+Operating Activities:
+  Operating Cash Flow: {operating_cashflow}
+
+Investing Activities:
+  Cash Flow from Investment: {cashflow_from_investment}
+  Capital Expenditures: {capex}
+
+Financing Activities:
+  Cash Flow from Financing: {cashflow_from_financing}
+  Dividend Payout: {dividend_payout}
+
+Net Change:
+  Change in Cash: {net_change_in_cash}
+"""
+
+_EARNINGS_QUARTER_TEMPLATE = """
+Fiscal Quarter Ending: {fiscal_date}
+Reported Date: {reported_date}
+Reported EPS: {reported_eps}
+Estimated EPS: {estimated_eps}
+"""
+
+_EARNINGS_YEAR_TEMPLATE = """
+Fiscal Year Ending: {fiscal_date}
+Annual EPS: {reported_eps}
+"""
+
+# Fixed section headers, appended as-is alongside the rendered templates
+_QUARTERLY_EARNINGS_HEADER = "Quarterly Earnings (Last 8 Quarters):\n---\n"
+_ANNUAL_EARNINGS_HEADER = "\n\nAnnual Earnings (Last 5 Years):\n---\n"
+_PERIOD_SEPARATOR = "\n"
+
+
+def _to_float(val) -> Optional[float]:
+    """Convert a raw Alpha Vantage value to a finite float, or None if absent or malformed."""
+    if val in _MISSING:
+        return None
+    try:
+        num = float(val)
+    except (TypeError, ValueError):
+        return None
+    return num if math.isfinite(num) else None
+
+
+def _safe_ratio(num, den) -> Optional[float]:
+    """Divide two raw values, returning None instead of raising on missing or zero inputs."""
+    num, den = _to_float(num), _to_float(den)
+    if num is None or not den:
+        return None
+    return num / den
+
+
+def _balance_ratio_lines(report: Dict[str, Any]) -> List[str]:
+    """Render current ratio and debt-to-equity for a balance sheet report."""
+    lines = []
+    if (current_ratio := _safe_ratio(report.get('totalCurrentAssets'),
+                                     report.get('totalCurrentLiabilities'))) is not None:
+        lines.append(f"\nCurrent Ratio: {current_ratio:.2f}\n")
+    if (debt_to_equity := _safe_ratio(report.get('totalLiabilities'),
+                                      report.get('totalShareholderEquity'))) is not None:
+        lines.append(f"Debt-to-Equity: {debt_to_equity:.2f}\n")
+    return lines
+
+
+def _income_margin_lines(report: Dict[str, Any]) -> List[str]:
+    """Render gross, operating and net margins for an income statement report."""
+    total_revenue = report.get('totalRevenue')
+
+    lines = []
+    if (gross_margin := _safe_ratio(report.get('grossProfit'), total_revenue)) is not None:
+        lines.append(f"\nGross Margin: {gross_margin * 100:.2f}%\n")
+    if (operating_margin := _safe_ratio(report.get('operatingIncome'), total_revenue)) is not None:
+        lines.append(f"Operating Margin: {operating_margin * 100:.2f}%\n")
+    if (net_margin := _safe_ratio(report.get('netIncome'), total_revenue)) is not None:
+        lines.append(f"Net Margin: {net_margin * 100:.2f}%\n")
+    return lines
+
+
+def _free_cash_flow_lines(report: Dict[str, Any]) -> List[str]:
+    """Render free cash flow for a cash flow report."""
+    operating_cashflow = _to_float(report.get('operatingCashflow'))
+    capex = _to_float(report.get('capitalExpenditures'))
+    if operating_cashflow is None or capex is None:
+        return []
+    # CapEx is typically negative, so we add it
+    free_cashflow = operating_cashflow + capex
+    return [f"\nFree Cash Flow: ${int(free_cashflow):,}\n"]
+
+
+# Declarative layout of each Alpha Vantage financial statement:
+#   title    - output heading; noun - used in "no data" / error messages
+#   template - per-period skeleton
+#   values   - (placeholder, Alpha Vantage field, format as dollars?) filled per period
+#   derived  - renderer for ratios on the most recent period
+_STATEMENT_SPECS = {
+    'BALANCE_SHEET': {
+        'title': 'Balance Sheet',
+        'noun': 'balance sheet',
+        'template': _BALANCE_SHEET_TEMPLATE,
+        'values': [
+            ('total_assets', 'totalAssets', True),
+            ('current_assets', 'totalCurrentAssets', True),
+            ('cash', 'cashAndCashEquivalentsAtCarryingValue', True),
+            ('total_liabilities', 'totalLiabilities', True),
+            ('current_liabilities', 'totalCurrentLiabilities', True),
+            ('long_term_debt', 'longTermDebt', True),
+            ('shareholder_equity', 'totalShareholderEquity', True),
+        ],
+        'derived': _balance_ratio_lines,
+    },
+    'INCOME_STATEMENT': {
+        'title': 'Income Statement',
+        'noun': 'income statement',
+        'template': _INCOME_STATEMENT_TEMPLATE,
+        'values': [
+            ('total_revenue', 'totalRevenue', True),
+            ('cost_of_revenue', 'costOfRevenue', True),
+            ('gross_profit', 'grossProfit', True),
+            ('operating_expenses', 'operatingExpenses', True),
+            ('rd_expenses', 'researchAndDevelopment', True),
+            ('operating_income', 'operatingIncome', True),
+            ('ebit', 'ebit', True),
+            ('ebitda', 'ebitda', True),
+            ('net_income', 'netIncome', True),
+            ('eps', 'reportedEPS', False),
+        ],
+        'derived': _income_margin_lines,
+    },
+    'CASH_FLOW': {
+        'title': 'Cash Flow Statement',
+        'noun': 'cash flow',
+        'template': _CASH_FLOW_TEMPLATE,
+        'values': [
+            ('operating_cashflow', 'operatingCashflow', True),
+            ('cashflow_from_investment', 'cashflowFromInvestment', True),
+            ('capex', 'capitalExpenditures', True),
+            ('cashflow_from_financing', 'cashflowFromFinancing', True),
+            ('dividend_payout', 'dividendPayout', True),
+            ('net_change_in_cash', 'changeInCashAndCashEquivalents', True),
+        ],
+        'derived': _free_cash_flow_lines,
+    },
+}
+
+# Line items the statement tools render; the rest of each report is dropped on fetch
+_STATEMENT_FIELDS = {
+    function: ('fiscalDateEnding',) + tuple(field for _, field, _ in spec['values'])
+    for function, spec in _STATEMENT_SPECS.items()
+}
+
+
+def _render_statement(ticker: str, period: str, function: str) -> str:
+    """Fetch one Alpha Vantage financial statement and format its recent periods per spec."""
+    spec = _STATEMENT_SPECS[function]
+    try:
+        params = {
+            'function': function,
+            'symbol': ticker,
+            'apikey': ALPHA_VANTAGE_API_KEY
+        }
+
+        data = _av_get(params)
+
+        # Select quarterly or annual reports
+        report_key = 'quarterlyReports' if period == 'quarterly' else 'annualReports'
+
+        if report_key not in data or not data[report_key]:
+            return f"No {spec['noun']} data available for {ticker}"
+
+        reports = data[report_key][:_REPORT_LIMIT]
+
+        parts = [f"{spec['title']} for {ticker} ({period.capitalize()}):\n\n"]
+
+        for i, report in enumerate(reports):
+            values = {'fiscal_date': report.get('fiscalDateEnding', 'N/A')}
+            for name, field, money in spec['values']:
+                val = report.get(field, 'N/A')
+                values[name] = _format_number(val) if money else val
+            parts.append(spec['template'].format_map(values))
+
+            # Calculate key ratios for most recent period
+            if i == 0:
+                parts.extend(spec['derived'](report))
+
+            parts.append(_PERIOD_SEPARATOR)
+
+        return "".join(parts).strip()
+
+    except Exception as e:
+        return f"Error fetching {spec['noun']} for {ticker}: {str(e)}"
 
 
 @tool
@@ -22,8 +517,7 @@ def get_company_overview(ticker: str) -> str:
             'apikey': ALPHA_VANTAGE_API_KEY
         }
 
-        response = requests.get(AV_BASE_URL, params=params, timeout=AV_TIMEOUT)
-        data = response.json()
+        data = _av_get(params)
 
         if not data or 'Symbol' not in data:
             return f"No company overview data available for {ticker}"
@@ -51,14 +545,14 @@ def get_company_overview(ticker: str) -> str:
         analyst_target = data.get('AnalystTargetPrice', 'N/A')
 
         # Format market cap
-        if market_cap != 'N/A':
+        if market_cap not in _MISSING:
             try:
                 market_cap = f"${int(market_cap):,}"
             except:
                 pass
 
         # Convert percentages
-        if dividend_yield != 'N/A':
+        if dividend_yield not in _MISSING:
             try:
                 dividend_yield = f"{float(dividend_yield)*100:.2f}%"
             except:
@@ -88,7 +582,7 @@ Dividend Yield: {dividend_yield}
 52-Week Low: ${week_52_low}
 Analyst Target: ${analyst_target}
 
-Description: {description[:200]}...
+Description: {description[:_DESCRIPTION_LIMIT]}...
 """
         return output.strip()
 
@@ -109,87 +603,7 @@ def get_balance_sheet(ticker: str, period: str = 'quarterly') -> str:
     Returns:
         Formatted string with balance sheet data for recent periods
     """
-    try:
-        params = {
-            'function': 'BALANCE_SHEET',
-            'symbol': ticker,
-            'apikey': ALPHA_VANTAGE_API_KEY
-        }
-
-        response = requests.get(AV_BASE_URL, params=params, timeout=AV_TIMEOUT)
-        data = response.json()
-
-        # Select quarterly or annual reports
-        report_key = 'quarterlyReports' if period == 'quarterly' else 'annualReports'
-
-        if report_key not in data or not data[report_key]:
-            return f"No balance sheet data available for {ticker}"
-
-        reports = data[report_key][:4]  # Get last 4 periods
-
-        output = f"Balance Sheet for {ticker} ({period.capitalize()}):\n\n"
-
-        for i, report in enumerate(reports):
-            fiscal_date = report.get('fiscalDateEnding', 'N/A')
-
-            # Assets
-            total_assets = report.get('totalAssets', 'N/A')
-            current_assets = report.get('totalCurrentAssets', 'N/A')
-            cash = report.get('cashAndCashEquivalentsAtCarryingValue', 'N/A')
-
-            # Liabilities
-            total_liabilities = report.get('totalLiabilities', 'N/A')
-            current_liabilities = report.get('totalCurrentLiabilities', 'N/A')
-            long_term_debt = report.get('longTermDebt', 'N/A')
-
-            # Equity
-            shareholder_equity = report.get('totalShareholderEquity', 'N/A')
-
-            # Format numbers
-            def format_number(val):
-                if val == 'N/A':
-                    return 'N/A'
-                try:
-                    return f"${int(val):,}"
-                except:
-                    return val
-
-            output += f"""
-Period Ending: {fiscal_date}
----
-Assets:
-  Total Assets: {format_number(total_assets)}
-  Current Assets: {format_number(current_assets)}
-  Cash & Equivalents: {format_number(cash)}
-
-Liabilities:
-  Total Liabilities: {format_number(total_liabilities)}
-  Current Liabilities: {format_number(current_liabilities)}
-  Long-term Debt: {format_number(long_term_debt)}
-
-Equity:
-  Shareholder Equity: {format_number(shareholder_equity)}
-"""
-
-            # Calculate key ratios for most recent period
-            if i == 0:
-                try:
-                    if current_assets != 'N/A' and current_liabilities != 'N/A':
-                        current_ratio = float(current_assets) / float(current_liabilities)
-                        output += f"\nCurrent Ratio: {current_ratio:.2f}\n"
-
-                    if total_liabilities != 'N/A' and shareholder_equity != 'N/A':
-                        debt_to_equity = float(total_liabilities) / float(shareholder_equity)
-                        output += f"Debt-to-Equity: {debt_to_equity:.2f}\n"
-                except:
-                    pass
-
-            output += "\n"
-
-        return output.strip()
-
-    except Exception as e:
-        return f"Error fetching balance sheet for {ticker}: {str(e)}"
+    return _render_statement(ticker, period, 'BALANCE_SHEET')
 
 
 @tool
@@ -205,97 +619,7 @@ def get_income_statement(ticker: str, period: str = 'quarterly') -> str:
     Returns:
         Formatted string with income statement data for recent periods
     """
-    try:
-        params = {
-            'function': 'INCOME_STATEMENT',
-            'symbol': ticker,
-            'apikey': ALPHA_VANTAGE_API_KEY
-        }
-
-        response = requests.get(AV_BASE_URL, params=params, timeout=AV_TIMEOUT)
-        data = response.json()
-
-        # Select quarterly or annual reports
-        report_key = 'quarterlyReports' if period == 'quarterly' else 'annualReports'
-
-        if report_key not in data or not data[report_key]:
-            return f"No income statement data available for {ticker}"
-
-        reports = data[report_key][:4]  # Get last 4 periods
-
-        output = f"Income Statement for {ticker} ({period.capitalize()}):\n\n"
-
-        for i, report in enumerate(reports):
-            fiscal_date = report.get('fiscalDateEnding', 'N/A')
-
-            # Revenue and income
-            total_revenue = report.get('totalRevenue', 'N/A')
-            gross_profit = report.get('grossProfit', 'N/A')
-            operating_income = report.get('operatingIncome', 'N/A')
-            ebit = report.get('ebit', 'N/A')
-            ebitda = report.get('ebitda', 'N/A')
-            net_income = report.get('netIncome', 'N/A')
-
-            # Per share metrics
-            eps = report.get('reportedEPS', 'N/A')
-
-            # Expenses
-            cost_of_revenue = report.get('costOfRevenue', 'N/A')
-            operating_expenses = report.get('operatingExpenses', 'N/A')
-            rd_expenses = report.get('researchAndDevelopment', 'N/A')
-
-            # Format numbers
-            def format_number(val):
-                if val == 'N/A':
-                    return 'N/A'
-                try:
-                    return f"${int(val):,}"
-                except:
-                    return val
-
-            output += f"""
-Period Ending: {fiscal_date}
----
-Revenue:
-  Total Revenue: {format_number(total_revenue)}
-  Cost of Revenue: {format_number(cost_of_revenue)}
-  Gross Profit: {format_number(gross_profit)}
-
-Operating Performance:
-  Operating Expenses: {format_number(operating_expenses)}
-  R&D Expenses: {format_number(rd_expenses)}
-  Operating Income: {format_number(operating_income)}
-  EBIT: {format_number(ebit)}
-  EBITDA: {format_number(ebitda)}
-
-Bottom Line:
-  Net Income: {format_number(net_income)}
-  EPS: {eps}
-"""
-
-            # Calculate margins for most recent period
-            if i == 0:
-                try:
-                    if gross_profit != 'N/A' and total_revenue != 'N/A':
-                        gross_margin = (float(gross_profit) / float(total_revenue)) * 100
-                        output += f"\nGross Margin: {gross_margin:.2f}%\n"
-
-                    if operating_income != 'N/A' and total_revenue != 'N/A':
-                        operating_margin = (float(operating_income) / float(total_revenue)) * 100
-                        output += f"Operating Margin: {operating_margin:.2f}%\n"
-
-                    if net_income != 'N/A' and total_revenue != 'N/A':
-                        net_margin = (float(net_income) / float(total_revenue)) * 100
-                        output += f"Net Margin: {net_margin:.2f}%\n"
-                except:
-                    pass
-
-            output += "\n"
-
-        return output.strip()
-
-    except Exception as e:
-        return f"Error fetching income statement for {ticker}: {str(e)}"
+    return _render_statement(ticker, period, 'INCOME_STATEMENT')
 
 
 @tool
@@ -311,86 +635,7 @@ def get_cash_flow(ticker: str, period: str = 'quarterly') -> str:
     Returns:
         Formatted string with cash flow data for recent periods
     """
-    try:
-        params = {
-            'function': 'CASH_FLOW',
-            'symbol': ticker,
-            'apikey': ALPHA_VANTAGE_API_KEY
-        }
-
-        response = requests.get(AV_BASE_URL, params=params, timeout=AV_TIMEOUT)
-        data = response.json()
-
-        # Select quarterly or annual reports
-        report_key = 'quarterlyReports' if period == 'quarterly' else 'annualReports'
-
-        if report_key not in data or not data[report_key]:
-            return f"No cash flow data available for {ticker}"
-
-        reports = data[report_key][:4]  # Get last 4 periods
-
-        output = f"Cash Flow Statement for {ticker} ({period.capitalize()}):\n\n"
-
-        for i, report in enumerate(reports):
-            fiscal_date = report.get('fiscalDateEnding', 'N/A')
-
-            # Operating activities
-            operating_cashflow = report.get('operatingCashflow', 'N/A')
-
-            # Investing activities
-            capex = report.get('capitalExpenditures', 'N/A')
-            cashflow_from_investment = report.get('cashflowFromInvestment', 'N/A')
-
-            # Financing activities
-            cashflow_from_financing = report.get('cashflowFromFinancing', 'N/A')
-            dividend_payout = report.get('dividendPayout', 'N/A')
-
-            # Net change
-            net_change_in_cash = report.get('changeInCashAndCashEquivalents', 'N/A')
-
-            # Format numbers
-            def format_number(val):
-                if val == 'N/A':
-                    return 'N/A'
-                try:
-                    return f"${int(val):,}"
-                except:
-                    return val
-
-            output += f"""
-Period Ending: {fiscal_date}
----
-Operating Activities:
-  Operating Cash Flow: {format_number(operating_cashflow)}
-
-Investing Activities:
-  Cash Flow from Investment: {format_number(cashflow_from_investment)}
-  Capital Expenditures: {format_number(capex)}
-
-Financing Activities:
-  Cash Flow from Financing: {format_number(cashflow_from_financing)}
-  Dividend Payout: {format_number(dividend_payout)}
-
-Net Change:
-  Change in Cash: {format_number(net_change_in_cash)}
-"""
-
-            # Calculate free cash flow for most recent period
-            if i == 0:
-                try:
-                    if operating_cashflow != 'N/A' and capex != 'N/A':
-                        # CapEx is typically negative, so we add it
-                        free_cashflow = float(operating_cashflow) + float(capex)
-                        output += f"\nFree Cash Flow: ${int(free_cashflow):,}\n"
-                except:
-                    pass
-
-            output += "\n"
-
-        return output.strip()
-
-    except Exception as e:
-        return f"Error fetching cash flow for {ticker}: {str(e)}"
+    return _render_statement(ticker, period, 'CASH_FLOW')
 
 
 @tool
@@ -412,17 +657,15 @@ def get_earnings(ticker: str) -> str:
             'apikey': ALPHA_VANTAGE_API_KEY
         }
 
-        response = requests.get(AV_BASE_URL, params=params, timeout=AV_TIMEOUT)
-        data = response.json()
+        data = _av_get(params)
 
-        output = f"Earnings Data for {ticker}:\n\n"
+        parts = [f"Earnings Data for {ticker}:\n\n"]
 
         # Quarterly earnings
         if 'quarterlyEarnings' in data and data['quarterlyEarnings']:
             quarterly = data['quarterlyEarnings'][:8]  # Last 8 quarters (2 years)
 
-            output += "Quarterly Earnings (Last 8 Quarters):\n"
-            output += "---\n"
+            parts.append(_QUARTERLY_EARNINGS_HEADER)
 
             for q in quarterly:
                 fiscal_date = q.get('fiscalDateEnding', 'N/A')
@@ -432,48 +675,188 @@ def get_earnings(ticker: str) -> str:
                 surprise = q.get('surprise', 'N/A')
                 surprise_pct = q.get('surprisePercentage', 'N/A')
 
-                output += f"\nFiscal Quarter Ending: {fiscal_date}\n"
-                output += f"Reported Date: {reported_date}\n"
-                output += f"Reported EPS: {reported_eps}\n"
-                output += f"Estimated EPS: {estimated_eps}\n"
+                parts.append(_EARNINGS_QUARTER_TEMPLATE.format_map({
+                    "fiscal_date": fiscal_date,
+                    "reported_date": reported_date,
+                    "reported_eps": reported_eps,
+                    "estimated_eps": estimated_eps,
+                }))
 
-                if surprise != 'N/A' and surprise_pct != 'N/A':
+                if surprise not in _MISSING and surprise_pct not in _MISSING:
                     try:
                         surprise_val = float(surprise)
                         surprise_pct_val = float(surprise_pct)
                         beat_miss = "Beat" if surprise_val > 0 else "Miss" if surprise_val < 0 else "Met"
-                        output += f"Surprise: ${surprise_val:.2f} ({surprise_pct_val:.1f}%) - {beat_miss}\n"
+                        parts.append(f"Surprise: ${surprise_val:.2f} ({surprise_pct_val:.1f}%) - {beat_miss}\n")
                     except:
-                        output += f"Surprise: {surprise}\n"
+                        parts.append(f"Surprise: {surprise}\n")
 
         # Annual earnings
         if 'annualEarnings' in data and data['annualEarnings']:
             annual = data['annualEarnings'][:5]  # Last 5 years
 
-            output += "\n\nAnnual Earnings (Last 5 Years):\n"
-            output += "---\n"
+            parts.append(_ANNUAL_EARNINGS_HEADER)
 
             for a in annual:
                 fiscal_date = a.get('fiscalDateEnding', 'N/A')
                 reported_eps = a.get('reportedEPS', 'N/A')
 
-                output += f"\nFiscal Year Ending: {fiscal_date}\n"
-                output += f"Annual EPS: {reported_eps}\n"
+                parts.append(_EARNINGS_YEAR_TEMPLATE.format_map({
+                    "fiscal_date": fiscal_date,
+                    "reported_eps": reported_eps,
+                }))
 
         if 'quarterlyEarnings' not in data and 'annualEarnings' not in data:
             return f"No earnings data available for {ticker}"
 
-        return output.strip()
+        return "".join(parts).strip()
 
     except Exception as e:
         return f"Error fetching earnings for {ticker}: {str(e)}"
 
 
+@tool
+def get_all_fundamentals(ticker: str, period: str = 'quarterly') -> str:
+    """Get overview, balance sheet, income statement, cash flow and earnings from Alpha Vantage in one call.
+
+    The five underlying requests are issued concurrently, so this costs roughly one
+    round trip instead of five sequential tool calls.
+
+    Args:
+        ticker: Stock symbol
+        period: 'quarterly' or 'annual' for the financial statements (default: 'quarterly')
+
+    Returns:
+        Formatted string with all five sections, as produced by the individual tools
+    """
+    calls = [
+        (get_company_overview, {'ticker': ticker}),
+        (get_balance_sheet, {'ticker': ticker, 'period': period}),
+        (get_income_statement, {'ticker': ticker, 'period': period}),
+        (get_cash_flow, {'ticker': ticker, 'period': period}),
+        (get_earnings, {'ticker': ticker}),
+    ]
+    # Each tool catches its own errors and returns a message, so map never raises here
+    sections = _EXECUTOR.map(lambda call: call[0].invoke(call[1]), calls)
+    return "\n\n".join(sections)
+
+
+# Most-recent-period inputs for get_fundamentals_batch: (statement, field) per matrix column
+_BATCH_COLUMNS = (
+    ('INCOME_STATEMENT', 'totalRevenue'),
+    ('INCOME_STATEMENT', 'grossProfit'),
+    ('INCOME_STATEMENT', 'operatingIncome'),
+    ('INCOME_STATEMENT', 'netIncome'),
+    ('BALANCE_SHEET', 'totalCurrentAssets'),
+    ('BALANCE_SHEET', 'totalCurrentLiabilities'),
+    ('BALANCE_SHEET', 'totalLiabilities'),
+    ('BALANCE_SHEET', 'totalShareholderEquity'),
+    ('CASH_FLOW', 'operatingCashflow'),
+    ('CASH_FLOW', 'capitalExpenditures'),
+)
+
+
+def _float_or_nan(val) -> float:
+    """Convert a raw Alpha Vantage value to float, using NaN for absent or malformed values."""
+    if val in _MISSING:
+        return np.nan
+    try:
+        return float(val)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def _batch_metrics(values: np.ndarray) -> Dict[str, np.ndarray]:
+    """Compute margins and ratios for every row of a (tickers x _BATCH_COLUMNS) matrix at once.
+
+    Zero or missing denominators yield NaN rather than raising.
+    """
+    (revenue, gross_profit, operating_income, net_income, current_assets,
+     current_liabilities, total_liabilities, equity, operating_cashflow, capex) = values.T
+
+    def ratio(num: np.ndarray, den: np.ndarray) -> np.ndarray:
+        out = np.full_like(num, np.nan)
+        np.divide(num, den, out=out, where=(den != 0) & np.isfinite(den))
+        return out
+
+    return {
+        'gross_margin': ratio(gross_profit, revenue) * 100,
+        'operating_margin': ratio(operating_income, revenue) * 100,
+        'net_margin': ratio(net_income, revenue) * 100,
+        'current_ratio': ratio(current_assets, current_liabilities),
+        'debt_to_equity': ratio(total_liabilities, equity),
+        # CapEx is typically negative, so we add it
+        'free_cashflow': operating_cashflow + capex,
+    }
+
+
+@tool
+def get_fundamentals_batch(tickers: str, period: str = 'quarterly') -> str:
+    """Get key margins and ratios for several tickers at once from Alpha Vantage.
+
+    Statements for all tickers are fetched concurrently and the ratios for the most
+    recent period are computed in one vectorized pass, for screening a portfolio.
+
+    Args:
+        tickers: Comma-separated stock symbols (e.g. "AAPL,MSFT,NVDA")
+        period: 'quarterly' or 'annual' (default: 'quarterly')
+
+    Returns:
+        One line per ticker with margins, current ratio, debt-to-equity and free cash flow
+    """
+    symbols = [t.strip().upper() for t in tickers.split(',') if t.strip()]
+    if not symbols:
+        return "No tickers provided"
+
+    functions = sorted({function for function, _ in _BATCH_COLUMNS})
+    requests_list = [
+        {'function': function, 'symbol': symbol, 'apikey': ALPHA_VANTAGE_API_KEY}
+        for symbol in symbols
+        for function in functions
+    ]
+
+    def fetch(params):
+        try:
+            return _av_get(params)
+        except Exception:
+            return {}  # Reported as N/A below
+
+    report_key = 'quarterlyReports' if period == 'quarterly' else 'annualReports'
+    latest: Dict[Tuple[str, str], Dict[str, Any]] = {}
+    for params, data in zip(requests_list, _EXECUTOR.map(fetch, requests_list)):
+        reports = data.get(report_key) if isinstance(data, dict) else None
+        latest[(params['symbol'], params['function'])] = reports[0] if reports else {}
+
+    values = np.array([
+        [_float_or_nan(latest[(symbol, function)].get(field)) for function, field in _BATCH_COLUMNS]
+        for symbol in symbols
+    ], dtype=np.float64)
+    metrics = _batch_metrics(values)
+
+    def fmt(val: float, spec: str, suffix: str = '') -> str:
+        return format(val, spec) + suffix if np.isfinite(val) else 'N/A'
+
+    lines = [f"Fundamentals Batch ({period.capitalize()}, most recent period):\n"]
+    for i, symbol in enumerate(symbols):
+        fcf = metrics['free_cashflow'][i]
+        lines.append(
+            f"{symbol}: Gross Margin {fmt(metrics['gross_margin'][i], '.2f', '%')} | "
+            f"Operating Margin {fmt(metrics['operating_margin'][i], '.2f', '%')} | "
+            f"Net Margin {fmt(metrics['net_margin'][i], '.2f', '%')} | "
+            f"Current Ratio {fmt(metrics['current_ratio'][i], '.2f')} | "
+            f"Debt-to-Equity {fmt(metrics['debt_to_equity'][i], '.2f')} | "
+            f"Free Cash Flow {'$' + format(int(fcf), ',') if np.isfinite(fcf) else 'N/A'}"
+        )
+    return "\n".join(lines)
+
+
 # Tool list for export
 FUNDAMENTAL_TOOLS = [
     get_company_overview,
     get_balance_sheet,
     get_income_statement,
     get_cash_flow,
-    get_earnings
+    get_earnings,
+    get_all_fundamentals,
+    get_fundamentals_batch
 ]
@@ -5,13 +5,355 @@ This module provides tools for fetching financial statements and fundamental dat
 using yfinance - completely FREE with no API key required!
 """
 
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
 from langchain_core.tools import tool
 import yfinance as yf
+import numpy as np
 import pandas as pd
+import requests
+from requests.adapters import HTTPAdapter
+from config import HTTP_CACHE_DIR, YF_CACHE_DISABLE
+
+try:
+    import diskcache
+    DISKCACHE_AVAILABLE = True
+except ImportError:
+    DISKCACHE_AVAILABLE = False
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    from curl_cffi import requests as curl_requests
+    CURL_CFFI_AVAILABLE = True
+except ImportError:
+    CURL_CFFI_AVAILABLE = False
+
+
+# Cache lifetimes (seconds) per data type
+INFO_TTL = 24 * 3600       # Company profile and valuation snapshot
+STATEMENT_TTL = 6 * 3600   # Balance sheet / income / cash flow only change quarterly
+EARNINGS_TTL = 30 * 60     # Earnings history (updates around report dates)
+QUOTE_TTL = 5 * 60         # Price-driven fast_info fields (market cap, 52-week range)
+
+# Persistent cache shared across runs; DataFrames are pickled by diskcache.
+# Without diskcache, results are only memoized in-process.
+_DISK_CACHE = diskcache.Cache(str(HTTP_CACHE_DIR / "yfinance")) if DISKCACHE_AVAILABLE else None
+_MEMORY_CACHE: Dict[Tuple, Tuple[float, Any]] = {}
+_MEMORY_LOCK = threading.Lock()
+_MISS = object()
+# Ticker objects by symbol, as (expiry, Ticker); see _ticker
+_TICKERS: Dict[str, Tuple[float, yf.Ticker]] = {}
+_TICKERS_MAXSIZE = 256
+
+# Shared HTTP session so every Ticker reuses pooled connections to Yahoo.
+# Recent yfinance releases only accept a curl_cffi session (and install curl_cffi);
+# older ones take a plain requests session.
+if CURL_CFFI_AVAILABLE:
+    _SESSION = curl_requests.Session(impersonate="chrome")
+else:
+    _SESSION = requests.Session()
+    _SESSION.mount("https://", HTTPAdapter(pool_connections=32, pool_maxsize=32))
+
+# Worker pool for warming the caches concurrently
+_EXECUTOR = ThreadPoolExecutor(max_workers=8, thread_name_prefix="yfinance")
+
+
+def _has_data(value: Any) -> bool:
+    """Return True for a non-empty yfinance result worth caching."""
+    if isinstance(value, pd.DataFrame):
+        return not value.empty
+    return bool(value)
+
+
+def _cached(key: Tuple, ttl: int, loader: Callable[[], Any]) -> Any:
+    """Return loader() memoized under key for ttl seconds (empty results are not cached)."""
+    if YF_CACHE_DISABLE:
+        return loader()
+
+    if _DISK_CACHE is not None:
+        value = _DISK_CACHE.get(key, default=_MISS)
+        if value is not _MISS:
+            return value
+        value = loader()
+        if _has_data(value):
+            _DISK_CACHE.set(key, value, expire=ttl)
+        return value
+
+    now = time.monotonic()
+    with _MEMORY_LOCK:
+        entry = _MEMORY_CACHE.get(key)
+        if entry is not None and entry[0] > now:
+            return entry[1]
+    value = loader()
+    if _has_data(value):
+        with _MEMORY_LOCK:
+            _MEMORY_CACHE[key] = (now + ttl, value)
+    return value
+
+
+def _ticker(ticker: str) -> yf.Ticker:
+    """yfinance Ticker bound to the shared session, reused for QUOTE_TTL.
+
+    Sharing one Ticker lets the tools reuse the data yfinance loads lazily.
+    Replacing it after QUOTE_TTL keeps that data from outliving the TTLs above.
+    """
+    now = time.monotonic()
+    with _MEMORY_LOCK:
+        entry = _TICKERS.get(ticker)
+        if entry is not None and entry[0] > now:
+            return entry[1]
+        if len(_TICKERS) >= _TICKERS_MAXSIZE:
+            for key in [k for k, (expires, _) in _TICKERS.items() if expires <= now]:
+                del _TICKERS[key]
+        value = yf.Ticker(ticker, session=_SESSION)
+        _TICKERS[ticker] = (now + QUOTE_TTL, value)
+    return value
+
+
+def _cached_info(ticker: str) -> Dict[str, Any]:
+    """Ticker.info, cached for INFO_TTL."""
+    return _cached(("info", ticker), INFO_TTL, lambda: _ticker(ticker).info)
+
+
+# Ticker.fast_info fields used by the quick overview; served by a much smaller
+# endpoint than the full .info scrape
+_FAST_INFO_FIELDS = ("market_cap", "last_price", "year_high", "year_low", "currency")
+
+
+def _cached_fast_info(ticker: str) -> Dict[str, Any]:
+    """The available _FAST_INFO_FIELDS from Ticker.fast_info, cached for QUOTE_TTL."""
+    def load() -> Dict[str, Any]:
+        fast_info = _ticker(ticker).fast_info
+        return {k: v for k in _FAST_INFO_FIELDS if (v := fast_info.get(k)) is not None}
+
+    return _cached(("fast_info", ticker), QUOTE_TTL, load)
+
+
+def _cached_statement(ticker: str, statement: str, period: str) -> pd.DataFrame:
+    """One financial statement ('balance_sheet', 'income_stmt' or 'cashflow'), cached for STATEMENT_TTL."""
+    attr = f"quarterly_{statement}" if period == 'quarterly' else statement
+    return _cached((statement, ticker, period), STATEMENT_TTL, lambda: getattr(_ticker(ticker), attr))
+
+
+def _cached_earnings_history(ticker: str) -> Optional[pd.DataFrame]:
+    """Ticker.earnings_history (None if this yfinance version lacks it), cached for EARNINGS_TTL."""
+    return _cached(("earnings_history", ticker), EARNINGS_TTL,
+                   lambda: getattr(_ticker(ticker), "earnings_history", None))
+
+
+# Statement rows each tool renders, in the order they are unpacked from the matrix
+BS_FIELDS = [
+    "Total Assets", "Current Assets", "Cash And Cash Equivalents",
+    "Total Liabilities Net Minority Interest", "Current Liabilities", "Long Term Debt",
+    "Stockholders Equity",
+]
+INCOME_FIELDS = [
+    "Total Revenue", "Gross Profit", "Operating Income", "EBITDA", "Net Income",
+    "Basic EPS", "Diluted EPS", "Cost Of Revenue", "Operating Expense", "Research And Development",
+]
+CASH_FLOW_FIELDS = [
+    "Operating Cash Flow", "Capital Expenditure", "Investing Cash Flow", "Financing Cash Flow",
+    "Cash Dividends Paid", "End Cash Position", "Free Cash Flow",
+]
+# JSON keys for the rows above, in the same order
+BS_KEYS = [
+    "total_assets", "current_assets", "cash", "total_liabilities", "current_liabilities",
+    "long_term_debt", "shareholder_equity",
+]
+INCOME_KEYS = [
+    "total_revenue", "gross_profit", "operating_income", "ebitda", "net_income",
+    "eps_basic", "eps_diluted", "cost_of_revenue", "operating_expenses", "rd_expenses",
+]
+CASH_FLOW_KEYS = [
+    "operating_cashflow", "capex", "cashflow_from_investment", "cashflow_from_financing",
+    "dividend_payout", "net_change_in_cash", "free_cashflow",
+]
+# Annual revenue/earnings come from the income statement (Ticker.earnings is deprecated)
+ANNUAL_EARNINGS_FIELDS = ["Total Revenue", "Net Income"]
+
+
+def _statement_matrix(df: pd.DataFrame, fields: List[str], periods: int = 4) -> Tuple[List[str], np.ndarray]:
+    """Select fields x the most recent periods as a float matrix (missing rows become NaN).
+
+    Returns the period end dates as 'YYYY-MM-DD' strings alongside the matrix.
+    """
+    sub = df.reindex(fields).iloc[:, :periods]
+    dates = sub.columns
+    if isinstance(dates, pd.DatetimeIndex):
+        date_strs = dates.strftime('%Y-%m-%d').tolist()
+    else:
+        date_strs = [str(d)[:10] for d in dates]
+    return date_strs, sub.to_numpy(dtype=float)
+
+
+# Rendered rows per statement type, for _statement_view
+_STATEMENT_FIELDS = {
+    'balance_sheet': BS_FIELDS,
+    'income_stmt': INCOME_FIELDS,
+    'cashflow': CASH_FLOW_FIELDS,
+}
+
+
+def _statement_view(ticker: str, statement: str, period: str) -> Optional[Tuple[List[str], np.ndarray]]:
+    """(date strings, field matrix) for a statement tool, memoized for STATEMENT_TTL.
+
+    Returns None when the statement is empty. Caching the extracted view means
+    repeat calls skip the DataFrame reindex and go straight to string assembly.
+    """
+    def load() -> Optional[Tuple[List[str], np.ndarray]]:
+        df = _cached_statement(ticker, statement, period)
+        if df is None or df.empty:
+            return None
+        return _statement_matrix(df, _STATEMENT_FIELDS[statement])
+
+    return _cached(("view", statement, ticker, period), STATEMENT_TTL, load)
+
+
+def _ratio(numerator: float, denominator: float, scale: float = 1.0) -> Optional[float]:
+    """numerator / denominator * scale, or None if either is NaN or the denominator is 0."""
+    if np.isnan(numerator) or np.isnan(denominator) or denominator == 0:
+        return None
+    return float(numerator) / float(denominator) * scale
+
+
+def _json_value(val: float) -> Any:
+    """NaN -> None; whole numbers as int so the JSON carries no trailing '.0'."""
+    if val != val:
+        return None
+    return int(val) if val.is_integer() else val
+
+
+def _statement_json(ticker: str, period: str, dates: List[str], arr: np.ndarray,
+                    keys: List[str], ratios: Optional[Dict[str, Optional[float]]] = None) -> str:
+    """Compact JSON for a statement view: {"ticker", "period", "periods": [...], "ratios"}."""
+    payload: Dict[str, Any] = {
+        "ticker": ticker,
+        "period": period,
+        "periods": [
+            {"date": date, **{k: _json_value(v) for k, v in zip(keys, column)}}
+            for date, column in zip(dates, arr.T.tolist())
+        ],
+    }
+    if ratios:
+        payload["ratios"] = {k: None if v is None else round(v, 4) for k, v in ratios.items()}
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(payload).decode()
+    return json.dumps(payload, separators=(",", ":"))
+
+
+def _format_number(val: float) -> str:
+    """Format a statement value as whole dollars ('N/A' for NaN)."""
+    # NaN is the only value not equal to itself; formatting the float directly
+    # skips the int() round trip (and can't overflow on inf)
+    if val != val:
+        return 'N/A'
+    return f"${val:,.0f}"
+
+
+class _NADict(dict):
+    """format_map mapping that renders any missing placeholder as 'N/A'."""
+
+    def __missing__(self, key: str) -> str:
+        return 'N/A'
+
+
+def _period_values(fiscal_date: str, keys: List[str], column: np.ndarray) -> _NADict:
+    """Template mapping for one period: each value as whole dollars, NaN as 'N/A'."""
+    values = _NADict(zip(keys, map(_format_number, column)))
+    values["fiscal_date"] = fiscal_date
+    return values
+
+
+# Per-period output skeletons for the statement tools, built once at import.
+# All three share the period header; placeholders match BS_KEYS / INCOME_KEYS / CASH_FLOW_KEYS.
+_PERIOD_HEADER = """
+Period Ending: {fiscal_date}
+---
+"""
+
+_BALANCE_SHEET_TEMPLATE = _PERIOD_HEADER + """Assets:
+  Total Assets: {total_assets}
+  Current Assets: {current_assets}
+  Cash & Equivalents: {cash}
+
+Liabilities:
+  Total Liabilities: {total_liabilities}
+  Current Liabilities: {current_liabilities}
+  Long-term Debt: {long_term_debt}
+
+Equity:
+  Shareholder Equity: {shareholder_equity}
+"""
+
+_INCOME_STATEMENT_TEMPLATE = _PERIOD_HEADER + """Revenue:
+  Total Revenue: {total_revenue}
+  Cost of Revenue: {cost_of_revenue}
+  Gross Profit: {gross_profit}
+
+Operating Performance:
+  Operating Expenses: {operating_expenses}
+  R&D Expenses: {rd_expenses}
+  Operating Income: {operating_income}
+  EBITDA: {ebitda}
+
+Bottom Line:
+  Net Income: {net_income}
+  EPS (Basic): {eps_basic}
+  EPS (Diluted): {eps_diluted}
+"""
+
+_CASH_FLOW_TEMPLATE = _PERIOD_HEADER + """Operating Activities:
+  Operating Cash Flow: {operating_cashflow}
+
+Investing Activities:
+  Cash Flow from Investment: {cashflow_from_investment}
+  Capital Expenditures: {capex}
+
+Financing Activities:
+  Cash Flow from Financing: {cashflow_from_financing}
+  Dividend Payout: {dividend_payout}
+
+Net Change & Free Cash Flow:
+  End Cash Position: {net_change_in_cash}
+  Free Cash Flow: {free_cashflow}
+"""
+
+
+def _quick_overview(ticker: str) -> str:
+    """Market cap, price and 52-week range from fast_info, without the full .info scrape."""
+    fast_info = _cached_fast_info(ticker)
+    if not fast_info:
+        return f"No company overview data available for {ticker}"
+
+    def price(key: str) -> str:
+        val = fast_info.get(key)
+        return f"${val:,.2f}" if val is not None else 'N/A'
+
+    market_cap = fast_info.get('market_cap')
+    market_cap = f"${int(market_cap):,}" if market_cap is not None else 'N/A'
+    currency = fast_info.get('currency', 'N/A')
+
+    output = f"""
+Quick Overview for {ticker}:
+
+Market Cap: {market_cap}
+Last Price: {price('last_price')} ({currency})
+52-Week High: {price('year_high')}
+52-Week Low: {price('year_low')}
+"""
+    return output.strip()
 
 
 @tool
-def get_company_overview(ticker: str) -> str:
+def get_company_overview(ticker: str, detail: bool = True) -> str:
     """Get company overview and valuation metrics from Yahoo Finance.
 
     This tool provides company profile, sector information, and key valuation ratios.
@@ -19,13 +361,17 @@ def get_company_overview(ticker: str) -> str:
 
     Args:
         ticker: Stock symbol
+        detail: If False, return only market cap, last price and 52-week range
+            (faster; skips the profile and valuation ratios)
 
     Returns:
         str: Formatted string with company overview and valuation metrics
     """
     try:
-        stock = yf.Ticker(ticker)
-        info = stock.info
+        if not detail:
+            return _quick_overview(ticker)
+
+        info = _cached_info(ticker)
 
         if not info:
             return f"No company overview data available for {ticker}"
@@ -101,7 +447,7 @@ Description: {description[:200] if description != 'N/A' else 'N/A'}...
 
 
 @tool
-def get_balance_sheet(ticker: str, period: str = 'quarterly') -> str:
+def get_balance_sheet(ticker: str, period: str = 'quarterly', format: str = 'text') -> str:
     """Get balance sheet data from Yahoo Finance.
 
     This tool provides financial position including assets, liabilities, and equity.
@@ -110,93 +456,55 @@ def get_balance_sheet(ticker: str, period: str = 'quarterly') -> str:
     Args:
         ticker: Stock symbol
         period: 'quarterly' or 'annual' (default: 'quarterly')
+        format: 'text' (default) or 'json' for a compact, token-efficient payload
 
     Returns:
         str: Formatted string with balance sheet data for recent periods
     """
     try:
-        stock = yf.Ticker(ticker)
-
         # Get balance sheet
-        if period == 'quarterly':
-            bs = stock.quarterly_balance_sheet
-        else:
-            bs = stock.balance_sheet
+        view = _statement_view(ticker, 'balance_sheet', period)
 
-        if bs.empty:
+        if view is None:
             return f"No balance sheet data available for {ticker}"
 
-        output = f"Balance Sheet for {ticker} ({period.capitalize()}):\n\n"
-
-        # Transpose so dates are rows
-        bs = bs.T
+        # Dates and the rendered rows for the last 4 periods, extracted once and cached
+        dates, arr = view
 
-        # Get last 4 periods
-        for i, (date, row) in enumerate(bs.head(4).iterrows()):
-            fiscal_date = date.strftime('%Y-%m-%d')
+        if format == 'json':
+            latest = dict(zip(BS_KEYS, arr[:, 0]))
+            return _statement_json(ticker, period, dates, arr, BS_KEYS, {
+                "current_ratio": _ratio(latest["current_assets"], latest["current_liabilities"]),
+                "debt_to_equity": _ratio(latest["total_liabilities"], latest["shareholder_equity"]),
+            })
 
-            # Assets
-            total_assets = row.get('Total Assets', 'N/A')
-            current_assets = row.get('Current Assets', 'N/A')
-            cash = row.get('Cash And Cash Equivalents', 'N/A')
+        parts = [f"Balance Sheet for {ticker} ({period.capitalize()}):\n\n"]
 
-            # Liabilities
-            total_liabilities = row.get('Total Liabilities Net Minority Interest', 'N/A')
-            current_liabilities = row.get('Current Liabilities', 'N/A')
-            long_term_debt = row.get('Long Term Debt', 'N/A')
+        for i, fiscal_date in enumerate(dates):
+            (total_assets, current_assets, cash,
+             total_liabilities, current_liabilities, long_term_debt,
+             shareholder_equity) = arr[:, i]
 
-            # Equity
-            shareholder_equity = row.get('Stockholders Equity', 'N/A')
-
-            # Format numbers
-            def format_number(val):
-                if val == 'N/A' or pd.isna(val):
-                    return 'N/A'
-                try:
-                    return f"${int(val):,}"
-                except:
-                    return val
-
-            output += f"""
-Period Ending: {fiscal_date}
----
-Assets:
-  Total Assets: {format_number(total_assets)}
-  Current Assets: {format_number(current_assets)}
-  Cash & Equivalents: {format_number(cash)}
-
-Liabilities:
-  Total Liabilities: {format_number(total_liabilities)}
-  Current Liabilities: {format_number(current_liabilities)}
-  Long-term Debt: {format_number(long_term_debt)}
-
-Equity:
-  Shareholder Equity: {format_number(shareholder_equity)}
-"""
+            parts.append(_BALANCE_SHEET_TEMPLATE.format_map(_period_values(fiscal_date, BS_KEYS, arr[:, i])))
 
             # Calculate key ratios for most recent period
             if i == 0:
-                try:
-                    if not pd.isna(current_assets) and not pd.isna(current_liabilities) and current_liabilities != 0:
-                        current_ratio = float(current_assets) / float(current_liabilities)
-                        output += f"\nCurrent Ratio: {current_ratio:.2f}\n"
+                if (current_ratio := _ratio(current_assets, current_liabilities)) is not None:
+                    parts.append(f"\nCurrent Ratio: {current_ratio:.2f}\n")
 
-                    if not pd.isna(total_liabilities) and not pd.isna(shareholder_equity) and shareholder_equity != 0:
-                        debt_to_equity = float(total_liabilities) / float(shareholder_equity)
-                        output += f"Debt-to-Equity: {debt_to_equity:.2f}\n"
-                except:
-                    pass
+                if (debt_to_equity := _ratio(total_liabilities, shareholder_equity)) is not None:
+                    parts.append(f"Debt-to-Equity: {debt_to_equity:.2f}\n")
 
-            output += "\n"
+            parts.append("\n")
 
-        return output.strip()
+        return "".join(parts).strip()
 
     except Exception as e:
         return f"Error fetching balance sheet for {ticker}: {str(e)}"
 
 
 @tool
-def get_income_statement(ticker: str, period: str = 'quarterly') -> str:
+def get_income_statement(ticker: str, period: str = 'quarterly', format: str = 'text') -> str:
     """Get income statement data from Yahoo Finance.
 
     This tool provides profitability data including revenue, expenses, and net income.
@@ -205,103 +513,63 @@ def get_income_statement(ticker: str, period: str = 'quarterly') -> str:
     Args:
         ticker: Stock symbol
         period: 'quarterly' or 'annual' (default: 'quarterly')
+        format: 'text' (default) or 'json' for a compact, token-efficient payload
 
     Returns:
         str: Formatted string with income statement data for recent periods
     """
     try:
-        stock = yf.Ticker(ticker)
-
         # Get income statement
-        if period == 'quarterly':
-            inc = stock.quarterly_income_stmt
-        else:
-            inc = stock.income_stmt
+        view = _statement_view(ticker, 'income_stmt', period)
 
-        if inc.empty:
+        if view is None:
             return f"No income statement data available for {ticker}"
 
-        output = f"Income Statement for {ticker} ({period.capitalize()}):\n\n"
-
-        # Transpose so dates are rows
-        inc = inc.T
-
-        # Get last 4 periods
-        for i, (date, row) in enumerate(inc.head(4).iterrows()):
-            fiscal_date = date.strftime('%Y-%m-%d')
-
-            # Revenue and income
-            total_revenue = row.get('Total Revenue', 'N/A')
-            gross_profit = row.get('Gross Profit', 'N/A')
-            operating_income = row.get('Operating Income', 'N/A')
-            ebitda = row.get('EBITDA', 'N/A')
-            net_income = row.get('Net Income', 'N/A')
-
-            # Per share metrics (if available)
-            eps_basic = row.get('Basic EPS', 'N/A')
-            eps_diluted = row.get('Diluted EPS', 'N/A')
-
-            # Expenses
-            cost_of_revenue = row.get('Cost Of Revenue', 'N/A')
-            operating_expenses = row.get('Operating Expense', 'N/A')
-            rd_expenses = row.get('Research And Development', 'N/A')
-
-            # Format numbers
-            def format_number(val):
-                if val == 'N/A' or pd.isna(val):
-                    return 'N/A'
-                try:
-                    return f"${int(val):,}"
-                except:
-                    return val
-
-            output += f"""
-Period Ending: {fiscal_date}
----
-Revenue:
-  Total Revenue: {format_number(total_revenue)}
-  Cost of Revenue: {format_number(cost_of_revenue)}
-  Gross Profit: {format_number(gross_profit)}
+        # Dates and the rendered rows for the last 4 periods, extracted once and cached
+        dates, arr = view
 
-Operating Performance:
-  Operating Expenses: {format_number(operating_expenses)}
-  R&D Expenses: {format_number(rd_expenses)}
-  Operating Income: {format_number(operating_income)}
-  EBITDA: {format_number(ebitda)}
+        if format == 'json':
+            latest = dict(zip(INCOME_KEYS, arr[:, 0]))
+            return _statement_json(ticker, period, dates, arr, INCOME_KEYS, {
+                "gross_margin_pct": _ratio(latest["gross_profit"], latest["total_revenue"], 100),
+                "operating_margin_pct": _ratio(latest["operating_income"], latest["total_revenue"], 100),
+                "net_margin_pct": _ratio(latest["net_income"], latest["total_revenue"], 100),
+            })
 
-Bottom Line:
-  Net Income: {format_number(net_income)}
-  EPS (Basic): {eps_basic if not pd.isna(eps_basic) else 'N/A'}
-  EPS (Diluted): {eps_diluted if not pd.isna(eps_diluted) else 'N/A'}
-"""
+        parts = [f"Income Statement for {ticker} ({period.capitalize()}):\n\n"]
+
+        for i, fiscal_date in enumerate(dates):
+            (total_revenue, gross_profit, operating_income, ebitda, net_income,
+             eps_basic, eps_diluted, cost_of_revenue, operating_expenses,
+             rd_expenses) = arr[:, i]
+
+            values = _period_values(fiscal_date, INCOME_KEYS, arr[:, i])
+            # EPS is per share, so show the raw value instead of whole dollars
+            values["eps_basic"] = eps_basic if not np.isnan(eps_basic) else 'N/A'
+            values["eps_diluted"] = eps_diluted if not np.isnan(eps_diluted) else 'N/A'
+            parts.append(_INCOME_STATEMENT_TEMPLATE.format_map(values))
 
             # Calculate margins for most recent period
             if i == 0:
-                try:
-                    if not pd.isna(gross_profit) and not pd.isna(total_revenue) and total_revenue != 0:
-                        gross_margin = (float(gross_profit) / float(total_revenue)) * 100
-                        output += f"\nGross Margin: {gross_margin:.2f}%\n"
+                if (gross_margin := _ratio(gross_profit, total_revenue, 100)) is not None:
+                    parts.append(f"\nGross Margin: {gross_margin:.2f}%\n")
 
-                    if not pd.isna(operating_income) and not pd.isna(total_revenue) and total_revenue != 0:
-                        operating_margin = (float(operating_income) / float(total_revenue)) * 100
-                        output += f"Operating Margin: {operating_margin:.2f}%\n"
+                if (operating_margin := _ratio(operating_income, total_revenue, 100)) is not None:
+                    parts.append(f"Operating Margin: {operating_margin:.2f}%\n")
 
-                    if not pd.isna(net_income) and not pd.isna(total_revenue) and total_revenue != 0:
-                        net_margin = (float(net_income) / float(total_revenue)) * 100
-                        output += f"Net Margin: {net_margin:.2f}%\n"
-                except:
-                    pass
+                if (net_margin := _ratio(net_income, total_revenue, 100)) is not None:
+                    parts.append(f"Net Margin: {net_margin:.2f}%\n")
 
-            output += "\n"
+            parts.append("\n")
 
-        return output.strip()
+        return "".join(parts).strip()
 
     except Exception as e:
         return f"Error fetching income statement for {ticker}: {str(e)}"
 
 
 @tool
-def get_cash_flow(ticker: str, period: str = 'quarterly') -> str:
+def get_cash_flow(ticker: str, period: str = 'quarterly', format: str = 'text') -> str:
     """Get cash flow statement data from Yahoo Finance.
 
     This tool provides cash flow from operating, investing, and financing activities.
@@ -310,77 +578,32 @@ def get_cash_flow(ticker: str, period: str = 'quarterly') -> str:
     Args:
         ticker: Stock symbol
         period: 'quarterly' or 'annual' (default: 'quarterly')
+        format: 'text' (default) or 'json' for a compact, token-efficient payload
 
     Returns:
         str: Formatted string with cash flow data for recent periods
     """
     try:
-        stock = yf.Ticker(ticker)
-
         # Get cash flow statement
-        if period == 'quarterly':
-            cf = stock.quarterly_cashflow
-        else:
-            cf = stock.cashflow
+        view = _statement_view(ticker, 'cashflow', period)
 
-        if cf.empty:
+        if view is None:
             return f"No cash flow data available for {ticker}"
 
-        output = f"Cash Flow Statement for {ticker} ({period.capitalize()}):\n\n"
-
-        # Transpose so dates are rows
-        cf = cf.T
-
-        # Get last 4 periods
-        for i, (date, row) in enumerate(cf.head(4).iterrows()):
-            fiscal_date = date.strftime('%Y-%m-%d')
-
-            # Operating activities
-            operating_cashflow = row.get('Operating Cash Flow', 'N/A')
+        # Dates and the rendered rows for the last 4 periods, extracted once and cached
+        dates, arr = view
 
-            # Investing activities
-            capex = row.get('Capital Expenditure', 'N/A')
-            cashflow_from_investment = row.get('Investing Cash Flow', 'N/A')
+        if format == 'json':
+            return _statement_json(ticker, period, dates, arr, CASH_FLOW_KEYS)
 
-            # Financing activities
-            cashflow_from_financing = row.get('Financing Cash Flow', 'N/A')
-            dividend_payout = row.get('Cash Dividends Paid', 'N/A')
+        parts = [f"Cash Flow Statement for {ticker} ({period.capitalize()}):\n\n"]
 
-            # Net change
-            net_change_in_cash = row.get('End Cash Position', 'N/A')
-            free_cashflow = row.get('Free Cash Flow', 'N/A')
+        for i, fiscal_date in enumerate(dates):
+            parts.append(_CASH_FLOW_TEMPLATE.format_map(_period_values(fiscal_date, CASH_FLOW_KEYS, arr[:, i])))
 
-            # Format numbers
-            def format_number(val):
-                if val == 'N/A' or pd.isna(val):
-                    return 'N/A'
-                try:
-                    return f"${int(val):,}"
-                except:
-                    return val
+            parts.append("\n")
 
-            output += f"""
-Period Ending: {fiscal_date}
----
-Operating Activities:
-  Operating Cash Flow: {format_number(operating_cashflow)}
-
-Investing Activities:
-  Cash Flow from Investment: {format_number(cashflow_from_investment)}
-  Capital Expenditures: {format_number(capex)}
-
-Financing Activities:
-  Cash Flow from Financing: {format_number(cashflow_from_financing)}
-  Dividend Payout: {format_number(dividend_payout)}
-
-Net Change & Free Cash Flow:
-  End Cash Position: {format_number(net_change_in_cash)}
-  Free Cash Flow: {format_number(free_cashflow)}
-"""
-
-            output += "\n"
-
-        return output.strip()
+        return "".join(parts).strip()
 
     except Exception as e:
         return f"Error fetching cash flow for {ticker}: {str(e)}"
@@ -400,16 +623,13 @@ def get_earnings(ticker: str) -> str:
         str: Formatted string with earnings history
     """
     try:
-        stock = yf.Ticker(ticker)
-
-        output = f"Earnings Data for {ticker}:\n\n"
+        parts = [f"Earnings Data for {ticker}:\n\n"]
 
         # Get earnings history
-        earnings_history = stock.earnings_history
+        earnings_history = _cached_earnings_history(ticker)
 
-        if not earnings_history.empty:
-            output += "Recent Earnings (Last 4 Quarters):\n"
-            output += "---\n"
+        if earnings_history is not None and len(earnings_history) > 0:
+            parts.append("Recent Earnings (Last 4 Quarters):\n---\n")
 
             for idx, row in earnings_history.head(4).iterrows():
                 quarter = row.get('Quarter', 'N/A')
@@ -417,41 +637,117 @@ def get_earnings(ticker: str) -> str:
                 eps_estimate = row.get('EPS Estimate', 'N/A')
                 surprise_pct = row.get('Surprise(%)', 'N/A')
 
-                output += f"\nQuarter: {quarter}\n"
-                output += f"Actual EPS: {eps_actual}\n"
-                output += f"Estimated EPS: {eps_estimate}\n"
+                parts.append(f"\nQuarter: {quarter}\n")
+                parts.append(f"Actual EPS: {eps_actual}\n")
+                parts.append(f"Estimated EPS: {eps_estimate}\n")
 
                 if surprise_pct != 'N/A' and not pd.isna(surprise_pct):
                     beat_miss = "Beat" if surprise_pct > 0 else "Miss" if surprise_pct < 0 else "Met"
-                    output += f"Surprise: {surprise_pct:.1f}% - {beat_miss}\n"
+                    parts.append(f"Surprise: {surprise_pct:.1f}% - {beat_miss}\n")
 
-        # Get annual earnings
-        earnings_yearly = stock.earnings
+        # Annual earnings from the (already cached) annual income statement
+        income = _cached_statement(ticker, 'income_stmt', 'annual')
 
-        if earnings_yearly is not None and not earnings_yearly.empty:
-            output += "\n\nAnnual Earnings:\n"
-            output += "---\n"
+        if income is not None and not income.empty:
+            parts.append("\n\nAnnual Earnings:\n---\n")
 
-            for year, row in earnings_yearly.tail(5).iterrows():
-                revenue = row.get('Revenue', 'N/A')
-                earnings = row.get('Earnings', 'N/A')
+            # Statement columns are newest first; list the last 5 years oldest first
+            dates, arr = _statement_matrix(income, ANNUAL_EARNINGS_FIELDS, periods=5)
+            for fiscal_date, revenue, earnings in zip(dates[::-1], arr[0, ::-1], arr[1, ::-1]):
+                parts.append(f"\nYear: {fiscal_date[:4]}\n")
+                parts.append(f"Revenue: {_format_number(revenue)}")
+                parts.append(f"\nEarnings: {_format_number(earnings)}")
+                parts.append("\n")
 
-                output += f"\nYear: {year}\n"
-                output += f"Revenue: ${int(revenue):,}" if revenue != 'N/A' and not pd.isna(revenue) else "Revenue: N/A"
-                output += f"\nEarnings: ${int(earnings):,}" if earnings != 'N/A' and not pd.isna(earnings) else "\nEarnings: N/A"
-                output += "\n"
-
-        return output.strip()
+        return "".join(parts).strip()
 
     except Exception as e:
         return f"Error fetching earnings for {ticker}: {str(e)}"
 
 
+def _prefetch_loaders(ticker: str) -> Dict[str, Callable[[], Any]]:
+    """Cache-warming loaders for every dataset the fundamental tools read, keyed by name."""
+    loaders = {'info': lambda: _cached_info(ticker)}
+    for statement in ('balance_sheet', 'income_stmt', 'cashflow'):
+        for period in ('quarterly', 'annual'):
+            loaders[f"{period}_{statement}"] = (
+                lambda statement=statement, period=period: _cached_statement(ticker, statement, period)
+            )
+    loaders['earnings_history'] = lambda: _cached_earnings_history(ticker)
+    return loaders
+
+
+def _prefetch_summary(ticker: str, futures: Dict[str, Any]) -> str:
+    """Wait for one ticker's loader futures and describe what loaded and what failed."""
+    loaded, failed = [], []
+    for name, future in futures.items():
+        try:
+            future.result()
+            loaded.append(name)
+        except Exception:
+            failed.append(name)
+
+    summary = f"Prefetched fundamentals for {ticker}: {', '.join(loaded) or 'none'}"
+    if failed:
+        summary += f" (failed: {', '.join(failed)})"
+    return summary
+
+
+@tool
+def prefetch_fundamentals(ticker: str) -> str:
+    """Warm the cache with all Yahoo Finance fundamentals for a ticker in parallel.
+
+    Loads the company info, quarterly and annual balance sheet, income statement and
+    cash flow, and earnings history concurrently, so the other fundamental tools for
+    this ticker return without further network calls.
+
+    Args:
+        ticker: Stock symbol
+
+    Returns:
+        str: Which datasets were loaded and which failed
+    """
+    futures = {name: _EXECUTOR.submit(loader) for name, loader in _prefetch_loaders(ticker).items()}
+    return _prefetch_summary(ticker, futures)
+
+
+@tool
+def prefetch_many(tickers: List[str]) -> str:
+    """Warm the cache with Yahoo Finance fundamentals for several tickers in parallel.
+
+    Use before analyzing a watchlist: every dataset for every ticker is fetched
+    concurrently, so total time is close to the slowest single request rather
+    than the sum of all of them.
+
+    Args:
+        tickers: Stock symbols
+
+    Returns:
+        str: One line per ticker listing which datasets were loaded and which failed
+    """
+    tickers = list(dict.fromkeys(t.strip().upper() for t in tickers if t and t.strip()))
+    if not tickers:
+        return "No tickers to prefetch"
+
+    jobs = {ticker: _prefetch_loaders(ticker) for ticker in tickers}
+    n_jobs = sum(len(loaders) for loaders in jobs.values())
+    # Short-lived pool sized to the batch, so a large watchlist doesn't queue
+    # behind (or starve) the shared single-ticker executor
+    with ThreadPoolExecutor(max_workers=min(16, n_jobs), thread_name_prefix="yfinance-batch") as pool:
+        futures = {
+            ticker: {name: pool.submit(loader) for name, loader in loaders.items()}
+            for ticker, loaders in jobs.items()
+        }
+        return "\n".join(_prefetch_summary(ticker, futures[ticker]) for ticker in tickers)
+
+
 # Tool list for export
 FUNDAMENTAL_TOOLS = [
     get_company_overview,
     get_balance_sheet,
     get_income_statement,
     get_cash_flow,
-    get_earnings
+    get_earnings,
+    prefetch_fundamentals,
+    prefetch_many
 ]
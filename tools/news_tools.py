@@ -16,11 +16,23 @@ News Tools (Alpha Vantage - News & Sentiment)
 """
 
 from __future__ import annotations
-from typing import List, Optional, Dict
-from datetime import datetime, timedelta
+import functools
+import threading
+import time
+from typing import Any, List, Optional, Dict, Tuple
+from datetime import datetime, timedelta, timezone
 
 import requests
 from langchain_core.tools import tool
+from requests.adapters import HTTPAdapter
+from urllib3.util import make_headers
+from urllib3.util.retry import Retry
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 # 按你的工程结构选择正确的导入：
 # 如果 tools 与 config 同级，且 main 在项目根目录运行，下面这行 OK：
@@ -28,6 +40,34 @@ from config import ALPHA_VANTAGE_API_KEY, AV_BASE_URL, AV_TIMEOUT
 # 如果你是在包内使用，请改为：
 # from simplified_tradingagents.config import ALPHA_VANTAGE_API_KEY, AV_BASE_URL, AV_TIMEOUT
 
+# 共享 HTTP 会话：复用连接池，对 429/5xx 做指数退避重试（遵守 Retry-After）
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(
+    pool_connections=2,
+    pool_maxsize=8,
+    max_retries=Retry(
+        total=3,
+        backoff_factor=0.5,
+        status_forcelist=[429, 500, 502, 503, 504],
+        respect_retry_after_header=True,
+    ),
+))
+_SESSION.headers.update(make_headers(accept_encoding=True, keep_alive=True))
+_SESSION.headers["Accept"] = "application/json"
+
+# 进程内新闻缓存：相同查询在 TTL 内直接复用（免费版每分钟只有 5 次请求）
+NEWS_CACHE_TTL = 300  # seconds
+NEWS_CACHE_MAXSIZE = 256
+_NEWS_CACHE: Dict[Tuple, Tuple[float, List[Dict]]] = {}
+_NEWS_LOCK = threading.Lock()
+
+# 熔断：连续失败达到阈值后，冷却期内不再请求上游，直接返回缓存（可能已过期）
+BREAKER_THRESHOLD = 5
+BREAKER_COOLDOWN = 60  # seconds
+
+# 查询窗口的结束时间按 5 分钟取整，使相邻请求得到相同的 time_from/time_to
+_WINDOW_BUCKET_SECONDS = 300
+
 
 # ---------------- Helpers ----------------
 
@@ -36,6 +76,14 @@ def _av_ts(dt: datetime) -> str:
     return dt.strftime("%Y%m%dT%H%M%S")
 
 
+@functools.lru_cache(maxsize=64)
+def _bucketed_window(lb_days: int, bucket: int) -> Tuple[str, str]:
+    """(time_from, time_to) for a lookback ending at the close of the given 5-minute bucket."""
+    # 取桶的结束时刻，保证刚发布的文章仍在窗口内
+    end = datetime.fromtimestamp((bucket + 1) * _WINDOW_BUCKET_SECONDS, tz=timezone.utc).replace(tzinfo=None)
+    return _av_ts(end - timedelta(days=lb_days)), _av_ts(end)
+
+
 def _iso(ts: str) -> str:
     """Convert Alpha Vantage 'YYYYMMDDTHHMMSS' timestamp to ISO 8601; fallback to original if parsing fails."""
     if not ts:
@@ -46,6 +94,9 @@ def _iso(ts: str) -> str:
         return ts
 
 
+_SUMMARY_LIMIT = 400  # 摘要最多保留的字符数
+
+
 def _format_article_block(i: int, it: Dict) -> str:
     """Render one article dict to a readable multi-line block."""
     title = it.get("title") or "N/A"
@@ -54,31 +105,102 @@ def _format_article_block(i: int, it: Dict) -> str:
     when = _iso(it.get("time_published") or "")
     sent = it.get("overall_sentiment_label") or "N/A"
     smry = (it.get("summary") or "").strip()
-    if smry:
-        smry = smry[:400] + ("..." if len(smry) > 400 else "")
-    return (
-        f"[{i}] {title}\n"
-        f"    Source: {src} | Published: {when} | Sentiment: {sent}\n"
-        f"    URL: {url}\n"
-        f"    Summary: {smry}\n"
-    )
-
-
-def _fetch_news(
-    tickers: Optional[str] = None,
-    topics: Optional[str] = None,
-    lookback_days: int = 7,
-    limit: int = 50,
-    sort: str = "LATEST",
-) -> List[Dict]:
-    """Low-level Alpha Vantage NEWS_SENTIMENT fetcher. Returns trimmed 'feed' list[dict]."""
-    limit = max(1, min(int(limit), 50))
-    lb_days = max(1, int(lookback_days))
-
+    # 只有超长时才切片，短摘要不再生成中间字符串
+    if len(smry) > _SUMMARY_LIMIT:
+        smry = smry[:_SUMMARY_LIMIT] + "..."
+    return "".join((
+        "[", str(i), "] ", title,
+        "\n    Source: ", src, " | Published: ", when, " | Sentiment: ", sent,
+        "\n    URL: ", url,
+        "\n    Summary: ", smry, "\n",
+    ))
+
+
+def _news_key(
+    tickers: Optional[str],
+    topics: Optional[str],
+    lookback_days: int,
+    limit: int,
+    sort: str,
+) -> Tuple[str, str, int, int, str]:
+    """Normalize query args to a hashable (tickers, topics, lb_days, limit, sort) key."""
+    if tickers:
+        # "msft, AAPL" 与 "AAPL,MSFT" 视为同一查询
+        tickers = ",".join(sorted({t.strip().upper() for t in tickers.split(",") if t.strip()}))
+    if topics:
+        topics = ",".join(t.strip() for t in topics.split(",") if t.strip())
+    return (tickers or "", topics or "", max(1, int(lookback_days)), max(1, min(int(limit), 50)), sort)
+
+
+def _news_cache_get(key: Tuple, allow_stale: bool = False) -> Optional[List[Dict]]:
+    """Return the cached feed for key, or None if missing (or expired, unless allow_stale)."""
+    with _NEWS_LOCK:
+        entry = _NEWS_CACHE.get(key)
+    if entry is not None and (allow_stale or entry[0] > time.monotonic()):
+        return entry[1]
+    return None
+
+
+def _news_cache_set(key: Tuple, feed: List[Dict]) -> None:
+    """Store a non-empty feed, evicting expired (then oldest) entries when full."""
+    if not feed:
+        # 空结果可能是限流提示（"Note"），不缓存
+        return
+    now = time.monotonic()
+    with _NEWS_LOCK:
+        if len(_NEWS_CACHE) >= NEWS_CACHE_MAXSIZE:
+            for k in [k for k, (expires, _) in _NEWS_CACHE.items() if expires <= now]:
+                del _NEWS_CACHE[k]
+            while len(_NEWS_CACHE) >= NEWS_CACHE_MAXSIZE:
+                del _NEWS_CACHE[next(iter(_NEWS_CACHE))]
+        _NEWS_CACHE[key] = (now + NEWS_CACHE_TTL, feed)
+
+
+class _CircuitBreaker:
+    """Consecutive-failure breaker: opens after `threshold` failures for `cooldown` seconds."""
+
+    def __init__(self, threshold: int, cooldown: float):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self._failures = 0
+        self._opened_at = 0.0
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """False while open; after the cooldown one trial request is let through."""
+        with self._lock:
+            if self._failures < self.threshold:
+                return True
+            if time.monotonic() - self._opened_at >= self.cooldown:
+                # 半开：放行一次试探请求，失败则重新计时
+                self._opened_at = time.monotonic()
+                return True
+            return False
+
+    def ok(self) -> None:
+        with self._lock:
+            self._failures = 0
+
+    def fail(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._failures >= self.threshold:
+                self._opened_at = time.monotonic()
+
+
+_BREAKER = _CircuitBreaker(BREAKER_THRESHOLD, BREAKER_COOLDOWN)
+
+
+def _news_params(
+    tickers: str,
+    topics: str,
+    lb_days: int,
+    limit: int,
+    sort: str,
+) -> Dict[str, Any]:
+    """Build NEWS_SENTIMENT query params from a normalized _news_key tuple."""
     # Alpha Vantage 按相对时间抓取更稳，这里用 lookback_days 窗口
-    now = datetime.utcnow()
-    time_to = _av_ts(now)
-    time_from = _av_ts(now - timedelta(days=lb_days))
+    time_from, time_to = _bucketed_window(lb_days, int(time.time()) // _WINDOW_BUCKET_SECONDS)
 
     params = {
         "function": "NEWS_SENTIMENT",
@@ -92,13 +214,63 @@ def _fetch_news(
         params["tickers"] = tickers
     if topics:
         params["topics"] = topics
+    return params
+
 
-    r = requests.get(AV_BASE_URL, params=params, timeout=AV_TIMEOUT)
-    data = r.json() if r is not None else {}
+def _trim_feed(data: Dict, limit: int) -> List[Dict]:
+    """Extract the 'feed' list, dropping items without title/url."""
     feed = data.get("feed") or []
-    # 过滤掉缺少标题/链接的项
-    feed = [x for x in feed if x.get("title") and x.get("url")]
-    return feed[:limit]
+    # 过滤掉缺少标题/链接的项；绑定 dict.get 省去每次的属性查找
+    get = dict.get
+    return [x for x in feed if get(x, "title") and get(x, "url")][:limit]
+
+
+def _accept_response(key: Tuple, data: Dict) -> List[Dict]:
+    """Trim and cache a decoded response; a rate-limit notice counts as a breaker failure."""
+    if "feed" not in data and ("Note" in data or "Information" in data):
+        _BREAKER.fail()
+        return _news_cache_get(key, allow_stale=True) or []
+    _BREAKER.ok()
+    feed = _trim_feed(data, key[3])
+    _news_cache_set(key, feed)
+    return feed
+
+
+def _upstream_failed(key: Tuple) -> List[Dict]:
+    """Record a failed request; return the stale feed for key, or re-raise if none is cached."""
+    _BREAKER.fail()
+    stale = _news_cache_get(key, allow_stale=True)
+    if stale is None:
+        raise
+    return stale
+
+
+def _fetch_news(
+    tickers: Optional[str] = None,
+    topics: Optional[str] = None,
+    lookback_days: int = 7,
+    limit: int = 50,
+    sort: str = "LATEST",
+) -> List[Dict]:
+    """Low-level Alpha Vantage NEWS_SENTIMENT fetcher. Returns trimmed 'feed' list[dict]."""
+    key = _news_key(tickers, topics, lookback_days, limit, sort)
+    feed = _news_cache_get(key)
+    if feed is not None:
+        return feed
+
+    if not _BREAKER.allow():
+        return _news_cache_get(key, allow_stale=True) or []
+
+    try:
+        r = _SESSION.get(AV_BASE_URL, params=_news_params(*key), timeout=AV_TIMEOUT)
+        if r is None or not r.content:
+            data = {}
+        else:
+            # 新闻响应常有 50-200 KB，orjson 解析明显更快
+            data = orjson.loads(r.content) if ORJSON_AVAILABLE else r.json()
+    except Exception:
+        return _upstream_failed(key)
+    return _accept_response(key, data)
 
 
 # 行业 -> topics 的简易映射（可按需扩展）
@@ -117,6 +289,15 @@ _TOPIC_MAP = {
 _DEFAULT_MACRO_TOPICS = "economy,financial_markets,earnings"
 
 
+def _industry_topics(industry: Optional[str]) -> Tuple[str, str]:
+    """Resolve an industry name to (normalized key, AV topics); unknown industries map to 'technology'."""
+    if industry is None:
+        return "technology", _TOPIC_MAP["technology"]
+    # 已是规范写法时直接命中，省去 strip/casefold
+    key = industry if industry in _TOPIC_MAP else (industry.strip().casefold() or "technology")
+    return key, _TOPIC_MAP.get(key, "technology")
+
+
 # ---------------- Tools (formatted string variants) ----------------
 
 @tool
@@ -179,8 +360,7 @@ def get_industry_news(
         Multi-line formatted string with industry/sector articles.
     """
     try:
-        key = (industry or "technology").strip().lower()
-        topics = _TOPIC_MAP.get(key, "technology")
+        key, topics = _industry_topics(industry)
         feed = _fetch_news(
             tickers=None,
             topics=topics,
@@ -17,62 +17,270 @@ Provides 5 @tool functions:
 """
 
 from __future__ import annotations
-from typing import List, Optional, Dict
+from typing import Any, List, Optional, Dict, Tuple
 from datetime import datetime, timedelta
+import functools
+import itertools
 import os
+import threading
+import time
 
 import requests
 from langchain_core.tools import tool
+from requests.adapters import HTTPAdapter
+from urllib3.util import make_headers
+from urllib3.util.retry import Retry
+from config import HTTP_CACHE_DIR
+
+try:
+    import requests_cache
+    REQUESTS_CACHE_AVAILABLE = True
+except ImportError:
+    REQUESTS_CACHE_AVAILABLE = False
 
 # Get NewsAPI key from environment
 NEWSAPI_KEY = os.getenv("NEWSAPI_KEY", "")
 NEWSAPI_BASE = "https://newsapi.org/v2/everything"
 
-# Try to import yfinance as fallback
+# How long a persisted NewsAPI response is reused (see _SESSION below). Windows that
+# ended in the past never change; an hour bounds staleness for ones ending today
+NEWSAPI_HTTP_TTL = 3600  # seconds
+
+# Shared HTTP session so repeated NewsAPI calls reuse one keep-alive TLS connection.
+# With requests-cache installed, successful NewsAPI responses are also persisted in
+# SQLite, so repeat queries across processes and restarts don't spend the daily quota
+# (other hosts, e.g. Yahoo via _yahoo_session, are never cached).
+# raise_on_status=False hands the final 429/5xx body back to _fetch_newsapi,
+# which prints NewsAPI's own error message and hints.
+if REQUESTS_CACHE_AVAILABLE:
+    HTTP_CACHE_DIR.mkdir(exist_ok=True)
+    _SESSION = requests_cache.CachedSession(
+        str(HTTP_CACHE_DIR / "newsapi_cache"),
+        backend="sqlite",
+        allowable_methods=["GET"],
+        ignored_parameters=["apiKey"],  # Keep the API key out of the persisted cache
+        urls_expire_after={
+            "newsapi.org/*": NEWSAPI_HTTP_TTL,
+            "*": requests_cache.DO_NOT_CACHE,
+        }
+    )
+else:
+    _SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=16,
+    max_retries=Retry(
+        total=2,
+        backoff_factor=0.3,
+        status_forcelist=[429, 500, 502, 503, 504],
+        raise_on_status=False,
+    ),
+))
+_SESSION.headers.update(make_headers(accept_encoding=True, keep_alive=True))
+_SESSION.headers["User-Agent"] = "llm-group-news/1.0"
+
 try:
-    import yfinance as yf
-    YFINANCE_AVAILABLE = True
+    import orjson
+    ORJSON_AVAILABLE = True
 except ImportError:
-    YFINANCE_AVAILABLE = False
+    ORJSON_AVAILABLE = False
+
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
+
+# Stream NewsAPI bodies into ijson; not with requests-cache, which reads the whole
+# body to persist it (cache hits are in memory anyway)
+_STREAM_RESPONSES = IJSON_AVAILABLE and not REQUESTS_CACHE_AVAILABLE
+
+# Malformed response bodies: stdlib/requests/orjson JSON errors are ValueErrors, ijson has its own
+_PARSE_ERRORS: Tuple[type, ...] = (ValueError, ijson.JSONError) if IJSON_AVAILABLE else (ValueError,)
+
+# In-process response cache: the same company/industry/macro queries recur across
+# analysts within one run, and the free NewsAPI tier allows only 100 requests/day
+NEWS_CACHE_TTL = 600  # seconds
+NEWS_CACHE_MAXSIZE = 256
+_NEWS_CACHE: Dict[Tuple, Tuple[float, List[Dict]]] = {}
+_NEWS_LOCK = threading.Lock()
+
+# yfinance is the keyless fallback; it is imported on first use (see _get_yfinance)
+# because it pulls in pandas, so processes that never hit the fallback don't pay for it
+_yf = None  # None = not tried yet, False = not installed
+_yf_session = None
 
 
 # ---------------- Helpers ----------------
+def _get_yfinance():
+    """Return the yfinance module, importing it on first call; None if it isn't installed."""
+    global _yf
+    if _yf is None:
+        try:
+            import yfinance
+            _yf = yfinance
+        except ImportError:
+            _yf = False
+    return _yf or None
+
+
+def _yahoo_session():
+    """
+    Pooled session handed to every yfinance Ticker so news lookups reuse connections to Yahoo.
+
+    Recent yfinance releases only accept a curl_cffi session (impersonating a browser,
+    which also avoids Yahoo's throttling of non-browser clients); older ones take the
+    shared requests session, and set browser headers per request themselves.
+    """
+    global _yf_session
+    if _yf_session is None:
+        try:
+            from curl_cffi import requests as curl_requests
+            _yf_session = curl_requests.Session(impersonate="chrome")
+        except ImportError:
+            _yf_session = _SESSION
+    return _yf_session
+
+
+# One article block; filled with str.format_map by _format_article_block
+_BLOCK_TEMPLATE = (
+    "[{i}] {title}\n"
+    "    Source: {src} | Published: {when} | Sentiment: {sent}\n"
+    "    URL: {url}\n"
+    "    Summary: {desc}\n"
+)
+
 
 def _format_article_block(i: int, it: Dict) -> str:
     """Render one article dict to a readable multi-line block."""
     title = it.get("title") or "N/A"
     url = it.get("url") or ""
 
-    # Handle source field (can be dict or string)
+    # Handle source field: NewsAPI's {"id", "name"} dict is the common case, so try
+    # it first; plain strings (and anything else) only reach the fallback branch
     src = it.get("source", {})
-    if isinstance(src, dict):
-        src = src.get("name", "N/A")
-    elif isinstance(src, str):
-        src = src
-    else:
+    try:
+        src = src["name"]
+    except KeyError:
         src = "N/A"
+    except TypeError:
+        src = src if isinstance(src, str) else "N/A"
 
     # Parse published date
     when = it.get("publishedAt") or it.get("published_at") or it.get("time_published") or ""
-    if when and "T" in when:
-        when = when.split("T")[0]  # Just date part
+    when = when.partition("T")[0]  # Just date part (unchanged if there is no 'T')
 
     # Get sentiment if available
     sent = it.get("sentiment", "N/A")
     if sent == "N/A" and "overall_sentiment_label" in it:
         sent = it["overall_sentiment_label"]
 
-    # Get description/summary
+    # Get description/summary; only slice when it actually needs truncating
     desc = (it.get("description") or it.get("summary") or "").strip()
-    if desc:
-        desc = desc[:400] + ("..." if len(desc) > 400 else "")
-
-    return (
-        f"[{i}] {title}\n"
-        f"    Source: {src} | Published: {when} | Sentiment: {sent}\n"
-        f"    URL: {url}\n"
-        f"    Summary: {desc}\n"
-    )
+    if len(desc) > 400:
+        desc = desc[:400] + "..."
+
+    return _BLOCK_TEMPLATE.format_map({
+        "i": i, "title": title, "src": src, "when": when, "sent": sent, "url": url, "desc": desc,
+    })
+
+
+@functools.lru_cache(maxsize=32)
+def _date_window(lookback_days: int, minute: int) -> Tuple[str, str]:
+    """(from_date, to_date) as 'YYYY-MM-DD' for a lookback ending today.
+
+    `minute` is int(time.time()) // 60; it only keys the cache, so repeat calls within
+    the same minute skip datetime/strftime and pass identical dates to the response cache.
+    """
+    today = datetime.now()
+    return (today - timedelta(days=lookback_days)).strftime("%Y-%m-%d"), today.strftime("%Y-%m-%d")
+
+
+def _cache_get(key: Tuple) -> Optional[List[Dict]]:
+    """Cached articles for key (as fresh dict copies), or None if missing or expired."""
+    with _NEWS_LOCK:
+        entry = _NEWS_CACHE.get(key)
+    if entry is None or entry[0] <= time.monotonic():
+        return None
+    # Callers add fields (time_published, summary) in place, so never hand out the cached dicts
+    return [dict(a) for a in entry[1]]
+
+
+def _cache_set(key: Tuple, articles: List[Dict]) -> None:
+    """Cache a non-empty article list, evicting expired (then oldest) entries when full."""
+    if not articles:
+        return
+    now = time.monotonic()
+    with _NEWS_LOCK:
+        if len(_NEWS_CACHE) >= NEWS_CACHE_MAXSIZE:
+            for k in [k for k, (expires, _) in _NEWS_CACHE.items() if expires <= now]:
+                del _NEWS_CACHE[k]
+            while len(_NEWS_CACHE) >= NEWS_CACHE_MAXSIZE:
+                del _NEWS_CACHE[next(iter(_NEWS_CACHE))]
+        _NEWS_CACHE[key] = (now + NEWS_CACHE_TTL, [dict(a) for a in articles])
+
+
+def _clear_news_cache() -> None:
+    """Drop every cached response (e.g. between tests or after changing NEWSAPI_KEY)."""
+    with _NEWS_LOCK:
+        _NEWS_CACHE.clear()
+
+
+def _newsapi_params(
+    q: str,
+    from_date: str,
+    to_date: str,
+    language: str,
+    sort_by: str,
+    limit: int,
+) -> Dict[str, Any]:
+    """Query params for the NewsAPI /everything endpoint."""
+    return {
+        "q": q,
+        "from": from_date,
+        "to": to_date,
+        "language": language,
+        "sortBy": sort_by,
+        "pageSize": min(limit, 100),
+        "apiKey": NEWSAPI_KEY,
+    }
+
+
+def _newsapi_articles(data: Dict, limit: int, from_date: str, to_date: str) -> List[Dict]:
+    """Extract articles from a decoded NewsAPI response, printing a hint on API errors."""
+    if data.get("status") == "ok":
+        # Filter out articles without title or url, stopping once `limit` are kept
+        usable = (a for a in data.get("articles", []) if a.get("title") and a.get("url"))
+        return list(itertools.islice(usable, max(limit, 0)))
+    else:
+        error_msg = data.get("message", "Unknown error")
+        error_code = data.get("code", "unknown")
+        print(f"[NewsAPI] Error [{error_code}]: {error_msg}")
+
+        # Provide helpful hints based on error type
+        if "apiKey" in error_msg.lower() or error_code == "apiKeyInvalid":
+            print("  → Check your NEWSAPI_KEY in .env file")
+            print("  → Sign up free at: https://newsapi.org/register")
+        elif "upgrade" in error_msg.lower() or "premium" in error_msg.lower():
+            print("  → This request requires a paid NewsAPI plan")
+            print("  → Free tier: 100 requests/day, 30 days history")
+        elif "rate" in error_msg.lower():
+            print("  → You've exceeded the rate limit (100 requests/day on free tier)")
+            print("  → Wait until tomorrow or upgrade your plan")
+        elif "date" in error_msg.lower():
+            print("  → Date range issue - free tier only supports last 30 days")
+            print(f"  → Requested: {from_date} to {to_date}")
+
+        return []
+
+
+def _stream_articles(r: requests.Response, limit: int) -> List[Dict]:
+    """Parse up to `limit` articles with title and url from a streamed 200 response, stopping early."""
+    # Let urllib3 undo gzip/br before ijson sees the bytes
+    r.raw.decode_content = True
+    items = ijson.items(r.raw, "articles.item", use_float=True)
+    usable = (a for a in items if a.get("title") and a.get("url"))
+    return list(itertools.islice(usable, max(limit, 0)))
 
 
 def _fetch_newsapi(
@@ -101,48 +309,59 @@ def _fetch_newsapi(
         print("Warning: NEWSAPI_KEY not configured in .env file")
         return []
 
-    try:
-        params = {
-            "q": q,
-            "from": from_date,
-            "to": to_date,
-            "language": language,
-            "sortBy": sort_by,
-            "pageSize": min(limit, 100),
-            "apiKey": NEWSAPI_KEY,
-        }
+    cache_key = ("newsapi", q, from_date, to_date, language, sort_by, limit)
+    articles = _cache_get(cache_key)
+    if articles is not None:
+        return articles
 
-        r = requests.get(NEWSAPI_BASE, params=params, timeout=10)
-        data = r.json()
-
-        if data.get("status") == "ok":
-            articles = data.get("articles", [])
-            # Filter out articles without title or url
-            articles = [a for a in articles if a.get("title") and a.get("url")]
-            return articles[:limit]
-        else:
-            error_msg = data.get("message", "Unknown error")
-            error_code = data.get("code", "unknown")
-            print(f"[NewsAPI] Error [{error_code}]: {error_msg}")
-
-            # Provide helpful hints based on error type
-            if "apiKey" in error_msg.lower() or error_code == "apiKeyInvalid":
-                print("  → Check your NEWSAPI_KEY in .env file")
-                print("  → Sign up free at: https://newsapi.org/register")
-            elif "upgrade" in error_msg.lower() or "premium" in error_msg.lower():
-                print("  → This request requires a paid NewsAPI plan")
-                print("  → Free tier: 100 requests/day, 30 days history")
-            elif "rate" in error_msg.lower():
-                print("  → You've exceeded the rate limit (100 requests/day on free tier)")
-                print("  → Wait until tomorrow or upgrade your plan")
-            elif "date" in error_msg.lower():
-                print("  → Date range issue - free tier only supports last 30 days")
-                print(f"  → Requested: {from_date} to {to_date}")
+    try:
+        params = _newsapi_params(q, from_date, to_date, language, sort_by, limit)
 
-            return []
-    except Exception as e:
-        print(f"[NewsAPI] Exception during fetch: {str(e)}")
+        # With ijson, a successful body is parsed incrementally and abandoned once
+        # `limit` usable articles are read; error bodies are small and parsed whole
+        with _SESSION.get(NEWSAPI_BASE, params=params, timeout=10, stream=_STREAM_RESPONSES) as r:
+            if _STREAM_RESPONSES and r.status_code == 200:
+                articles = _stream_articles(r, limit)
+            else:
+                # orjson parses the raw bytes directly, skipping requests' text decode
+                data = orjson.loads(r.content) if ORJSON_AVAILABLE else r.json()
+                articles = _newsapi_articles(data, limit, from_date, to_date)
+
+        _cache_set(cache_key, articles)
+        return articles
+    # Expected network/parse failures degrade to "no articles"; anything else is a bug
+    # and propagates to the calling tool
+    except requests.exceptions.Timeout:
+        print(f"[NewsAPI] Request timed out for '{q}'")
         return []
+    except requests.exceptions.ConnectionError as e:
+        print(f"[NewsAPI] Connection error: {e}")
+        return []
+    except (requests.exceptions.RequestException, *_PARSE_ERRORS) as e:
+        print(f"[NewsAPI] Exception during fetch: {e!r}")
+        return []
+
+
+_YAHOO_PUBLISHER = "Yahoo Finance"
+
+
+def _to_standard(item: Dict) -> Dict:
+    """Map one yfinance news item to the NewsAPI article layout."""
+    get = item.get
+    title = get("title", "")
+    published = get("providerPublishTime")
+    published_at = datetime.fromtimestamp(published).isoformat() if published else ""
+    return {
+        "title": title,
+        "url": get("link", ""),
+        "source": {"name": get("publisher", _YAHOO_PUBLISHER)},
+        "publishedAt": published_at,
+        # Alpha Vantage compatible fields, so get_news can skip its normalization pass
+        "time_published": _iso_to_av(published_at),
+        "description": title,  # yfinance doesn't provide description
+        "summary": title,
+        "sentiment": "N/A",
+    }
 
 
 def _fetch_yfinance_news(ticker: str, limit: int = 50) -> List[Dict]:
@@ -156,34 +375,70 @@ def _fetch_yfinance_news(ticker: str, limit: int = 50) -> List[Dict]:
     Returns:
         List of news article dicts
     """
-    if not YFINANCE_AVAILABLE:
+    yf = _get_yfinance()
+    if yf is None:
         return []
 
+    cache_key = ("yfinance", ticker.upper(), limit)
+    articles = _cache_get(cache_key)
+    if articles is not None:
+        return articles
+
     try:
-        stock = yf.Ticker(ticker.upper())
+        stock = yf.Ticker(ticker.upper(), session=_yahoo_session())
         news = stock.news or []
 
-        # Convert yfinance news format to standard format
-        standardized = []
-        for item in news[:limit]:
-            standardized.append({
-                "title": item.get("title", ""),
-                "url": item.get("link", ""),
-                "source": {"name": item.get("publisher", "Yahoo Finance")},
-                "publishedAt": datetime.fromtimestamp(
-                    item.get("providerPublishTime", 0)
-                ).isoformat() if item.get("providerPublishTime") else "",
-                "description": item.get("title", ""),  # yfinance doesn't provide description
-                "summary": item.get("title", ""),
-                "sentiment": "N/A"
-            })
-
-        return [a for a in standardized if a.get("title") and a.get("url")]
+        # Convert yfinance news format to standard format, dropping items without title/url
+        articles = [a for a in map(_to_standard, news[:limit]) if a["title"] and a["url"]]
+        _cache_set(cache_key, articles)
+        return articles
     except Exception as e:
         print(f"Error fetching from yfinance for {ticker}: {str(e)}")
         return []
 
 
+def _iso_to_av(published: str) -> str:
+    """Convert an ISO timestamp to Alpha Vantage 'YYYYMMDDTHHMMSS'; fallback to the input if unparseable."""
+    s = published
+    if not isinstance(s, str):
+        return s
+    # NewsAPI/yfinance timestamps are 'YYYY-MM-DDTHH:MM:SS...', so slice instead of building a datetime
+    if len(s) >= 19 and s[4] == "-" and s[7] == "-" and s[10] == "T" and s[13] == ":" and s[16] == ":":
+        return s[0:4] + s[5:7] + s[8:10] + "T" + s[11:13] + s[14:16] + s[17:19]
+    try:
+        return datetime.fromisoformat(s.replace("Z", "+00:00")).strftime("%Y%m%dT%H%M%S")
+    except ValueError:
+        return s
+
+
+def _dedupe(articles: List[Dict]) -> List[Dict]:
+    """Drop repeated articles (same URL, or same title when there is no URL), keeping the first."""
+    seen = set()
+    unique = []
+    for a in articles:
+        key = (a.get("url") or "").strip() or (a.get("title") or "").strip().lower()
+        if key in seen:
+            continue
+        seen.add(key)
+        unique.append(a)
+    return unique
+
+
+def _add_av_fields(feed: List[Dict]) -> None:
+    """Add Alpha Vantage compatible time_published/summary fields in place where missing."""
+    # A feed comes from a single source; yfinance articles are built with both fields
+    if not feed or "time_published" in feed[0]:
+        return
+    for article in feed:
+        if "time_published" not in article and "publishedAt" in article:
+            # Convert ISO format to Alpha Vantage format (YYYYMMDDTHHMMSS)
+            article["time_published"] = _iso_to_av(article["publishedAt"])
+
+        # Ensure summary field exists
+        if "summary" not in article:
+            article["summary"] = article.get("description", "")
+
+
 # ---------------- Tools (formatted string variants) ----------------
 
 @tool
@@ -216,9 +471,7 @@ def get_company_news(
 
         # Fallback to NewsAPI if yfinance fails and API key is available
         if not feed and NEWSAPI_KEY:
-            today = datetime.now()
-            to_date = today.strftime("%Y-%m-%d")
-            from_date = (today - timedelta(days=lookback_days)).strftime("%Y-%m-%d")
+            from_date, to_date = _date_window(lookback_days, int(time.time()) // 60)
 
             sort_by = "publishedAt" if sort == "LATEST" else "relevancy"
             feed = _fetch_newsapi(
@@ -229,11 +482,12 @@ def get_company_news(
                 limit=limit
             )
 
+        feed = _dedupe(feed)
         if not feed:
-            api_info = "yfinance" if YFINANCE_AVAILABLE else "NewsAPI (configure NEWSAPI_KEY in .env)"
+            api_info = "yfinance" if _get_yfinance() else "NewsAPI (configure NEWSAPI_KEY in .env)"
             return f"No company news found for {ticker} using {api_info}."
 
-        source_api = "yfinance" if YFINANCE_AVAILABLE and feed else "NewsAPI"
+        source_api = "yfinance" if _get_yfinance() and feed else "NewsAPI"
         header = f"Company News for {ticker.upper()} via {source_api} (last {lookback_days} days, limit={limit}):\n\n"
         blocks = [_format_article_block(i + 1, it) for i, it in enumerate(feed)]
         return header + "\n".join(blocks)
@@ -270,9 +524,7 @@ def get_industry_news(
         if not NEWSAPI_KEY:
             return "NewsAPI key not configured. Set NEWSAPI_KEY in .env file. Sign up free at https://newsapi.org/"
 
-        today = datetime.now()
-        to_date = today.strftime("%Y-%m-%d")
-        from_date = (today - timedelta(days=lookback_days)).strftime("%Y-%m-%d")
+        from_date, to_date = _date_window(lookback_days, int(time.time()) // 60)
 
         sort_by = "publishedAt" if sort == "LATEST" else "relevancy"
 
@@ -322,9 +574,7 @@ def get_macro_news(
         if not NEWSAPI_KEY:
             return "NewsAPI key not configured. Set NEWSAPI_KEY in .env file. Sign up free at https://newsapi.org/"
 
-        today = datetime.now()
-        to_date = today.strftime("%Y-%m-%d")
-        from_date = (today - timedelta(days=lookback_days)).strftime("%Y-%m-%d")
+        from_date, to_date = _date_window(lookback_days, int(time.time()) // 60)
 
         sort_by = "publishedAt" if sort == "LATEST" else "relevancy"
 
@@ -409,7 +659,7 @@ def get_news(
                 print(f"[NewsAPI] Successfully fetched {len(feed)} articles for {query}")
 
         # Fallback to yfinance if NewsAPI failed or no API key
-        if not feed and YFINANCE_AVAILABLE:
+        if not feed and _get_yfinance():
             print(f"[yfinance] NewsAPI failed or unavailable, falling back to yfinance for {query}")
             raw_feed = _fetch_yfinance_news(query, limit)
 
@@ -424,19 +674,8 @@ def get_news(
                 print(f"[yfinance] Fetched {len(feed)} articles for {query} (filtered by date range)")
 
         # Normalize field names for compatibility with news_analyst.py
-        for article in feed:
-            # Add Alpha Vantage compatible fields if not present
-            if "time_published" not in article and "publishedAt" in article:
-                # Convert ISO format to Alpha Vantage format (YYYYMMDDTHHMMSS)
-                try:
-                    dt = datetime.fromisoformat(article["publishedAt"].replace("Z", "+00:00"))
-                    article["time_published"] = dt.strftime("%Y%m%dT%H%M%S")
-                except:
-                    article["time_published"] = article["publishedAt"]
-
-            # Ensure summary field exists
-            if "summary" not in article:
-                article["summary"] = article.get("description", "")
+        feed = _dedupe(feed)
+        _add_av_fields(feed)
 
         if not feed:
             print(f"[News Tools] No news found for {query} from {start_date} to {end_date}")
@@ -493,18 +732,7 @@ def get_global_news(
             print(f"[NewsAPI] Successfully fetched {len(feed)} global/macro news articles")
 
         # Normalize field names for compatibility with news_analyst.py
-        for article in feed:
-            # Add Alpha Vantage compatible fields if not present
-            if "time_published" not in article and "publishedAt" in article:
-                try:
-                    dt = datetime.fromisoformat(article["publishedAt"].replace("Z", "+00:00"))
-                    article["time_published"] = dt.strftime("%Y%m%dT%H%M%S")
-                except:
-                    article["time_published"] = article["publishedAt"]
-
-            # Ensure summary field exists
-            if "summary" not in article:
-                article["summary"] = article.get("description", "")
+        _add_av_fields(feed)
 
         if not feed:
             print(f"[NewsAPI] No global news found from {start_dt} to {end_dt}")
@@ -10,10 +10,19 @@
 # 4. Bear Debater (bearish case)
 # 5. Supervisor (final risk-tiered recommendations)
 
+import functools
 from typing import Dict, Any
 from langgraph.graph import StateGraph, END
 from langchain_google_genai import ChatGoogleGenerativeAI
 
+# Node-level result caching (langgraph >= 0.4); without it every run re-executes every node
+try:
+    from langgraph.cache.memory import InMemoryCache
+    from langgraph.types import CachePolicy
+    NODE_CACHE_AVAILABLE = True
+except ImportError:
+    NODE_CACHE_AVAILABLE = False
+
 from state import TradingState
 from config import (
     LLM_MODEL,
@@ -32,6 +41,74 @@ from agent.bear_debater_v2 import create_bear_debater
 from agent.supervisor_v2 import create_supervisor
 
 
+@functools.lru_cache(maxsize=8)
+def _get_chat_model(model_name: str, temperature: float) -> ChatGoogleGenerativeAI:
+    """Return a shared chat client for (model_name, temperature).
+
+    Graph instances built with the same settings reuse one client and its
+    connection pool instead of each setting up their own.
+    """
+    return ChatGoogleGenerativeAI(
+        model=model_name,
+        temperature=temperature,
+        google_api_key=GOOGLE_GENAI_API_KEY
+    )
+
+
+# Default graph state; _create_initial_state copies it and fills in ticker, date and messages
+_INITIAL_STATE_TEMPLATE: Dict[str, Any] = {
+    "ticker": "",
+    "date": "",
+    "messages": None,
+
+    # Parameters for news_analyst
+    "lookback_days": 30,  # NewsAPI free tier max is 30 days
+    "relevance_threshold": 0.4,  # Lowered to support any ticker, not just those in DEFAULT dictionaries
+    "max_company_articles": 20,  # Reduced from default 50 for faster processing
+    "max_macro_articles": 30,    # Reduced from default 80 for faster processing
+    "max_kept_articles": 50,     # Reduced from default 80 for faster processing
+
+    "news_analysis": "",
+    "market_analysis": "",
+    "fundamental_analysis": "",
+    "bull_argument": "",
+    "bear_argument": "",
+    "decision": "neutral",
+    "rationale": "",
+    "confidence": 0.0,
+    "supervisor_decision": ""
+}
+
+
+# How long a cached analyst result is reused for the same inputs
+ANALYST_CACHE_TTL = 3600
+
+# State fields each analyst's output depends on; a re-run with the same values
+# within ANALYST_CACHE_TTL reuses the cached result instead of calling the LLM
+_ANALYST_CACHE_FIELDS = {
+    "news_analyst": (
+        "ticker", "date", "lookback_days", "relevance_threshold",
+        "max_company_articles", "max_macro_articles", "max_kept_articles",
+        "aliases", "competitors", "sector_tags", "macro_terms"
+    ),
+    "market_analyst": ("ticker", "date"),
+    "fundamentals_analyst": ("ticker", "date"),
+}
+
+
+def _node_options(node_name: str) -> Dict[str, Any]:
+    """Extra add_node() arguments for a node: a cache policy for the analysts"""
+    fields = _ANALYST_CACHE_FIELDS.get(node_name)
+    if not NODE_CACHE_AVAILABLE or fields is None:
+        return {}
+    return {
+        "cache_policy": CachePolicy(
+            key_func=lambda state: repr(tuple(state.get(field) for field in fields)),
+            ttl=ANALYST_CACHE_TTL
+        )
+    }
+
+
 class TradingAgentsGraph:
     """
     Main graph coordinator for simplified trading agents system.
@@ -67,31 +144,39 @@ class TradingAgentsGraph:
         temperature = llm_temperature if llm_temperature is not None else LLM_TEMPERATURE
 
         # Fast model for analysts and debaters
-        self.llm = ChatGoogleGenerativeAI(
-            model=model_name,
-            temperature=temperature,
-            google_api_key=GOOGLE_GENAI_API_KEY
-        )
+        self.llm = _get_chat_model(model_name, temperature)
 
         # Deep thinking model for supervisor
-        self.supervisor_llm = ChatGoogleGenerativeAI(
-            model=SUPERVISOR_MODEL,
-            temperature=SUPERVISOR_TEMPERATURE,
-            google_api_key=GOOGLE_GENAI_API_KEY
-        )
+        self.supervisor_llm = _get_chat_model(SUPERVISOR_MODEL, SUPERVISOR_TEMPERATURE)
 
         if self.debug:
             print(f"[TradingAgentsGraph] Initialized with:")
             print(f"  - Analysts/Debaters: {model_name}, temperature: {temperature}")
             print(f"  - Supervisor: {SUPERVISOR_MODEL}, temperature: {SUPERVISOR_TEMPERATURE}")
 
-        # Build the graph
-        self.graph = self._build_graph()
+        # Build the graph (compiled once per model/temperature combination)
+        self.graph = self._build_graph(model_name, temperature, SUPERVISOR_MODEL, SUPERVISOR_TEMPERATURE)
 
-    def _build_graph(self):
+        if self.debug:
+            print("[TradingAgentsGraph] Graph compiled successfully")
+            print("Workflow: news_analyst → market_analyst → fundamentals_analyst → bull_debater → bear_debater → supervisor")
+
+    @classmethod
+    @functools.lru_cache(maxsize=4)
+    def _build_graph(
+        cls,
+        analyst_model: str,
+        analyst_temperature: float,
+        supervisor_model: str,
+        supervisor_temperature: float
+    ):
         """
         Build the LangGraph workflow.
 
+        Cached per process: the topology is fixed and the nodes close over the
+        shared chat clients from _get_chat_model, so instances with the same
+        model settings reuse one compiled graph.
+
         Graph structure:
 
         START
@@ -116,18 +201,21 @@ class TradingAgentsGraph:
         # Create the graph
         workflow = StateGraph(TradingState)
 
+        llm = _get_chat_model(analyst_model, analyst_temperature)
+        supervisor_llm = _get_chat_model(supervisor_model, supervisor_temperature)
+
         # Create agent nodes using factory functions
-        news_analyst_node = create_news_analyst(self.llm)
-        market_analyst_node = create_market_analyst(self.llm)
-        fundamentals_analyst_node = create_fundamentals_analyst(self.llm)
-        bull_debater_node = create_bull_debater(self.llm)
-        bear_debater_node = create_bear_debater(self.llm)
-        supervisor_node = create_supervisor(self.supervisor_llm)  # Use deep thinking model
-
-        # Add nodes to the graph
-        workflow.add_node("news_analyst", news_analyst_node)
-        workflow.add_node("market_analyst", market_analyst_node)
-        workflow.add_node("fundamentals_analyst", fundamentals_analyst_node)
+        news_analyst_node = create_news_analyst(llm)
+        market_analyst_node = create_market_analyst(llm)
+        fundamentals_analyst_node = create_fundamentals_analyst(llm)
+        bull_debater_node = create_bull_debater(llm)
+        bear_debater_node = create_bear_debater(llm)
+        supervisor_node = create_supervisor(supervisor_llm)  # Use deep thinking model
+
+        # Add nodes to the graph (analysts cache their results, see _ANALYST_CACHE_FIELDS)
+        workflow.add_node("news_analyst", news_analyst_node, **_node_options("news_analyst"))
+        workflow.add_node("market_analyst", market_analyst_node, **_node_options("market_analyst"))
+        workflow.add_node("fundamentals_analyst", fundamentals_analyst_node, **_node_options("fundamentals_analyst"))
         workflow.add_node("bull_debater", bull_debater_node)
         workflow.add_node("bear_debater", bear_debater_node)
         workflow.add_node("supervisor", supervisor_node)
@@ -141,14 +229,10 @@ class TradingAgentsGraph:
         workflow.add_edge("bear_debater", "supervisor")
         workflow.add_edge("supervisor", END)
 
-        # Compile and return
-        compiled_graph = workflow.compile()
-
-        if self.debug:
-            print("[TradingAgentsGraph] Graph compiled successfully")
-            print("Workflow: news_analyst → market_analyst → fundamentals_analyst → bull_debater → bear_debater → supervisor")
-
-        return compiled_graph
+        # Compile and return; the cache lives as long as this (process-wide) compiled graph
+        if NODE_CACHE_AVAILABLE:
+            return workflow.compile(cache=InMemoryCache())
+        return workflow.compile()
 
     def analyze(self, ticker: str, date: str) -> Dict[str, Any]:
         """
@@ -187,59 +271,108 @@ class TradingAgentsGraph:
         if self.debug:
             print(f"\n[TradingAgentsGraph] Starting analysis for {ticker} on {date}")
 
-        # Create initial state
-        initial_state = {
-            "ticker": ticker,
-            "date": date,
-            "messages": [],
-
-            # Parameters for news_analyst
-            "lookback_days": 30,  # NewsAPI free tier max is 30 days
-            "relevance_threshold": 0.4,  # Lowered to support any ticker, not just those in DEFAULT dictionaries
-            "max_company_articles": 20,  # Reduced from default 50 for faster processing
-            "max_macro_articles": 30,    # Reduced from default 80 for faster processing
-            "max_kept_articles": 50,     # Reduced from default 80 for faster processing
-
-            "news_analysis": "",
-            "market_analysis": "",
-            "fundamental_analysis": "",
-            "bull_argument": "",
-            "bear_argument": "",
-            "decision": "neutral",
-            "rationale": "",
-            "confidence": 0.0,
-            "supervisor_decision": ""
-        }
+        initial_state = self._create_initial_state(ticker, date)
 
         # Execute the graph
         if self.debug:
             # Debug mode: stream and print each step
-            print("\n" + "="*80)
-            print("STARTING WORKFLOW EXECUTION")
-            print("="*80 + "\n")
+            self._print_banner("STARTING WORKFLOW EXECUTION")
 
             final_state = None
             for step_num, output in enumerate(self.graph.stream(initial_state), 1):
-                node_name = list(output.keys())[0]
-                print(f"\n--- Step {step_num}: {node_name.upper()} ---")
-
-                if "messages" in output[node_name] and output[node_name]["messages"]:
-                    last_message = output[node_name]["messages"][-1]
-                    print(f"Message type: {type(last_message).__name__}")
-                    if hasattr(last_message, 'content'):
-                        content_preview = last_message.content[:200] + "..." if len(last_message.content) > 200 else last_message.content
-                        print(f"Content preview: {content_preview}")
+                final_state = self._print_step(step_num, output)
 
-                final_state = output[node_name]
-
-            print("\n" + "="*80)
-            print("WORKFLOW EXECUTION COMPLETED")
-            print("="*80 + "\n")
+            self._print_banner("WORKFLOW EXECUTION COMPLETED")
 
         else:
             # Standard mode: just invoke and get final result
             final_state = self.graph.invoke(initial_state)
 
+        return self._merge_final_state(initial_state, final_state, ticker, date)
+
+    async def analyze_async(self, ticker: str, date: str) -> Dict[str, Any]:
+        """
+        Async variant of analyze().
+
+        Runs the graph with ainvoke()/astream() so nodes that expose an async
+        entry point (debaters, supervisor) await their LLM calls instead of
+        blocking. Sync-only nodes are run by LangGraph in its executor.
+
+        Args:
+            ticker: Stock ticker symbol (e.g., "AAPL", "MSFT")
+            date: Analysis date in YYYY-MM-DD format
+
+        Returns:
+            Same merged state dictionary as analyze()
+        """
+        if self.debug:
+            print(f"\n[TradingAgentsGraph] Starting async analysis for {ticker} on {date}")
+
+        initial_state = self._create_initial_state(ticker, date)
+
+        if self.debug:
+            self._print_banner("STARTING WORKFLOW EXECUTION")
+
+            final_state = None
+            step_num = 0
+            async for output in self.graph.astream(initial_state):
+                step_num += 1
+                final_state = self._print_step(step_num, output)
+
+            self._print_banner("WORKFLOW EXECUTION COMPLETED")
+
+        else:
+            final_state = await self.graph.ainvoke(initial_state)
+
+        return self._merge_final_state(initial_state, final_state, ticker, date)
+
+    def _create_initial_state(self, ticker: str, date: str) -> Dict[str, Any]:
+        """Create the initial graph state for a ticker/date pair."""
+        # Shallow copy is enough: every template value is immutable; messages gets a fresh list
+        initial_state = _INITIAL_STATE_TEMPLATE.copy()
+        initial_state["ticker"] = ticker
+        initial_state["date"] = date
+        initial_state["messages"] = []
+        return initial_state
+
+    @staticmethod
+    def _print_banner(title: str):
+        """Print a debug-mode banner."""
+        print("\n" + "="*80)
+        print(title)
+        print("="*80 + "\n")
+
+    @staticmethod
+    def _print_step(step_num: int, output: Dict[str, Any]) -> Dict[str, Any]:
+        """Print a debug summary of one streamed step and return the node's state update."""
+        node_name = next(iter(output))
+        update = output[node_name]
+        lines = [f"\n--- Step {step_num}: {node_name.upper()} ---"]
+
+        messages = update.get("messages")
+        if messages:
+            last_message = messages[-1]
+            lines.append(f"Message type: {type(last_message).__name__}")
+            content = getattr(last_message, "content", None)
+            if content is not None:
+                content_preview = content[:200]
+                if len(content) > 200:
+                    content_preview += "..."
+                lines.append(f"Content preview: {content_preview}")
+
+        # One write (and flush) per step instead of one per line
+        print("\n".join(lines), flush=True)
+
+        return update
+
+    def _merge_final_state(
+        self,
+        initial_state: Dict[str, Any],
+        final_state: Dict[str, Any],
+        ticker: str,
+        date: str
+    ) -> Dict[str, Any]:
+        """Merge the graph's final state over the initial state."""
         if self.debug:
             print(f"[TradingAgentsGraph] Analysis complete")
             print(f"  - Decision: {final_state.get('decision', 'N/A')}")
@@ -7,9 +7,12 @@
 
 import json
 import argparse
-from datetime import datetime, timedelta
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 import sys
+import numpy as np
 from dotenv import load_dotenv
 
 # 加载环境变量
@@ -19,6 +22,63 @@ load_dotenv()
 sys.path.insert(0, str(Path(__file__).parent))
 
 from trading_graph import create_trading_graph
+from cache_manager import cache_manager
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+def _dump_json(obj, path: Path):
+    """以缩进的 UTF-8 JSON 写入文件（有 orjson 时使用 orjson）"""
+    if ORJSON_AVAILABLE:
+        path.write_bytes(orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+    else:
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(obj, f, indent=2, ensure_ascii=False)
+
+
+def _dumps_line(obj) -> bytes:
+    """序列化为单行 JSON（JSONL 的一行，含换行符）"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_APPEND_NEWLINE)
+    return (json.dumps(obj, ensure_ascii=False) + "\n").encode("utf-8")
+
+
+def _summary_record(ticker: str, date: str, result: dict) -> dict:
+    """从完整分析结果中提取汇总所需字段"""
+    return {
+        'date': date,
+        'ticker': ticker,
+        'decision': result.get('decision', 'N/A'),
+        'confidence': result.get('confidence', 0.0),
+        'rationale': result.get('rationale', 'N/A')
+    }
+
+
+# 按 debug 参数缓存的交易图，见 _get_graph
+_GRAPHS = {}
+_GRAPH_LOCK = threading.Lock()
+
+
+def _get_graph(debug: bool = False):
+    """
+    按 debug 参数缓存交易图，整个进程（包括线程池中的所有线程）共用同一个实例
+    
+    TradingAgentsGraph 可以跨线程复用：analyze() 每次调用都使用独立的状态，
+    编译后的工作流和 LLM 客户端本身是共享的。首次真正需要分析时才创建，
+    全部命中缓存的回测不会构建图。创建过程加锁并二次检查，
+    多个线程同时未命中时也只构建一次。
+    """
+    graph = _GRAPHS.get(debug)
+    if graph is None:
+        with _GRAPH_LOCK:
+            graph = _GRAPHS.get(debug)
+            if graph is None:
+                graph = _GRAPHS[debug] = create_trading_graph(debug=debug)
+    return graph
 
 
 def get_historical_dates(start_date: str, end_date: str, interval_days: int = 30):
@@ -33,22 +93,15 @@ def get_historical_dates(start_date: str, end_date: str, interval_days: int = 30
     Returns:
         日期字符串列表
     """
-    start = datetime.strptime(start_date, "%Y-%m-%d")
-    end = datetime.strptime(end_date, "%Y-%m-%d")
-    
-    dates = []
-    current = start
+    # 按间隔生成日期序列，再只保留工作日（周一到周五）
+    start = np.datetime64(start_date, 'D')
+    end = np.datetime64(end_date, 'D')
+    days = np.arange(start, end + 1, interval_days, dtype='datetime64[D]')
     
-    while current <= end:
-        # 只包含工作日（周一到周五）
-        if current.weekday() < 5:
-            dates.append(current.strftime("%Y-%m-%d"))
-        current += timedelta(days=interval_days)
-    
-    return dates
+    return days[np.is_busday(days)].astype(str).tolist()
 
 
-def analyze_stock(ticker: str, date: str, debug: bool = False):
+def analyze_stock(ticker: str, date: str, debug: bool = False, use_cache: bool = True, save_file: bool = True):
     """
     分析单个股票
     
@@ -56,6 +109,8 @@ def analyze_stock(ticker: str, date: str, debug: bool = False):
         ticker: 股票代码
         date: 分析日期
         debug: 是否启用调试模式
+        use_cache: 是否优先使用分析缓存（历史日期的结果永久有效），并缓存新结果
+        save_file: 是否额外保存单次分析结果文件 analysis_<ticker>_<date>.json
     
     Returns:
         分析结果字典
@@ -65,20 +120,34 @@ def analyze_stock(ticker: str, date: str, debug: bool = False):
         print(f"分析 {ticker} - {date}")
         print(f"{'='*60}")
         
-        # 创建图
-        graph = create_trading_graph(debug=debug)
+        # 命中缓存则直接返回，跳过整个 LLM 分析流程
+        if use_cache:
+            cached = cache_manager.get_cache(ticker, date)
+            if cached:
+                print(f"♻️  使用缓存结果 (缓存于 {cached.get('cached_at', 'unknown')})")
+                print(f"决策: {cached.get('decision', 'N/A').upper()}")
+                print(f"置信度: {cached.get('confidence', 0.0):.2%}")
+                return cached
+        
+        # 获取图（进程内复用同一个）
+        graph = _get_graph(debug)
         
         # 运行分析
         result = graph.analyze(ticker=ticker, date=date)
         
-        # 保存结果
-        output_file = f"analysis_{ticker}_{date}.json"
-        result_to_save = {k: v for k, v in result.items() if k != 'messages'}
-        
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(result_to_save, f, indent=2, ensure_ascii=False)
+        if use_cache:
+            cache_manager.save_cache(ticker, date, result)
         
-        print(f"✅ 分析完成，结果保存到: {output_file}")
+        # 保存结果
+        if save_file:
+            output_file = f"analysis_{ticker}_{date}.json"
+            result_to_save = {k: v for k, v in result.items() if k != 'messages'}
+            
+            _dump_json(result_to_save, Path(output_file))
+            
+            print(f"✅ 分析完成，结果保存到: {output_file}")
+        else:
+            print(f"✅ 分析完成")
         print(f"决策: {result.get('decision', 'N/A').upper()}")
         print(f"置信度: {result.get('confidence', 0.0):.2%}")
         
@@ -89,7 +158,8 @@ def analyze_stock(ticker: str, date: str, debug: bool = False):
         return None
 
 
-def batch_analyze(tickers: list, start_date: str, end_date: str, interval_days: int = 30, debug: bool = False):
+def batch_analyze(tickers: list, start_date: str, end_date: str, interval_days: int = 30, debug: bool = False, workers: int = 4,
+                  use_cache: bool = True, save_file: bool = True):
     """
     批量分析多个股票
     
@@ -99,47 +169,58 @@ def batch_analyze(tickers: list, start_date: str, end_date: str, interval_days:
         end_date: 结束日期
         interval_days: 间隔天数
         debug: 是否启用调试模式
+        workers: 并行分析的线程数（分析主要在等待 LLM/API 响应，线程即可并行）
+        use_cache: 是否使用分析缓存
+        save_file: 是否保存每次分析的结果文件（汇总文件总会写出）
     """
+    tickers = list(dict.fromkeys(tickers))  # 去重，保持顺序
+    
     print(f"开始批量回测分析")
     print(f"股票: {', '.join(tickers)}")
     print(f"日期范围: {start_date} 到 {end_date}")
     print(f"间隔: {interval_days}天")
     print(f"调试模式: {'开启' if debug else '关闭'}")
+    print(f"并行线程: {workers}")
     
     # 生成日期列表
     dates = get_historical_dates(start_date, end_date, interval_days)
     print(f"将分析 {len(dates)} 个日期: {dates}")
     
-    # 存储所有结果
-    all_results = []
+    # 汇总结果以 JSONL 写出：每只股票的全部日期完成后立即写入一行，
+    # 不必在内存中同时保留全部结果和整份序列化文本，中途中断也不丢失已完成的股票
+    summary_file = Path(f"backtest_summary_{start_date}_to_{end_date}.jsonl")
+    records_by_job = {}
+    remaining = {ticker: len(dates) for ticker in tickers}
+    decisions_by_ticker = {}
     
-    for ticker in tickers:
-        print(f"\n{'='*80}")
-        print(f"开始分析股票: {ticker}")
-        print(f"{'='*80}")
-        
-        ticker_results = []
+    def write_ticker(summary, ticker):
+        # 按原始日期顺序整理该股票的结果并写入一行
+        ticker_results = [records_by_job.pop((ticker, date)) for date in dates if (ticker, date) in records_by_job]
+        summary.write(_dumps_line({'ticker': ticker, 'results': ticker_results}))
+        summary.flush()
+        decisions_by_ticker[ticker] = [r['decision'] for r in ticker_results]
+    
+    # 所有 (股票, 日期) 组合并行分析
+    jobs = [(ticker, date) for ticker in tickers for date in dates]
+    
+    # 缓存索引在整批结束时统一写一次（cache_manager 退出时 flush）
+    with cache_manager, open(summary_file, 'wb') as summary, \
+            ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        if not dates:
+            for ticker in tickers:
+                write_ticker(summary, ticker)
         
-        for date in dates:
-            result = analyze_stock(ticker, date, debug)
+        futures = {executor.submit(analyze_stock, ticker, date, debug, use_cache, save_file): (ticker, date) for ticker, date in jobs}
+        for done, future in enumerate(as_completed(futures), 1):
+            ticker, date = futures[future]
+            result = future.result()
             if result:
-                ticker_results.append({
-                    'date': date,
-                    'ticker': ticker,
-                    'decision': result.get('decision', 'N/A'),
-                    'confidence': result.get('confidence', 0.0),
-                    'rationale': result.get('rationale', 'N/A')
-                })
-        
-        all_results.append({
-            'ticker': ticker,
-            'results': ticker_results
-        })
-    
-    # 保存汇总结果
-    summary_file = f"backtest_summary_{start_date}_to_{end_date}.json"
-    with open(summary_file, 'w', encoding='utf-8') as f:
-        json.dump(all_results, f, indent=2, ensure_ascii=False)
+                records_by_job[(ticker, date)] = _summary_record(ticker, date, result)
+            print(f"进度: {done}/{len(jobs)} ({ticker} {date})")
+            
+            remaining[ticker] -= 1
+            if remaining[ticker] == 0:
+                write_ticker(summary, ticker)
     
     print(f"\n{'='*80}")
     print(f"批量分析完成！")
@@ -147,21 +228,19 @@ def batch_analyze(tickers: list, start_date: str, end_date: str, interval_days:
     print(f"{'='*80}")
     
     # 打印简要统计
-    for ticker_data in all_results:
-        ticker = ticker_data['ticker']
-        results = ticker_data['results']
+    for ticker in tickers:
+        decisions = decisions_by_ticker.get(ticker)
         
-        if results:
-            decisions = [r['decision'] for r in results]
-            bullish_count = decisions.count('bullish')
-            bearish_count = decisions.count('bearish')
-            neutral_count = decisions.count('neutral')
+        if decisions:
+            # 一次遍历统计全部决策
+            counts = Counter(decisions)
+            bullish_count, bearish_count, neutral_count = counts['bullish'], counts['bearish'], counts['neutral']
             
             print(f"\n{ticker} 分析结果:")
             print(f"  看涨: {bullish_count} 次")
             print(f"  看跌: {bearish_count} 次")
             print(f"  中性: {neutral_count} 次")
-            print(f"  总计: {len(results)} 次分析")
+            print(f"  总计: {len(decisions)} 次分析")
 
 
 def main():
@@ -174,21 +253,28 @@ def main():
     parser.add_argument("--start-date", type=str, help="开始日期 (YYYY-MM-DD)")
     parser.add_argument("--end-date", type=str, help="结束日期 (YYYY-MM-DD)")
     parser.add_argument("--interval", type=int, default=30, help="间隔天数 (默认30天)")
+    parser.add_argument("--workers", type=int, default=4, help="并行分析线程数 (默认4)")
+    parser.add_argument("--no-cache", action="store_true", help="不使用分析缓存，强制重新分析")
+    parser.add_argument("--no-per-file", action="store_true", help="不保存单次分析结果文件，只写汇总")
     parser.add_argument("--debug", action="store_true", help="启用调试模式")
     
     args = parser.parse_args()
+    use_cache = not args.no_cache
+    save_file = not args.no_per_file
     
     # 单股票单日期分析
     if args.ticker and args.date:
-        analyze_stock(args.ticker, args.date, args.debug)
+        analyze_stock(args.ticker, args.date, args.debug, use_cache, save_file)
     
     # 批量分析
     elif args.tickers and args.start_date and args.end_date:
-        batch_analyze(args.tickers, args.start_date, args.end_date, args.interval, args.debug)
+        batch_analyze(args.tickers, args.start_date, args.end_date, args.interval, args.debug, args.workers,
+                      use_cache, save_file)
     
     # 单股票多日期分析
     elif args.ticker and args.start_date and args.end_date:
-        batch_analyze([args.ticker], args.start_date, args.end_date, args.interval, args.debug)
+        batch_analyze([args.ticker], args.start_date, args.end_date, args.interval, args.debug, args.workers,
+                      use_cache, save_file)
     
     else:
         print("使用方法:")
@@ -196,6 +282,8 @@ def main():
         print("2. 单股票多日期: python backtest.py --ticker AAPL --start-date 2024-01-01 --end-date 2024-06-30")
         print("3. 多股票多日期: python backtest.py --tickers AAPL MSFT GOOGL --start-date 2024-01-01 --end-date 2024-06-30")
         print("4. 启用调试: 添加 --debug 参数")
+        print("5. 并行线程: 添加 --workers N 参数 (默认4)")
+        print("6. 忽略缓存: 添加 --no-cache 参数；只写汇总: 添加 --no-per-file 参数")
 
 
 if __name__ == "__main__":
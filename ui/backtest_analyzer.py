@@ -6,48 +6,112 @@
 """
 
 import json
+import numpy as np
 import pandas as pd
+import matplotlib
+matplotlib.use('Agg')  # 只输出图片文件，不需要交互式后端
 import matplotlib.pyplot as plt
 import seaborn as sns
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
+from itertools import repeat
 from pathlib import Path
 import argparse
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import simdjson
+    SIMDJSON_AVAILABLE = True
+except ImportError:
+    SIMDJSON_AVAILABLE = False
+
+try:
+    import pyvips
+    PYVIPS_AVAILABLE = True
+except (ImportError, OSError):  # 已安装 pyvips 但缺少 libvips 时导入会抛 OSError
+    PYVIPS_AVAILABLE = False
+
+
+# 展平后的结果表列（每行一次分析）
+RESULT_COLUMNS = ['ticker', 'date', 'decision', 'confidence', 'rationale']
+DECISIONS = ['bullish', 'bearish', 'neutral']
+# 图表输出格式：png（默认）、svg（矢量，不经过光栅编码）、webp（有 pyvips 时由 libvips 编码）
+CHART_FORMATS = ['png', 'svg', 'webp']
+
 
 def load_backtest_results(summary_file: str):
-    """加载回测结果"""
+    """加载回测结果（支持 .json 汇总文件和每行一只股票的 .jsonl 汇总文件）
+    
+    有 simdjson 时 .json 汇总返回惰性文档（可像列表/字典一样读取），
+    results_to_frame 只会把用到的字段转换为 Python 对象
+    """
     
+    path = Path(summary_file)
+    if path.suffix == '.jsonl':
+        loads = orjson.loads if ORJSON_AVAILABLE else json.loads
+        with open(path, 'rb') as f:
+            return [loads(line) for line in f if line.strip()]
+    
+    if SIMDJSON_AVAILABLE:
+        return simdjson.Parser().load(str(path))
+    if ORJSON_AVAILABLE:
+        return orjson.loads(path.read_bytes())
     with open(summary_file, 'r', encoding='utf-8') as f:
         return json.load(f)
 
 
-def analyze_backtest_performance(results: list):
-    """分析回测表现"""
+def results_to_frame(results: list) -> pd.DataFrame:
+    """将按股票嵌套的回测结果一次性展平为 DataFrame，后续统计和导出都基于这张表"""
+    
+    rows = [
+        (ticker_data['ticker'], r['date'], r['decision'], r['confidence'], r.get('rationale', ''))
+        for ticker_data in results
+        for r in ticker_data['results']
+    ]
+    return pd.DataFrame(rows, columns=RESULT_COLUMNS)
+
+
+def analyze_backtest_performance(results):
+    """分析回测表现（results 可以是原始汇总列表，也可以是 results_to_frame 的结果）"""
+    
+    df = results if isinstance(results, pd.DataFrame) else results_to_frame(results)
+    if df.empty:
+        return {}
+    
+    # 逐行指标列 + 一次 groupby.agg 完成全部统计（计数、平均置信度、决策变化）
+    # 决策先编码为整数，变化检测在整数列上比较；sort=False 保持股票和日期的原始顺序
+    decision = df['decision']
+    codes = pd.Series(pd.factorize(decision)[0], index=df.index)
+    metrics = pd.DataFrame({
+        'ticker': df['ticker'],
+        'confidence': df['confidence'],
+        'bullish': decision.eq('bullish'),
+        'bearish': decision.eq('bearish'),
+        'neutral': decision.eq('neutral'),
+        # 组内与上一次决策不同即计一次变化（每组首行与 NaN 比较恒为 True，聚合后减 1）
+        'changed': codes.ne(codes.groupby(df['ticker'], sort=False).shift()),
+    })
+    stats = metrics.groupby('ticker', sort=False).agg(
+        total=('confidence', 'size'),
+        avg_confidence=('confidence', 'mean'),
+        bullish=('bullish', 'sum'),
+        bearish=('bearish', 'sum'),
+        neutral=('neutral', 'sum'),
+        changes=('changed', 'sum'),
+    )
     
     analysis = {}
     
-    for ticker_data in results:
-        ticker = ticker_data['ticker']
-        ticker_results = ticker_data['results']
-        
-        if not ticker_results:
-            continue
-        
-        # 统计决策分布
-        decisions = [r['decision'] for r in ticker_results]
-        bullish_count = decisions.count('bullish')
-        bearish_count = decisions.count('bearish')
-        neutral_count = decisions.count('neutral')
-        total_count = len(decisions)
-        
-        # 计算平均置信度
-        avg_confidence = sum(r['confidence'] for r in ticker_results) / total_count
-        
-        # 决策变化趋势
-        decision_changes = 0
-        for i in range(1, len(decisions)):
-            if decisions[i] != decisions[i-1]:
-                decision_changes += 1
+    for ticker, group in df.groupby('ticker', sort=False):
+        row = stats.loc[ticker]
+        total_count = int(row['total'])
+        bullish_count, bearish_count, neutral_count = (int(row[d]) for d in DECISIONS)
+        changes = int(row['changes']) - 1
         
         analysis[ticker] = {
             'total_analyses': total_count,
@@ -57,10 +121,10 @@ def analyze_backtest_performance(results: list):
             'bullish_ratio': bullish_count / total_count,
             'bearish_ratio': bearish_count / total_count,
             'neutral_ratio': neutral_count / total_count,
-            'avg_confidence': avg_confidence,
-            'decision_changes': decision_changes,
-            'decision_consistency': 1 - (decision_changes / max(1, total_count - 1)),
-            'results': ticker_results
+            'avg_confidence': float(row['avg_confidence']),
+            'decision_changes': changes,
+            'decision_consistency': 1 - (changes / max(1, total_count - 1)),
+            'results': group.to_dict('records')
         }
     
     return analysis
@@ -89,53 +153,81 @@ def generate_summary_report(analysis: dict):
             print(f"    {result['date']}: {result['decision'].upper()} (置信度: {result['confidence']:.1%})")
 
 
-def create_visualization(analysis: dict, output_dir: str = "backtest_charts"):
-    """创建可视化图表"""
+# 每个进程（主进程或图表工作进程）复用同一个 Figure，见 _get_figure
+_FIGURE = None
+
+
+def _get_figure():
+    """返回本进程复用的 (fig, axes)，首次调用时设置字体并创建"""
+    global _FIGURE
+    if _FIGURE is None:
+        # 设置中文字体（工作进程不会继承主进程的 rcParams，因此在这里设置）
+        plt.rcParams['font.sans-serif'] = ['SimHei', 'Arial Unicode MS', 'DejaVu Sans']
+        plt.rcParams['axes.unicode_minus'] = False
+        _FIGURE = plt.subplots(2, 2, figsize=(15, 10))
+    return _FIGURE
+
+
+def _close_figure():
+    """关闭并丢弃本进程复用的 Figure（pyplot 会一直持有未关闭的 Figure）"""
+    global _FIGURE
+    if _FIGURE is not None:
+        plt.close(_FIGURE[0])
+        _FIGURE = None
+
+
+def _save_figure(fig, chart_file: str, dpi: int, chart_format: str):
+    """按格式保存图表；webp 且有 pyvips 时直接把 Agg 画布的 RGBA 缓冲交给 libvips 编码"""
     
-    # 创建输出目录
-    Path(output_dir).mkdir(exist_ok=True)
+    if chart_format == 'webp' and PYVIPS_AVAILABLE:
+        # 画布缓冲是整张 Figure（不做 bbox_inches='tight' 裁剪，tight_layout 已去掉多余留白）
+        fig.set_dpi(dpi)
+        fig.canvas.draw()
+        rgba = np.asarray(fig.canvas.buffer_rgba())
+        height, width = rgba.shape[:2]
+        pyvips.Image.new_from_memory(rgba.tobytes(), width, height, 4, 'uchar').webpsave(chart_file)
+    else:
+        fig.savefig(chart_file, dpi=dpi, bbox_inches='tight', format=chart_format)
+
+
+def _render_ticker(ticker: str, data: dict, output_dir: str, dpi: int, chart_format: str = 'png') -> str:
+    """绘制并保存单只股票的图表，返回图表文件路径（可在工作进程中运行）"""
     
-    # 设置中文字体
-    plt.rcParams['font.sans-serif'] = ['SimHei', 'Arial Unicode MS', 'DejaVu Sans']
-    plt.rcParams['axes.unicode_minus'] = False
+    fig, axes = _get_figure()
+    for ax in axes.flat:
+        ax.clear()
     
-    for ticker, data in analysis.items():
-        if not data['results']:
-            continue
-        
-        # 创建子图
-        fig, axes = plt.subplots(2, 2, figsize=(15, 10))
-        fig.suptitle(f'{ticker} 回测分析结果', fontsize=16, fontweight='bold')
-        
-        # 1. 决策分布饼图
-        decisions = [r['decision'] for r in data['results']]
-        decision_counts = pd.Series(decisions).value_counts()
-        
-        axes[0, 0].pie(decision_counts.values, labels=decision_counts.index, autopct='%1.1f%%')
-        axes[0, 0].set_title('决策分布')
-        
-        # 2. 置信度趋势
-        dates = [datetime.strptime(r['date'], '%Y-%m-%d') for r in data['results']]
-        confidences = [r['confidence'] for r in data['results']]
-        
-        axes[0, 1].plot(dates, confidences, marker='o', linewidth=2, markersize=6)
-        axes[0, 1].set_title('置信度趋势')
-        axes[0, 1].set_ylabel('置信度')
-        axes[0, 1].tick_params(axis='x', rotation=45)
-        
-        # 3. 决策时间线
-        decision_map = {'bullish': 1, 'neutral': 0, 'bearish': -1}
-        decision_values = [decision_map[d] for d in decisions]
-        
-        axes[1, 0].plot(dates, decision_values, marker='o', linewidth=2, markersize=8)
-        axes[1, 0].set_title('决策时间线')
-        axes[1, 0].set_ylabel('决策 (1=看涨, 0=中性, -1=看跌)')
-        axes[1, 0].set_ylim(-1.5, 1.5)
-        axes[1, 0].tick_params(axis='x', rotation=45)
-        
-        # 4. 统计摘要
-        axes[1, 1].axis('off')
-        summary_text = f"""
+    fig.suptitle(f'{ticker} 回测分析结果', fontsize=16, fontweight='bold')
+    
+    # 1. 决策分布饼图
+    decisions = [r['decision'] for r in data['results']]
+    decision_counts = pd.Series(decisions).value_counts()
+    
+    axes[0, 0].pie(decision_counts.values, labels=decision_counts.index, autopct='%1.1f%%')
+    axes[0, 0].set_title('决策分布')
+    
+    # 2. 置信度趋势
+    dates = [datetime.strptime(r['date'], '%Y-%m-%d') for r in data['results']]
+    confidences = [r['confidence'] for r in data['results']]
+    
+    axes[0, 1].plot(dates, confidences, marker='o', linewidth=2, markersize=6)
+    axes[0, 1].set_title('置信度趋势')
+    axes[0, 1].set_ylabel('置信度')
+    axes[0, 1].tick_params(axis='x', rotation=45)
+    
+    # 3. 决策时间线
+    decision_map = {'bullish': 1, 'neutral': 0, 'bearish': -1}
+    decision_values = [decision_map[d] for d in decisions]
+    
+    axes[1, 0].plot(dates, decision_values, marker='o', linewidth=2, markersize=8)
+    axes[1, 0].set_title('决策时间线')
+    axes[1, 0].set_ylabel('决策 (1=看涨, 0=中性, -1=看跌)')
+    axes[1, 0].set_ylim(-1.5, 1.5)
+    axes[1, 0].tick_params(axis='x', rotation=45)
+    
+    # 4. 统计摘要
+    axes[1, 1].axis('off')
+    summary_text = f"""
         总分析次数: {data['total_analyses']}
         看涨比例: {data['bullish_ratio']:.1%}
         看跌比例: {data['bearish_ratio']:.1%}
@@ -144,36 +236,49 @@ def create_visualization(analysis: dict, output_dir: str = "backtest_charts"):
         决策一致性: {data['decision_consistency']:.1%}
         决策变化次数: {data['decision_changes']}
         """
-        axes[1, 1].text(0.1, 0.5, summary_text, fontsize=12, verticalalignment='center',
-                       bbox=dict(boxstyle="round,pad=0.3", facecolor="lightblue", alpha=0.5))
-        axes[1, 1].set_title('统计摘要')
-        
-        plt.tight_layout()
-        
-        # 保存图表
-        chart_file = f"{output_dir}/{ticker}_backtest_analysis.png"
-        plt.savefig(chart_file, dpi=300, bbox_inches='tight')
+    axes[1, 1].text(0.1, 0.5, summary_text, fontsize=12, verticalalignment='center',
+                   bbox=dict(boxstyle="round,pad=0.3", facecolor="lightblue", alpha=0.5))
+    axes[1, 1].set_title('统计摘要')
+    
+    fig.tight_layout()
+    
+    # 保存图表
+    chart_file = f"{output_dir}/{ticker}_backtest_analysis.{chart_format}"
+    _save_figure(fig, chart_file, dpi, chart_format)
+    return chart_file
+
+
+def create_visualization(analysis: dict, output_dir: str = "backtest_charts", dpi: int = 150, workers: int = None,
+                         chart_format: str = 'png'):
+    """创建可视化图表（多只股票时按股票分发到多个进程并行渲染）"""
+    
+    # 创建输出目录
+    Path(output_dir).mkdir(exist_ok=True)
+    
+    jobs = [(ticker, data) for ticker, data in analysis.items() if data['results']]
+    tickers = [ticker for ticker, _ in jobs]
+    
+    if len(jobs) <= 1 or workers == 1:
+        try:
+            chart_files = [_render_ticker(ticker, data, output_dir, dpi, chart_format) for ticker, data in jobs]
+        finally:
+            # 主进程渲染完即释放 Figure；工作进程的 Figure 随进程退出回收
+            _close_figure()
+    else:
+        # 渲染和 PNG 编码是 CPU 密集型，用进程而非线程并行
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            chart_files = list(executor.map(
+                _render_ticker, tickers, [data for _, data in jobs], repeat(output_dir), repeat(dpi),
+                repeat(chart_format)
+            ))
+    
+    for ticker, chart_file in zip(tickers, chart_files):
         print(f"📊 {ticker} 图表保存到: {chart_file}")
-        
-        plt.close()
 
 
-def export_detailed_results(analysis: dict, output_file: str):
+def export_detailed_results(df: pd.DataFrame, output_file: str):
     """导出详细结果到CSV"""
     
-    all_results = []
-    
-    for ticker, data in analysis.items():
-        for result in data['results']:
-            all_results.append({
-                'ticker': ticker,
-                'date': result['date'],
-                'decision': result['decision'],
-                'confidence': result['confidence'],
-                'rationale': result['rationale']
-            })
-    
-    df = pd.DataFrame(all_results)
     df.to_csv(output_file, index=False, encoding='utf-8-sig')
     print(f"📄 详细结果导出到: {output_file}")
 
@@ -186,16 +291,21 @@ def main():
     parser.add_argument("--output-dir", type=str, default="backtest_charts", help="图表输出目录")
     parser.add_argument("--export-csv", type=str, help="导出CSV文件路径")
     parser.add_argument("--no-charts", action="store_true", help="不生成图表")
+    parser.add_argument("--dpi", type=int, default=150, help="图表分辨率 (默认150，出版质量可用300)")
+    parser.add_argument("--chart-format", choices=CHART_FORMATS, default="png",
+                        help="图表格式 (svg 为矢量图，webp 在安装 pyvips 时由 libvips 编码)")
+    parser.add_argument("--chart-workers", type=int, help="并行渲染图表的进程数 (默认CPU核数，1为串行)")
     
     args = parser.parse_args()
     
     # 加载回测结果
     print("📊 加载回测结果...")
     results = load_backtest_results(args.summary_file)
+    df = results_to_frame(results)
     
     # 分析回测表现
     print("🔍 分析回测表现...")
-    analysis = analyze_backtest_performance(results)
+    analysis = analyze_backtest_performance(df)
     
     # 生成汇总报告
     print("📋 生成汇总报告...")
@@ -204,12 +314,12 @@ def main():
     # 创建可视化图表
     if not args.no_charts:
         print("📊 创建可视化图表...")
-        create_visualization(analysis, args.output_dir)
+        create_visualization(analysis, args.output_dir, args.dpi, args.chart_workers, args.chart_format)
     
     # 导出详细结果
     if args.export_csv:
         print("📄 导出详细结果...")
-        export_detailed_results(analysis, args.export_csv)
+        export_detailed_results(df, args.export_csv)
     
     print("\n✅ 回测分析完成！")
 
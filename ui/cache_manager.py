@@ -5,10 +5,84 @@ Manages caching of trading analysis results to avoid redundant API calls.
 For historical dates, cached results are永久有效 (permanently valid).
 """
 
+import atexit
+import functools
+import hashlib
 import json
+import os
+import shutil
+import sqlite3
+import tempfile
+import threading
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import msgpack
+    import zstandard
+    MSGPACK_ZSTD_AVAILABLE = True
+except ImportError:
+    MSGPACK_ZSTD_AVAILABLE = False
+
+# Cache entries are written in the first format; older entries in the others are still read
+_COMPACT_SUFFIX = ".msgpack.zst"
+_ENTRY_SUFFIXES = (_COMPACT_SUFFIX, ".json") if MSGPACK_ZSTD_AVAILABLE else (".json",)
+_ZSTD_LEVEL = 3
+# Payloads are stored once per distinct content under objects/<sha[:2]>/<sha><suffix>
+_OBJECTS_DIR = "objects"
+
+
+def _load_json(path: Path) -> Any:
+    """Read a JSON file (orjson when available)"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(path.read_bytes())
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _encode_entry(obj: Dict[str, Any], suffix: str) -> bytes:
+    """Serialize a cache entry with sorted keys, so equal results give equal bytes"""
+    obj = dict(sorted(obj.items()))
+    if suffix == _COMPACT_SUFFIX:
+        return zstandard.compress(msgpack.packb(obj, use_bin_type=True), _ZSTD_LEVEL)
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_SORT_KEYS)
+    return json.dumps(obj, indent=2, ensure_ascii=False, sort_keys=True).encode('utf-8')
+
+
+def _load_entry(path: Path) -> Any:
+    """Read a cache entry written by _encode_entry (or an older flat entry file)"""
+    if path.name.endswith(_COMPACT_SUFFIX):
+        return msgpack.unpackb(zstandard.decompress(path.read_bytes()), raw=False)
+    return _load_json(path)
+
+
+@functools.lru_cache(maxsize=1024)
+def _load_cache_file(path_str: str, mtime_ns: int) -> Dict[str, Any]:
+    """Parse a cache entry once per file version (mtime_ns is only part of the key)"""
+    return _load_entry(Path(path_str))
+
+
+@functools.lru_cache(maxsize=4096)
+def _cache_path(cache_dir: str, name: str) -> Path:
+    """Interned path of a file under the cache directory"""
+    return Path(cache_dir) / name
+
+
+@functools.lru_cache(maxsize=4096)
+def _flat_entry_paths(cache_dir: str, cache_key: str) -> Tuple[Path, ...]:
+    """Interned flat (pre-objects) paths of an entry, preferred format first"""
+    return tuple(Path(cache_dir) / f"{cache_key}{suffix}" for suffix in _ENTRY_SUFFIXES)
+
+
+_INDEX_COLUMNS = ('ticker', 'date', 'cached_at', 'decision', 'confidence', 'file')
 
 
 class CacheManager:
@@ -17,57 +91,170 @@ class CacheManager:
     def __init__(self, cache_dir: str = "analysis_cache"):
         self.cache_dir = Path(cache_dir)
         self.cache_dir.mkdir(exist_ok=True)
-        self.index_file = self.cache_dir / "index.json"
-        self.index = self._load_index()
+        self._cache_dir_str = str(self.cache_dir)
+        self.index_file = self.cache_dir / "index.sqlite"
+        self.objects_dir = self.cache_dir / _OBJECTS_DIR
+        # Hashes already known to be on disk, so repeat saves skip the exists() check
+        self._known_objects = set()
+        # get_cache_stats result, reset whenever entries are saved or deleted
+        self._stats = None
+        # One connection shared by all threads; the lock serializes access to it
+        self._lock = threading.Lock()
+        self.db = sqlite3.connect(str(self.index_file), isolation_level=None, check_same_thread=False)
+        self.db.execute('PRAGMA journal_mode=WAL')
+        self.db.execute(
+            'CREATE TABLE IF NOT EXISTS idx(key TEXT PRIMARY KEY, ticker TEXT, date TEXT, '
+            'cached_at TEXT, decision TEXT, confidence REAL, file TEXT)'
+        )
+        self.db.execute('CREATE INDEX IF NOT EXISTS idx_file ON idx(file)')
+        self._import_legacy_index()
+        # Keys present in the index, so has_cache never has to query the database
+        self._keys = {key for (key,) in self.db.execute('SELECT key FROM idx')}
     
-    def _load_index(self) -> Dict[str, Any]:
-        """Load the cache index"""
-        if self.index_file.exists():
-            try:
-                with open(self.index_file, 'r') as f:
-                    return json.load(f)
-            except Exception as e:
-                print(f"Error loading cache index: {e}")
-                return {}
-        return {}
-    
-    def _save_index(self):
-        """Save the cache index"""
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.flush()
+        return False
+    
+    def _import_legacy_index(self):
+        """Move entries from an index.json written by older versions into the SQLite index"""
+        legacy_file = self.cache_dir / "index.json"
+        if not legacy_file.exists():
+            return
         try:
-            with open(self.index_file, 'w') as f:
-                json.dump(self.index, f, indent=2)
+            legacy = _load_json(legacy_file)
+            rows = [
+                (key, *(meta.get(col) for col in _INDEX_COLUMNS))
+                for key, meta in legacy.items()
+            ]
+            with self._lock:
+                self.db.execute('BEGIN')
+                self.db.executemany('INSERT OR IGNORE INTO idx VALUES (?, ?, ?, ?, ?, ?, ?)', rows)
+                self.db.execute('COMMIT')
+            legacy_file.unlink()
         except Exception as e:
-            print(f"Error saving cache index: {e}")
+            print(f"Error importing legacy cache index: {e}")
+    
+    def flush(self):
+        """Checkpoint the index WAL into the main database file
+        
+        Index rows are committed as they are saved; this only keeps the WAL
+        from growing across long batches.
+        """
+        try:
+            with self._lock:
+                self.db.execute('PRAGMA wal_checkpoint(PASSIVE)')
+        except sqlite3.Error as e:
+            print(f"Error flushing cache index: {e}")
     
     def _get_cache_key(self, ticker: str, date: str) -> str:
         """Generate cache key from ticker and date"""
         return f"{ticker}_{date}"
     
-    def _get_cache_file(self, cache_key: str) -> Path:
-        """Get cache file path for a given key"""
-        return self.cache_dir / f"{cache_key}.json"
+    def _write_object(self, payload: bytes) -> str:
+        """Store payload under its SHA-256 unless an identical payload is already stored
+        
+        Returns the object's path relative to the cache directory, as kept in the index.
+        """
+        sha = hashlib.sha256(payload).hexdigest()
+        name = f"{_OBJECTS_DIR}/{sha[:2]}/{sha}{_ENTRY_SUFFIXES[0]}"
+        if sha in self._known_objects:
+            return name
+        object_file = self.cache_dir / name
+        if object_file.exists():
+            self._known_objects.add(sha)
+            return name
+        
+        # Write-then-rename so readers never see a partial object
+        object_file.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=object_file.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(payload)
+            os.replace(tmp_path, object_file)
+        except BaseException:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
+        self._known_objects.add(sha)
+        return name
+    
+    def _release_file(self, file: str):
+        """Remove a payload file once no index entry refers to it (caller holds the lock)"""
+        if not file or self.db.execute('SELECT 1 FROM idx WHERE file = ?', (file,)).fetchone():
+            return
+        path = _cache_path(self._cache_dir_str, file)
+        path.unlink(missing_ok=True)
+        self._known_objects.discard(path.name[:64])
+    
+    def _cache_file_candidates(self, cache_key: str) -> Tuple[Path, ...]:
+        """All flat (pre-objects) paths an entry may be stored under, preferred format first"""
+        return _flat_entry_paths(self._cache_dir_str, cache_key)
+    
+    def _find_cache_file(self, cache_key: str):
+        """Return (path, mtime_ns) of the stored entry, or None if there is none"""
+        with self._lock:
+            row = self.db.execute('SELECT file FROM idx WHERE key = ?', (cache_key,)).fetchone()
+        candidates = self._cache_file_candidates(cache_key)
+        if row and row[0]:
+            candidates = (_cache_path(self._cache_dir_str, row[0]), *candidates)
+        for cache_file in candidates:
+            try:
+                return cache_file, cache_file.stat().st_mtime_ns
+            except FileNotFoundError:
+                continue
+        return None
+    
+    def _entry_files(self) -> List[Path]:
+        """All cache entry files in the cache directory (excluding the index)"""
+        files = [f for f in self.cache_dir.glob("*.json") if f.name != "index.json"]
+        files.extend(self.cache_dir.glob(f"*{_COMPACT_SUFFIX}"))
+        files.extend(f for f in self.objects_dir.glob("*/*") if not f.name.endswith(".tmp"))
+        return files
+    
+    def _scan_cache_size(self) -> int:
+        """Total size in bytes of everything under the cache directory (index included)"""
+        size = 0
+        pending = [self.cache_dir]
+        while pending:
+            with os.scandir(pending.pop()) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        pending.append(entry.path)
+                    elif not entry.name.endswith(".tmp"):
+                        size += entry.stat(follow_symlinks=False).st_size
+        return size
     
     def has_cache(self, ticker: str, date: str) -> bool:
         """Check if cache exists for ticker and date"""
+        return self._get_cache_key(ticker, date) in self._keys
+    
+    def get_metadata(self, ticker: str, date: str) -> Optional[Dict[str, Any]]:
+        """Get the index entry (cached_at, decision, confidence, ...) for ticker and date"""
         cache_key = self._get_cache_key(ticker, date)
-        cache_file = self._get_cache_file(cache_key)
-        return cache_file.exists()
+        with self._lock:
+            row = self.db.execute(
+                f'SELECT {", ".join(_INDEX_COLUMNS)} FROM idx WHERE key = ?', (cache_key,)
+            ).fetchone()
+        return dict(zip(_INDEX_COLUMNS, row)) if row else None
     
     def get_cache(self, ticker: str, date: str) -> Optional[Dict[str, Any]]:
         """Get cached analysis result"""
         cache_key = self._get_cache_key(ticker, date)
-        cache_file = self._get_cache_file(cache_key)
-        
-        if not cache_file.exists():
+        found = self._find_cache_file(cache_key)
+        if found is None:
             return None
+        cache_file, mtime_ns = found
         
         try:
-            with open(cache_file, 'r') as f:
-                data = json.load(f)
-                # Add cache metadata
-                data['from_cache'] = True
-                data['cached_at'] = self.index.get(cache_key, {}).get('cached_at', 'unknown')
-                return data
+            # Shallow copy so the metadata below never leaks into the memoized entry
+            data = dict(_load_cache_file(str(cache_file), mtime_ns))
+            # Add cache metadata
+            data['from_cache'] = True
+            metadata = self.get_metadata(ticker, date) or {}
+            data['cached_at'] = metadata.get('cached_at') or 'unknown'
+            return data
         except Exception as e:
             print(f"Error loading cache for {cache_key}: {e}")
             return None
@@ -75,26 +262,36 @@ class CacheManager:
     def save_cache(self, ticker: str, date: str, result: Dict[str, Any]):
         """Save analysis result to cache"""
         cache_key = self._get_cache_key(ticker, date)
-        cache_file = self._get_cache_file(cache_key)
         
         try:
             # Remove messages field if present (contains non-serializable objects)
             result_to_save = {k: v for k, v in result.items() if k != 'messages'}
+            payload = _encode_entry(result_to_save, _ENTRY_SUFFIXES[0])
             
-            # Save the result
-            with open(cache_file, 'w') as f:
-                json.dump(result_to_save, f, indent=2)
+            # Store the payload (once per distinct content) and point the index at it
+            with self._lock:
+                object_name = self._write_object(payload)
+                previous = self.db.execute('SELECT file FROM idx WHERE key = ?', (cache_key,)).fetchone()
+                self.db.execute(
+                    'INSERT OR REPLACE INTO idx VALUES (?, ?, ?, ?, ?, ?, ?)',
+                    (
+                        cache_key,
+                        ticker,
+                        date,
+                        datetime.now().isoformat(),
+                        result.get('decision', 'unknown'),
+                        result.get('confidence', 0),
+                        object_name,
+                    )
+                )
+                if previous:
+                    self._release_file(previous[0])
+                self._keys.add(cache_key)
+                self._stats = None
             
-            # Update index
-            self.index[cache_key] = {
-                'ticker': ticker,
-                'date': date,
-                'cached_at': datetime.now().isoformat(),
-                'decision': result.get('decision', 'unknown'),
-                'confidence': result.get('confidence', 0),
-                'file': cache_file.name
-            }
-            self._save_index()
+            # Drop any flat per-key copy of this entry written by older versions
+            for stale_file in self._cache_file_candidates(cache_key):
+                stale_file.unlink(missing_ok=True)
             
             print(f"✅ Cached analysis for {ticker} on {date}")
             
@@ -103,35 +300,32 @@ class CacheManager:
     
     def get_all_cached(self) -> List[Dict[str, Any]]:
         """Get list of all cached analyses"""
-        cached_list = []
-        
-        for cache_key, metadata in self.index.items():
-            cached_list.append({
-                'cache_key': cache_key,
-                'ticker': metadata.get('ticker'),
-                'date': metadata.get('date'),
-                'cached_at': metadata.get('cached_at'),
-                'decision': metadata.get('decision'),
-                'confidence': metadata.get('confidence'),
-            })
+        columns = ('cache_key', 'ticker', 'date', 'cached_at', 'decision', 'confidence')
         
-        # Sort by cached_at descending (most recent first)
-        cached_list.sort(key=lambda x: x.get('cached_at', ''), reverse=True)
+        # Most recent first
+        with self._lock:
+            rows = self.db.execute(
+                'SELECT key, ticker, date, cached_at, decision, confidence FROM idx '
+                'ORDER BY cached_at DESC'
+            ).fetchall()
         
-        return cached_list
+        return [dict(zip(columns, row)) for row in rows]
     
     def delete_cache(self, ticker: str, date: str) -> bool:
         """Delete a specific cache entry"""
         cache_key = self._get_cache_key(ticker, date)
-        cache_file = self._get_cache_file(cache_key)
         
         try:
-            if cache_file.exists():
-                cache_file.unlink()
+            for cache_file in self._cache_file_candidates(cache_key):
+                cache_file.unlink(missing_ok=True)
             
-            if cache_key in self.index:
-                del self.index[cache_key]
-                self._save_index()
+            with self._lock:
+                row = self.db.execute('SELECT file FROM idx WHERE key = ?', (cache_key,)).fetchone()
+                self.db.execute('DELETE FROM idx WHERE key = ?', (cache_key,))
+                if row:
+                    self._release_file(row[0])
+                self._keys.discard(cache_key)
+                self._stats = None
             
             print(f"🗑️  Deleted cache for {ticker} on {date}")
             return True
@@ -143,12 +337,15 @@ class CacheManager:
     def clear_all_cache(self) -> bool:
         """Clear all cached analyses"""
         try:
-            for cache_file in self.cache_dir.glob("*.json"):
-                if cache_file.name != "index.json":
+            with self._lock:
+                self.db.execute('DELETE FROM idx')
+                self._keys.clear()
+                # Nothing is referenced any more, so every stored payload can go
+                shutil.rmtree(self.objects_dir, ignore_errors=True)
+                self._known_objects.clear()
+                for cache_file in self._entry_files():
                     cache_file.unlink()
-            
-            self.index = {}
-            self._save_index()
+                self._stats = None
             
             print("🗑️  Cleared all cache")
             return True
@@ -159,18 +356,27 @@ class CacheManager:
     
     def get_cache_stats(self) -> Dict[str, Any]:
         """Get cache statistics"""
-        total_cached = len(self.index)
-        cache_size = sum(f.stat().st_size for f in self.cache_dir.glob("*.json"))
+        stats = self._stats
+        if stats is not None:
+            return dict(stats)
+        
+        with self._lock:
+            total_cached = self.db.execute('SELECT COUNT(*) FROM idx').fetchone()[0]
+        cache_size = self._scan_cache_size()
         
-        return {
+        stats = {
             'total_analyses': total_cached,
             'cache_size_bytes': cache_size,
             'cache_size_mb': round(cache_size / (1024 * 1024), 2),
             'cache_directory': str(self.cache_dir.absolute())
         }
+        self._stats = stats
+        return dict(stats)
 
 
 # Global cache manager instance
 cache_manager = CacheManager()
+# Checkpoint the index WAL before exit
+atexit.register(cache_manager.flush)
 
 
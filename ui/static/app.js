@@ -1,11 +1,13 @@
 /**
  * Trading Agents Dashboard - Frontend JavaScript
- * Handles WebSocket communication, UI updates, and animations
+ * Handles progress streaming (Server-Sent Events / WebSocket), UI updates, and animations
  */
 
 // State
 let ws = null;
+let eventSource = null;
 let currentResults = null;
+let streamedAgents = {};
 let currentTab = 'market_analyst';
 
 // DOM Elements
@@ -289,8 +291,41 @@ function startAnalysis() {
     analyzeBtn.disabled = true;
     analyzeBtn.textContent = 'Analyzing...';
     
-    // Connect WebSocket
-    connectWebSocket(ticker, date);
+    // Stream progress over Server-Sent Events, or a WebSocket where EventSource is missing
+    if (window.EventSource) {
+        connectEventStream(ticker, date);
+    } else {
+        connectWebSocket(ticker, date);
+    }
+}
+
+// Server-Sent Events Connection (one analysis per stream)
+function connectEventStream(ticker, date) {
+    const params = new URLSearchParams({ ticker, date });
+    eventSource = new EventSource(`/stream?${params}`);
+    
+    eventSource.onmessage = (event) => {
+        const data = JSON.parse(event.data);
+        if (isFinalMessage(data)) {
+            // Close before EventSource's auto-reconnect re-runs the analysis
+            eventSource.close();
+        }
+        handleWebSocketMessage(data);
+    };
+    
+    eventSource.onerror = (error) => {
+        console.error('Event stream error:', error);
+        eventSource.close();
+        showError('Connection error. Please try again.');
+    };
+}
+
+// Whether a message (or batch) carries the analysis outcome
+function isFinalMessage(data) {
+    if (data.type === 'batch') {
+        return data.items.some(isFinalMessage);
+    }
+    return data.type === 'complete' || data.type === 'error';
 }
 
 // WebSocket Connection
@@ -324,14 +359,29 @@ function connectWebSocket(ticker, date) {
 // Handle WebSocket Messages
 function handleWebSocketMessage(data) {
     switch (data.type) {
+        case 'batch':
+            // Several queued messages sent in one frame, in order
+            data.items.forEach(handleWebSocketMessage);
+            break;
+            
         case 'start':
             console.log('Analysis started:', data);
             break;
             
+        case 'queued':
+            // Server is at its analysis limit; this one starts when a slot frees up
+            progressMessage.textContent = data.message;
+            break;
+            
         case 'progress':
             updateProgress(data);
             break;
             
+        case 'agent_result':
+            // One agent's output, sent as soon as that agent finishes
+            streamedAgents[data.agent] = data.data;
+            break;
+            
         case 'complete':
             handleComplete(data.result);
             break;
@@ -445,6 +495,10 @@ function shouldBeComplete(agentKey, currentAgent) {
 
 // Handle Analysis Complete
 function handleComplete(result) {
+    // Live results leave the agents out; they arrived as agent_result messages
+    if (!result.agents) {
+        result.agents = streamedAgents;
+    }
     currentResults = result;
     
     // Hide progress, show results
@@ -1008,6 +1062,7 @@ function animateNumber(element, target, suffix = '') {
 
 // Reset Progress
 function resetProgress() {
+    streamedAgents = {};
     progressBar.style.width = '0%';
     progressPercentage.textContent = '0%';
     progressMessage.textContent = 'Initializing...';
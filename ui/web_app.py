@@ -4,21 +4,58 @@ FastAPI Web Server for Trading Agents Dashboard
 Provides a web interface for running trading analysis with real-time progress updates.
 """
 
+import functools
+import gzip
+import hashlib
+import importlib.util
 import json
+import logging
+import logging.handlers
+import os
+import queue
+import time
+import zlib
 import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 import sys
 
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect
-from fastapi.responses import HTMLResponse, FileResponse
+from fastapi import FastAPI, Request, WebSocket, WebSocketDisconnect
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from fastapi.staticfiles import StaticFiles
+from pydantic import BaseModel, ConfigDict, ValidationError
 import uvicorn
 
-# Add parent directory to path for imports (ui/ folder is one level down)
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
+
+try:
+    import msgspec
+    MSGSPEC_AVAILABLE = True
+except ImportError:
+    MSGSPEC_AVAILABLE = False
+
+# Add the project root (trading_graph, langsmith_config; ui/ folder is one level down)
+# and this directory (cache_manager) to the path, once each, so every import of this
+# module resolves cache_manager to the same module and shared instance.
 # Use .resolve() to get absolute paths for proper import resolution
-sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+_UI_DIR = Path(__file__).resolve().parent
+for _import_dir in (str(_UI_DIR.parent), str(_UI_DIR)):
+    if _import_dir not in sys.path:
+        sys.path.insert(0, _import_dir)
 
 from trading_graph import create_trading_graph
 from langsmith_config import setup_langsmith
@@ -29,48 +66,185 @@ load_dotenv()
 setup_langsmith()
 
 # Import cache_manager from same directory
-sys.path.insert(0, str(Path(__file__).resolve().parent))
 from cache_manager import cache_manager
 
-app = FastAPI(title="Trading Agents Dashboard")
+logger = logging.getLogger(__name__)
 
-# Serve static files
-static_dir = Path(__file__).parent / "static"
-static_dir.mkdir(exist_ok=True)
 
-app.mount("/static", StaticFiles(directory=static_dir), name="static")
+def _start_log_listener() -> logging.handlers.QueueListener:
+    """
+    Route this module's log records through a queue to a background thread.
+
+    Handlers on the event loop only enqueue the record; the stderr write happens
+    on the listener thread, so logging never blocks a WebSocket handler.
+    """
+    log_queue = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(log_queue, logging.StreamHandler())
+    logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    logger.propagate = False
+    listener.start()
+    return listener
+
+
+def _dumps(obj: Any) -> str:
+    """Serialize obj to a JSON string (orjson when available)"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+    return json.dumps(obj)
+
+
+def _loads(data):
+    """Parse a JSON string or bytes (orjson when available)"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+# Inbound WebSocket analysis request, decoded and type-checked in a single pass
+# (msgspec when available, otherwise pydantic's compiled validator)
+if MSGSPEC_AVAILABLE:
+    class AnalysisRequest(msgspec.Struct, frozen=True):
+        ticker: str = "AAPL"
+        date: str = ""
+
+    _decode_request = msgspec.json.Decoder(AnalysisRequest).decode
+    _REQUEST_ERRORS = (msgspec.DecodeError,)
+else:
+    class AnalysisRequest(BaseModel):
+        model_config = ConfigDict(frozen=True)
+
+        ticker: str = "AAPL"
+        date: str = ""
+
+    _decode_request = AnalysisRequest.model_validate_json
+    _REQUEST_ERRORS = (ValidationError,)
+
+
+@functools.lru_cache(maxsize=1)
+def _date_for_minute(minute: int) -> str:
+    """Local date (YYYY-MM-DD) at the given minute since the epoch"""
+    return datetime.fromtimestamp(minute * 60).strftime("%Y-%m-%d")
 
 
-class AnalysisProgress:
-    """Track analysis progress for real-time updates"""
-    def __init__(self):
-        self.current_agent = ""
-        self.progress = 0
-        self.status = "idle"
-        self.results = {}
+def _today() -> str:
+    """Today's date, formatted at most once per minute"""
+    return _date_for_minute(int(time.time()) // 60)
+
+
+# Most queued WebSocket messages merged into one "batch" frame
+_MAX_BATCH = 16
+
+
+async def _next_frame(out_q: asyncio.Queue) -> str:
+    """Wait for queued messages and merge any backlog into one JSON frame
     
-    def update(self, agent: str, progress: int, status: str = "running"):
-        self.current_agent = agent
-        self.progress = progress
-        self.status = status
+    Messages are dicts or already-serialized JSON strings; None entries (an
+    end-of-stream marker) are dropped, so the frame may come back empty.
+    """
+    batch = [await out_q.get()]
+    while len(batch) < _MAX_BATCH and not out_q.empty():
+        batch.append(out_q.get_nowait())
+    parts = [item if isinstance(item, str) else _dumps(item) for item in batch if item is not None]
+    if len(parts) <= 1:
+        return parts[0] if parts else ""
+    return '{"type":"batch","items":[' + ",".join(parts) + "]}"
+
+
+async def _ws_sender(websocket: WebSocket, out_q: asyncio.Queue):
+    """Send queued messages in order, merging any backlog into one batch frame
     
-    def set_result(self, agent: str, result: Any):
-        self.results[agent] = result
+    Frames are sent as text so the dashboard's JSON.parse(event.data) keeps working.
+    """
+    while True:
+        await websocket.send_text(await _next_frame(out_q))
+
+
+# Progress reached when each agent node completes. Agent pipeline order:
+# news_analyst (0-20%) → market_analyst (20-35%) → fundamentals_analyst (35-50%)
+# → bull_debater (50-65%) → bear_debater (65-80%) → supervisor (80-100%)
+_PROGRESS_MAP = {
+    "news_analyst": 20,
+    "market_analyst": 35,
+    "fundamentals_analyst": 50,
+    "bull_debater": 65,
+    "bear_debater": 80,
+    "supervisor": 95
+}
+
+# The progress message for each node, serialized once
+_PROGRESS_PAYLOADS = {
+    node: _dumps({
+        "type": "progress",
+        "agent": node,
+        "progress": progress,
+        "message": f"Completed {node.replace('_', ' ').title()}..."
+    })
+    for node, progress in _PROGRESS_MAP.items()
+}
 
 
-# Global progress tracker
-progress_tracker = AnalysisProgress()
+class _ORJSONResponse(JSONResponse):
+    """JSONResponse rendered with orjson"""
 
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
 
-@app.get("/")
-async def read_root():
-    """Serve the main dashboard HTML page"""
-    html_file = Path(__file__).parent / "templates" / "dashboard.html"
-    if html_file.exists():
-        return FileResponse(html_file)
-    
-    # Fallback: inline HTML if file doesn't exist yet
-    return HTMLResponse(content="""
+
+_JSONResponse = _ORJSONResponse if ORJSON_AVAILABLE else JSONResponse
+
+
+def _json(content: Any, headers: Optional[Dict[str, str]] = None) -> Response:
+    """
+    Render content to a JSON response right away.
+
+    Endpoints return this instead of a plain dict: FastAPI passes Response objects
+    through untouched, skipping the jsonable_encoder walk over the whole payload
+    (the content here is already plain JSON types from the cache layer).
+    """
+    return _JSONResponse(content, headers=headers)
+
+
+# Cache writes run on one dedicated thread: they stay off the event loop and are
+# applied one at a time, in the order the analyses finished
+_CACHE_WRITER = ThreadPoolExecutor(max_workers=1, thread_name_prefix="cache-writer")
+
+
+def _write_cache(ticker: str, date: str, result: Dict[str, Any]) -> None:
+    """Persist one analysis result (runs on the cache writer thread)"""
+    try:
+        cache_manager.save_cache(ticker, date, result)
+        cache_manager.flush()
+    except Exception:
+        logger.exception("Failed to cache analysis for %s on %s", ticker, date)
+
+
+@asynccontextmanager
+async def _lifespan(app: FastAPI):
+    # Build the shared trading graph before the first request needs it; done on a
+    # worker thread so the server keeps starting up meanwhile
+    warm_task = asyncio.get_running_loop().run_in_executor(None, _warm_graph)
+    yield
+    await warm_task
+    # Let queued cache writes finish before the process exits
+    _CACHE_WRITER.shutdown(wait=True)
+
+
+app = FastAPI(
+    title="Trading Agents Dashboard",
+    lifespan=_lifespan,
+    default_response_class=_JSONResponse
+)
+
+# Compress the remaining static assets and API responses for clients that accept gzip
+# (responses that already carry a Content-Encoding, like the pages below, pass through)
+app.add_middleware(GZipMiddleware, minimum_size=1000)
+
+# Serve static files
+static_dir = Path(__file__).parent / "static"
+static_dir.mkdir(exist_ok=True)
+
+# Fallback root page if templates/dashboard.html doesn't exist
+_FALLBACK_HTML = """
     <!DOCTYPE html>
     <html>
     <head>
@@ -82,7 +256,85 @@ async def read_root():
         <script>window.location.href = '/static/dashboard.html';</script>
     </body>
     </html>
-    """)
+    """
+
+
+def _precompress(html: bytes) -> Dict[str, bytes]:
+    """Encode a page once for every supported Content-Encoding"""
+    variants = {"gzip": gzip.compress(html, 6), "identity": html}
+    if BROTLI_AVAILABLE:
+        variants["br"] = brotli.compress(html)
+    return variants
+
+
+def _page_response(request: Request, variants: Dict[str, bytes]) -> Response:
+    """Return the smallest precompressed variant the client accepts"""
+    accepted = request.headers.get("accept-encoding", "")
+    headers = {"Vary": "Accept-Encoding", "Cache-Control": "public, max-age=300"}
+    for encoding in ("br", "gzip"):
+        if encoding in variants and encoding in accepted:
+            headers["Content-Encoding"] = encoding
+            return Response(variants[encoding], media_type="text/html", headers=headers)
+    return Response(variants["identity"], media_type="text/html", headers=headers)
+
+
+# Dashboard pages are read and compressed once at startup (restart the server after editing them)
+_root_html_file = Path(__file__).parent / "templates" / "dashboard.html"
+_ROOT_PAGE = _precompress(
+    _root_html_file.read_bytes() if _root_html_file.exists() else _FALLBACK_HTML.encode("utf-8")
+)
+
+_dashboard_html_file = static_dir / "dashboard.html"
+if _dashboard_html_file.exists():
+    _DASHBOARD_PAGE = _precompress(_dashboard_html_file.read_bytes())
+
+    # Registered before the /static mount so it takes precedence over StaticFiles
+    @app.get("/static/dashboard.html", include_in_schema=False)
+    async def read_dashboard(request: Request):
+        """Serve the dashboard page from memory"""
+        return _page_response(request, _DASHBOARD_PAGE)
+
+app.mount("/static", StaticFiles(directory=static_dir), name="static")
+
+
+@app.get("/")
+async def read_root(request: Request):
+    """Serve the main dashboard HTML page"""
+    return _page_response(request, _ROOT_PAGE)
+
+
+async def _run_request(ticker: str, date: str, out_q: asyncio.Queue):
+    """Run one analysis request, queueing its start, progress and outcome messages"""
+    # Send acknowledgment
+    out_q.put_nowait({
+        "type": "start",
+        "ticker": ticker,
+        "date": date
+    })
+    
+    # Run analysis with progress updates
+    try:
+        if _ANALYSIS_SEM.locked():
+            out_q.put_nowait({
+                "type": "queued",
+                "message": "Waiting for a free analysis slot..."
+            })
+        async with _ANALYSIS_SEM:
+            result = await run_analysis_with_progress(
+                ticker, date, out_q
+            )
+        
+        # Send completion
+        out_q.put_nowait({
+            "type": "complete",
+            "result": result
+        })
+        
+    except Exception as e:
+        out_q.put_nowait({
+            "type": "error",
+            "message": str(e)
+        })
 
 
 @app.websocket("/ws")
@@ -90,80 +342,130 @@ async def websocket_endpoint(websocket: WebSocket):
     """WebSocket endpoint for real-time analysis updates"""
     await websocket.accept()
     
+    # Messages for this connection are queued and written by a single sender task
+    out_q: asyncio.Queue = asyncio.Queue()
+    sender_task = asyncio.create_task(_ws_sender(websocket, out_q))
+    
     try:
         while True:
             # Receive analysis request
-            data = await websocket.receive_json()
-            ticker = data.get("ticker", "AAPL")
-            date = data.get("date", datetime.now().strftime("%Y-%m-%d"))
-            
-            # Send acknowledgment
-            await websocket.send_json({
-                "type": "start",
-                "ticker": ticker,
-                "date": date
-            })
-            
-            # Run analysis with progress updates
             try:
-                result = await run_analysis_with_progress(
-                    ticker, date, websocket
-                )
-                
-                # Send completion
-                await websocket.send_json({
-                    "type": "complete",
-                    "result": result
-                })
-                
-            except Exception as e:
-                await websocket.send_json({
+                request = _decode_request(await websocket.receive_text())
+            except _REQUEST_ERRORS:
+                out_q.put_nowait({
                     "type": "error",
-                    "message": str(e)
+                    "message": "invalid request"
                 })
+                continue
+            ticker = request.ticker
+            date = request.date or _today()
+            
+            # Run analysis with progress updates
+            await _run_request(ticker, date, out_q)
     
     except WebSocketDisconnect:
         print("Client disconnected")
+    finally:
+        sender_task.cancel()
+
+
+async def _gzip_stream(chunks):
+    """Gzip a text stream with one compressor shared by every chunk
+    
+    Each chunk is sync-flushed so the client can decode it as soon as it arrives,
+    while the shared deflate window still deduplicates the keys and structure
+    repeated from one message to the next.
+    """
+    compressor = zlib.compressobj(wbits=31)  # 31: gzip container
+    async for chunk in chunks:
+        yield compressor.compress(chunk.encode("utf-8")) + compressor.flush(zlib.Z_SYNC_FLUSH)
+    yield compressor.flush()
+
+
+@app.get("/stream")
+async def stream_analysis(request: Request, ticker: str = "AAPL", date: str = ""):
+    """Server-Sent Events endpoint running one analysis with progress updates
+    
+    Carries the same messages as /ws, one "data:" event per frame; the stream
+    ends after the complete or error message. Gzip-encoded for clients that
+    accept it (GZipMiddleware leaves event streams alone, since it buffers).
+    """
+    date = date or _today()
+    out_q: asyncio.Queue = asyncio.Queue()
+    
+    async def produce():
+        try:
+            await _run_request(ticker, date, out_q)
+        finally:
+            out_q.put_nowait(None)
+    
+    async def events():
+        task = asyncio.create_task(produce())
+        try:
+            # produce() puts its end marker as its very last step, so once the
+            # marker has been taken the task is done and nothing else is queued
+            while not (task.done() and out_q.empty()):
+                frame = await _next_frame(out_q)
+                if frame:
+                    yield f"data: {frame}\n\n"
+        finally:
+            # Stop the analysis if the client went away mid-stream
+            task.cancel()
+    
+    headers = {"Cache-Control": "no-cache", "Vary": "Accept-Encoding"}
+    if "gzip" in request.headers.get("accept-encoding", ""):
+        headers["Content-Encoding"] = "gzip"
+        return StreamingResponse(_gzip_stream(events()), media_type="text/event-stream", headers=headers)
+    return StreamingResponse(events(), media_type="text/event-stream", headers=headers)
 
 
-def calculate_progress_from_node(node_name: str) -> int:
+# Analyses running at once across all connections; each holds its own LLM calls,
+# so further requests wait for a slot instead of piling up. A connection already
+# runs its own requests one at a time (the receive loop awaits each analysis)
+_ANALYSIS_SEM = asyncio.Semaphore(int(os.environ.get("MAX_ANALYSES", "4")))
+
+
+@functools.lru_cache(maxsize=1)
+def _get_graph():
     """
-    Calculate progress percentage based on which agent node has completed.
+    The trading graph shared by every analysis request, created on first use.
 
-    Agent pipeline order:
-    news_analyst (0-20%) → market_analyst (20-35%) → fundamentals_analyst (35-50%)
-    → bull_debater (50-65%) → bear_debater (65-80%) → supervisor (80-100%)
+    Each run streams the compiled workflow with its own fresh initial state, so
+    concurrent requests never share graph state; only the compiled workflow and
+    LLM clients are reused.
     """
-    progress_map = {
-        "news_analyst": 20,
-        "market_analyst": 35,
-        "fundamentals_analyst": 50,
-        "bull_debater": 65,
-        "bear_debater": 80,
-        "supervisor": 95
-    }
-    return progress_map.get(node_name, 0)
+    return create_trading_graph(debug=True)
+
+
+def _warm_graph() -> None:
+    """Create the shared trading graph ahead of the first analysis"""
+    try:
+        _get_graph()
+    except Exception:
+        # The first analysis retries and reports the error to its client
+        logger.exception("Failed to pre-build the trading graph")
 
 
 async def run_analysis_with_progress(
     ticker: str, 
     date: str, 
-    websocket: WebSocket
+    out_q: asyncio.Queue
 ) -> Dict[str, Any]:
     """
     Run trading analysis and send REAL progress updates via WebSocket.
     Uses LangGraph's streaming API to track actual agent completion.
+    Messages are put on out_q, the connection's outgoing queue (see _ws_sender).
     """
 
     # Initialize graph
-    await websocket.send_json({
+    out_q.put_nowait({
         "type": "progress",
         "agent": "initializing",
         "progress": 0,
         "message": "Initializing trading agents..."
     })
     
-    graph = create_trading_graph(debug=True)
+    graph = _get_graph()
 
     # Create initial state for the graph
     initial_state = {
@@ -186,7 +488,7 @@ async def run_analysis_with_progress(
         "supervisor_decision": ""
     }
 
-    await websocket.send_json({
+    out_q.put_nowait({
         "type": "progress",
         "agent": "initializing",
         "progress": 5,
@@ -194,140 +496,131 @@ async def run_analysis_with_progress(
     })
 
     # Run analysis with real-time progress tracking via streaming
-    # This uses LangGraph's .stream() to get updates as each agent completes
-
-    # Shared state for tracking progress across thread
-    progress_state = {"final_state": None, "current_node": None}
+    # This uses LangGraph's async .astream() to get updates as each agent completes,
+    # so progress is sent from this coroutine without a worker thread
 
-    def run_graph_stream():
-        """Run the graph with streaming (regular function for to_thread)"""
+    async def stream_graph():
+        """Stream the graph and send a progress update as each node completes"""
         accumulated_state = dict(initial_state)  # Start with initial state
-        final_output = None
-
-        for output in graph.graph.stream(initial_state):
-            # Update shared state for progress tracking
-            if output:
-                node_name = list(output.keys())[0]
-                node_state = output[node_name]
+        last_progress = 5
 
-                # Accumulate all state updates
-                accumulated_state.update(node_state)
+        async for output in graph.graph.astream(initial_state):
+            if not output:
+                continue
+            node_name = next(iter(output))
+
+            # Accumulate all state updates
+            accumulated_state.update(output[node_name])
+
+            # Send each agent's output as soon as it exists, so the client can
+            # render it without waiting for (or re-receiving it in) the final result
+            field = _AGENT_FIELD_BY_NODE.get(node_name)
+            if field:
+                out_q.put_nowait({
+                    "type": "agent_result",
+                    "agent": node_name,
+                    "data": parse_json_safe(output[node_name].get(field))
+                })
 
-                # Track progress
-                progress_state["current_node"] = node_name
-                progress_state["final_state"] = output
-                final_output = output
+            progress = _PROGRESS_MAP.get(node_name, 0)
+            if progress > last_progress:
+                out_q.put_nowait(_PROGRESS_PAYLOADS[node_name])
+                last_progress = progress
 
         # Return the accumulated state, not just the last node's output
         return accumulated_state
 
-    # Run graph streaming in background with timeout
+    # Run graph streaming with a 5 minute limit
     try:
-        stream_task = asyncio.create_task(
-            asyncio.to_thread(run_graph_stream)
-        )
-
-        # Monitor for completion with timeout
-        last_progress = 5
-        last_node = None
-        start_time = asyncio.get_event_loop().time()
-
-        while not stream_task.done():
-            # Check timeout (5 minutes = 300 seconds)
-            elapsed = asyncio.get_event_loop().time() - start_time
-            if elapsed > 300:
-                stream_task.cancel()
-                raise asyncio.TimeoutError()
-
-            # Send progress update every 2 seconds
-            await asyncio.sleep(2)
-
-            # Check if a new node has completed
-            current_node = progress_state.get("current_node")
-            if current_node and current_node != last_node:
-                progress = calculate_progress_from_node(current_node)
-                if progress > last_progress:
-                    await websocket.send_json({
-                        "type": "progress",
-                        "agent": current_node,
-                        "progress": progress,
-                        "message": f"Completed {current_node.replace('_', ' ').title()}..."
-                    })
-                    last_progress = progress
-                    last_node = current_node
-
-        # Get final result
-        result = await stream_task
-
+        result = await asyncio.wait_for(stream_graph(), timeout=300)
     except asyncio.TimeoutError:
         error_msg = "Analysis timed out after 5 minutes. This may be due to: (1) Too many news articles being processed, (2) Slow API responses from Google Gemini, or (3) NewsAPI rate limits. Try analyzing again with a different ticker or reduce the number of articles."
-        await websocket.send_json({
+        out_q.put_nowait({
             "type": "error",
             "message": error_msg
         })
-        print(f"[WebSocket] Analysis timeout for {ticker} on {date}")
+        logger.warning("Analysis timeout for %s on %s", ticker, date)
         raise
 
     # result is now the accumulated state from all agents
     # No need to extract - it's already the full state dict
 
-    # Debug: Print what we got
-    print(f"[WebSocket] Final result keys: {list(result.keys()) if result else 'None'}")
-    if result:
-        print(f"[WebSocket] Has market_analysis: {'market_analysis' in result}")
-        print(f"[WebSocket] Has news_analysis: {'news_analysis' in result}")
-        print(f"[WebSocket] Has fundamental_analysis: {'fundamental_analysis' in result}")
-        print(f"[WebSocket] Has bull_argument: {'bull_argument' in result}")
-        print(f"[WebSocket] Has bear_argument: {'bear_argument' in result}")
+    # Debug: log what we got (skipped entirely unless DEBUG is enabled)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Final result keys: %s", list(result.keys()) if result else None)
+        if result:
+            for key in ("market_analysis", "news_analysis", "fundamental_analysis",
+                        "bull_argument", "bear_argument"):
+                logger.debug("Has %s: %s", key, key in result)
 
     # Send final progress
-    await websocket.send_json({
+    out_q.put_nowait({
         "type": "progress",
         "agent": "complete",
         "progress": 100,
         "message": "Analysis complete!"
     })
 
-    # Parse and structure the results
+    # Structure the results; the agents' outputs already went out as agent_result
+    # messages, so the completion message only carries the decision
     structured_result = {
         "ticker": result.get("ticker") if result else ticker,
         "date": result.get("date") if result else date,
         "decision": result.get("decision") if result else "neutral",
         "confidence": result.get("confidence") if result else 0.0,
         "rationale": result.get("rationale") if result else "",
-        "agents": {
-            "market_analyst": parse_json_safe(result.get("market_analysis", "{}")) if result else {},
-            "fundamentals_analyst": parse_json_safe(result.get("fundamental_analysis", "{}")) if result else {},
-            "news_analyst": parse_json_safe(result.get("news_analysis", "{}")) if result else {},
-            "bull_debater": parse_json_safe(result.get("bull_argument", "{}")) if result else {},
-            "bear_debater": parse_json_safe(result.get("bear_argument", "{}")) if result else {},
-            "supervisor": parse_json_safe(result.get("supervisor_decision", "{}")) if result else {}
-        },
         "from_cache": False
     }
     
     # Save to cache - save the full result state, not the structured_result
-    # The cache expects the raw state with all analysis fields
+    # The cache expects the raw state with all analysis fields. The write happens
+    # on the cache writer thread so the "complete" message isn't held up by it
     if result:
-        cache_manager.save_cache(ticker, date, result)
+        asyncio.get_running_loop().run_in_executor(
+            _CACHE_WRITER, _write_cache, ticker, date, result
+        )
 
     return structured_result
 
 
+# Dashboard agent panel -> state field holding that agent's JSON output
+_AGENT_FIELDS = (
+    ("market_analyst", "market_analysis"),
+    ("fundamentals_analyst", "fundamental_analysis"),
+    ("news_analyst", "news_analysis"),
+    ("bull_debater", "bull_argument"),
+    ("bear_debater", "bear_argument"),
+    ("supervisor", "supervisor_decision"),
+)
+
+# The agent panels are named after their graph nodes
+_AGENT_FIELD_BY_NODE = dict(_AGENT_FIELDS)
+
+# Shared result for missing or unparseable agent output (only ever serialized, never mutated)
+_EMPTY: Dict[str, Any] = {}
+
+
 def parse_json_safe(json_str: str) -> Dict[str, Any]:
     """Safely parse JSON string, return empty dict on failure"""
+    if not json_str or json_str == "{}":
+        return _EMPTY
     try:
         if isinstance(json_str, dict):
             return json_str
-        return json.loads(json_str)
-    except (json.JSONDecodeError, TypeError):
-        return {}
+        return _loads(json_str)
+    except (ValueError, TypeError):  # json.JSONDecodeError and orjson.JSONDecodeError are ValueErrors
+        return _EMPTY
+
+
+def parse_agents(result: Dict[str, Any]) -> Dict[str, Any]:
+    """Parse every agent's JSON output from an analysis result state"""
+    return {agent: parse_json_safe(result.get(field)) for agent, field in _AGENT_FIELDS}
 
 
 @app.get("/health")
 async def health_check():
     """Health check endpoint"""
-    return {"status": "healthy", "service": "trading-agents-dashboard"}
+    return _json({"status": "healthy", "service": "trading-agents-dashboard"})
 
 
 @app.get("/api/cache/check")
@@ -338,8 +631,7 @@ async def check_cache(ticker: str, date: str):
     
     if has_cache:
         # Get cache metadata from index
-        cache_key = f"{ticker}_{date}"
-        cache_info = cache_manager.index.get(cache_key, {})
+        cache_info = cache_manager.get_metadata(ticker, date) or {}
         cache_data = {
             "exists": True,
             "ticker": ticker,
@@ -349,19 +641,46 @@ async def check_cache(ticker: str, date: str):
             "confidence": cache_info.get("confidence")
         }
     
-    return {
+    return _json({
         "has_cache": has_cache,
         "cache_data": cache_data
-    }
+    })
+
+
+def _etag(*parts: Any) -> str:
+    """Strong ETag derived from the cache entries a response reflects"""
+    digest = hashlib.blake2b("|".join(map(str, parts)).encode("utf-8"), digest_size=8).hexdigest()
+    return f'"{digest}"'
+
+
+def _validator_headers(etag: str) -> Dict[str, str]:
+    """ETag plus no-cache, which makes browsers revalidate on every fetch so an
+    unchanged entry costs an empty 304 instead of a re-serialized body"""
+    return {"ETag": etag, "Cache-Control": "no-cache"}
+
+
+def _not_modified(request: Request, etag: str) -> Optional[Response]:
+    """Return a 304 response if the client already has this version"""
+    if etag in request.headers.get("if-none-match", ""):
+        return Response(status_code=304, headers=_validator_headers(etag))
+    return None
 
 
 @app.get("/api/cache/load")
-async def load_cache(ticker: str, date: str):
+async def load_cache(ticker: str, date: str, request: Request):
     """Load cached analysis result"""
+    # The entry only changes when it is re-saved, which updates cached_at
+    metadata = cache_manager.get_metadata(ticker, date)
+    etag = _etag(ticker, date, metadata.get("cached_at")) if metadata else None
+    if etag:
+        not_modified = _not_modified(request, etag)
+        if not_modified:
+            return not_modified
+    
     result = cache_manager.get_cache(ticker, date)
     
     if result is None:
-        return {"error": "Cache not found", "ticker": ticker, "date": date}
+        return _json({"error": "Cache not found", "ticker": ticker, "date": date})
     
     # Structure the result similar to live analysis
     structured_result = {
@@ -372,50 +691,49 @@ async def load_cache(ticker: str, date: str):
         "rationale": result.get("rationale"),
         "from_cache": True,
         "cached_at": result.get("cached_at"),
-        "agents": {
-            "market_analyst": parse_json_safe(result.get("market_analysis", "{}")),
-            "fundamentals_analyst": parse_json_safe(result.get("fundamental_analysis", "{}")),
-            "news_analyst": parse_json_safe(result.get("news_analysis", "{}")),
-            "bull_debater": parse_json_safe(result.get("bull_argument", "{}")),
-            "bear_debater": parse_json_safe(result.get("bear_argument", "{}")),
-            "supervisor": parse_json_safe(result.get("supervisor_decision", "{}"))
-        }
+        "agents": parse_agents(result)
     }
     
-    return structured_result
+    return _json(structured_result, _validator_headers(etag) if etag else None)
 
 
 @app.get("/api/cache/list")
-async def list_cache():
+async def list_cache(request: Request):
     """Get list of all cached analyses"""
     cached_list = cache_manager.get_all_cached()
+    
+    etag = _etag(*((entry["cache_key"], entry["cached_at"]) for entry in cached_list))
+    not_modified = _not_modified(request, etag)
+    if not_modified:
+        return not_modified
+    
     stats = cache_manager.get_cache_stats()
     
-    return {
+    return _json({
         "cached_analyses": cached_list,
         "stats": stats
-    }
+    }, _validator_headers(etag))
 
 
 @app.delete("/api/cache/delete")
 async def delete_cache(ticker: str, date: str):
     """Delete a specific cache entry"""
     success = cache_manager.delete_cache(ticker, date)
-    return {
+    return _json({
         "success": success,
         "ticker": ticker,
         "date": date
-    }
+    })
 
 
 @app.delete("/api/cache/clear")
 async def clear_all_cache():
     """Clear all cached analyses"""
     success = cache_manager.clear_all_cache()
-    return {
+    return _json({
         "success": success,
         "message": "All cache cleared" if success else "Failed to clear cache"
-    }
+    })
 
 
 def main():
@@ -429,12 +747,32 @@ def main():
     print("\n⏹️  Press Ctrl+C to stop the server\n")
     print("=" * 80)
     
-    uvicorn.run(
-        app,
-        host="0.0.0.0",
-        port=8000,
-        log_level="info"
-    )
+    # uvloop and httptools (installed with uvicorn[standard]) are much faster than
+    # the stdlib asyncio loop and h11; fall back to those when they're missing
+    loop = "uvloop" if importlib.util.find_spec("uvloop") else "asyncio"
+    http = "httptools" if importlib.util.find_spec("httptools") else "h11"
+    print(f"⚡ Event loop: {loop}, HTTP parser: {http}")
+    
+    listener = _start_log_listener()
+    try:
+        uvicorn.run(
+            app,
+            host="0.0.0.0",
+            port=8000,
+            log_level="info",
+            loop=loop,
+            http=http,
+            # Progress frames are ~100 bytes, too small for permessage-deflate to
+            # pay for its CPU cost; the one large result frame fits well within
+            # ws_max_size, and pings keep idle sockets alive through long analyses
+            ws_max_size=16 * 1024 * 1024,
+            ws_max_queue=64,
+            ws_ping_interval=20,
+            ws_ping_timeout=20,
+            ws_per_message_deflate=False
+        )
+    finally:
+        listener.stop()
 
 
 if __name__ == "__main__":
@@ -5,6 +5,8 @@ This script verifies that all components are properly installed and configured.
 Run this before using the trading agents system.
 """
 
+import importlib.util
+import os
 import sys
 from pathlib import Path
 
@@ -30,12 +32,13 @@ def check_imports():
         'dotenv': 'python-dotenv',
     }
 
+    # find_spec only locates each package; importing them all (pandas, langchain, ...)
+    # would take seconds just to confirm they are installed
     missing = []
     for module, package in packages.items():
-        try:
-            __import__(module)
+        if importlib.util.find_spec(module) is not None:
             print(f"[OK] {package}")
-        except ImportError:
+        else:
             print(f"[FAIL] {package} - MISSING")
             missing.append(package)
 
@@ -127,9 +130,18 @@ def check_project_structure():
     project_root = Path(__file__).parent
     all_exist = True
 
+    # List each folder involved once instead of stat-ing every file separately
+    listings = {}
+    for folder in {Path(path).parent for path in required_paths}:
+        try:
+            with os.scandir(project_root / folder) as entries:
+                listings[folder] = {entry.name for entry in entries}
+        except OSError:
+            listings[folder] = set()
+
     for path, desc in required_paths.items():
-        full_path = project_root / path
-        if full_path.exists():
+        rel_path = Path(path)
+        if rel_path.name in listings[rel_path.parent]:
             print(f"[OK] {path} - {desc}")
         else:
             print(f"[FAIL] {path} - MISSING - {desc}")